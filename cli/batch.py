@@ -0,0 +1,304 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from core.cache import LLMCache
+from core.exporter import export_many
+from core.generator import DEFAULT_MODEL, generate_test_suite, warm_up_model
+from core.knowledge import KnowledgeIndex
+from core.llm import LLMClient
+from core.manifest import manifest_path_for
+from core.metrics import Metrics
+from core.pool import create_client
+from core.output import OutputFormat
+from core.parser import parse_document, supported_suffixes
+
+
+_EXTENSIONS = {
+    OutputFormat.excel: ".xlsx",
+    OutputFormat.json: ".json",
+    OutputFormat.jsonl: ".jsonl",
+    OutputFormat.csv: ".csv",
+}
+
+
+class DocumentResult(NamedTuple):
+    document: str
+    status: str  # "generated", "skipped" or "failed"
+    chunks: int = 0
+    test_cases: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class BatchSummary:
+    """
+    Outcome of a batch run, one DocumentResult per document.
+    """
+
+    def __init__(self, results: List[DocumentResult], seconds: float, metrics: Metrics) -> None:
+        self.results = results
+        self.seconds = seconds
+        self.metrics = metrics
+
+    def _count(self, status: str) -> int:
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def generated(self) -> int:
+        return self._count("generated")
+
+    @property
+    def skipped(self) -> int:
+        return self._count("skipped")
+
+    @property
+    def failed(self) -> int:
+        return self._count("failed")
+
+    def format(self) -> str:
+        chunks = sum(r.chunks for r in self.results)
+        test_cases = sum(r.test_cases for r in self.results)
+        minutes = self.seconds / 60 or 1e-9
+
+        lines = [
+            f"Documents: {len(self.results)} total, {self.generated} generated, "
+            f"{self.skipped} up to date, {self.failed} failed",
+            f"Chunks:    {chunks} ({chunks / minutes:.1f}/min)",
+            f"Tests:     {test_cases}",
+            f"Elapsed:   {self.seconds:.1f}s ({self.generated / minutes:.1f} docs/min)",
+        ]
+
+        llm = self.metrics.snapshot()["llm"].get("generate")
+        if llm:
+            lines.append(
+                f"LLM:       {llm['requests']} generate requests, "
+                f"{llm['tokens_per_second']:.1f} tokens/s"
+            )
+
+        for result in self.results:
+            if result.status == "failed":
+                lines.append(f"FAILED {result.document}: {result.error}")
+
+        return "\n".join(lines)
+
+
+def find_documents(input_dir: str) -> List[Path]:
+    """
+    All supported documents below `input_dir`, in a stable order.
+    """
+    root = Path(input_dir)
+    if not root.is_dir():
+        raise NotADirectoryError(f"Not a directory: {input_dir}")
+
+    suffixes = supported_suffixes()
+    return sorted(
+        path for path in root.rglob("*")
+        if path.is_file() and path.suffix.lower() in suffixes
+    )
+
+
+def output_paths(
+    document: Path,
+    input_dir: str,
+    output_dir: str,
+    formats: Sequence[OutputFormat],
+) -> Dict[OutputFormat, Path]:
+    """
+    Output files of a document, mirroring its location below `input_dir`.
+    """
+    relative = document.relative_to(input_dir).with_suffix("")
+    return {
+        fmt: Path(output_dir) / relative.with_suffix(_EXTENSIONS[OutputFormat(fmt)])
+        for fmt in formats
+    }
+
+
+def is_up_to_date(document: Path, outputs: Dict[OutputFormat, Path]) -> bool:
+    """
+    True when every output exists and is newer than the document.
+    """
+    source_mtime = document.stat().st_mtime
+    return all(
+        path.exists() and path.stat().st_mtime >= source_mtime
+        for path in outputs.values()
+    )
+
+
+class _InFlightLimit:
+    """
+    Wraps a client created without `max_in_flight` so that the batch's
+    `max_in_flight` still caps its concurrent requests.
+    """
+
+    def __init__(self, client: LLMClient, max_in_flight: int) -> None:
+        self._client = client
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def generate(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        with self._slots:
+            return self._client.generate(*args, **kwargs)
+
+    def generate_stream(self, *args: Any, **kwargs: Any) -> Iterator[str]:
+        with self._slots:
+            yield from self._client.generate_stream(*args, **kwargs)
+
+
+def run_batch(
+    input_dir: str,
+    output_dir: str = "outputs",
+    formats: Sequence[OutputFormat] = (OutputFormat.excel,),
+    model: str = DEFAULT_MODEL,
+    max_retries: int = 2,
+    max_in_flight: int = 4,
+    parallel_documents: int = 2,
+    parse_ahead: int = 2,
+    parse_workers: int = 1,
+    page_cache_dir: Optional[str] = None,
+    force: bool = False,
+    cache: Optional[LLMCache] = None,
+    client: Optional[LLMClient] = None,
+    urls: Optional[Sequence[str]] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
+    keep_alive: Optional[Union[str, int]] = "10m",
+    warm_up: bool = True,
+    on_result: Optional[Callable[[DocumentResult], None]] = None,
+) -> BatchSummary:
+    """
+    Generate test suites for every document in `input_dir`.
+
+    Up to `parallel_documents` documents are generated at once while the
+    next `parse_ahead` documents are parsed in the background, so parsing
+    overlaps with LLM time. All documents share one client whose
+    `max_in_flight` bounds the total number of concurrent LLM requests; a
+    given `client` keeps its own `max_in_flight` if it was created with one.
+    Documents whose outputs are newer than the source are skipped unless
+    `force` is set; each document's manifest lets a changed document
+    reuse the test cases of its unchanged chunks. A failing document is
+    reported in the summary without stopping the batch. With `knowledge`,
+    prompts are grounded in related snippets of the knowledge index.
+
+    Documents are parsed with `parse_workers` processes and, with
+    `page_cache_dir`, reuse the PDF pages extracted by earlier runs (see
+    core.parser.parse_document).
+
+    With `warm_up`, the model is loaded and Ollama's prompt cache primed
+    while the first documents are parsed. `keep_alive` is how long Ollama
+    keeps the model loaded after a request (used when no `client` is given).
+    Several Ollama `urls` are used as one load balanced pool (see core.pool).
+    """
+    if max_in_flight < 1 or parallel_documents < 1 or parse_ahead < 0:
+        raise ValueError(
+            "max_in_flight and parallel_documents must be >= 1, parse_ahead >= 0"
+        )
+
+    documents = find_documents(input_dir)
+    metrics = Metrics()
+    parse = partial(parse_document, workers=parse_workers, page_cache_dir=page_cache_dir)
+    owns_client = client is None
+    if client is None:
+        client = create_client(
+            urls,
+            keep_alive=keep_alive,
+            max_in_flight=max_in_flight,
+            pool_size=max(10, max_in_flight),
+        )
+    elif getattr(client, "max_in_flight", None) is None:
+        client = _InFlightLimit(client, max_in_flight)
+
+    started = time.perf_counter()
+    results: List[Optional[DocumentResult]] = [None] * len(documents)
+    pending: List[int] = []
+
+    for index, document in enumerate(documents):
+        outputs = output_paths(document, input_dir, output_dir, formats)
+        if not force and is_up_to_date(document, outputs):
+            results[index] = DocumentResult(str(document), "skipped")
+            if on_result is not None:
+                on_result(results[index])
+        else:
+            pending.append(index)
+
+    parse_futures: Dict[int, Future] = {}
+    parse_lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=1) as parse_pool:
+
+        def _schedule_parsing(upto: int) -> None:
+            with parse_lock:
+                for position in range(len(parse_futures), min(upto, len(pending))):
+                    index = pending[position]
+                    parse_futures[position] = parse_pool.submit(
+                        parse, str(documents[index])
+                    )
+
+        def _process(position: int) -> DocumentResult:
+            # Keep the parser `parse_ahead` documents ahead of generation
+            _schedule_parsing(position + parallel_documents + parse_ahead)
+
+            document = documents[pending[position]]
+            outputs = output_paths(document, input_dir, output_dir, formats)
+            document_started = time.perf_counter()
+
+            try:
+                chunks = parse_futures[position].result()
+                for path in outputs.values():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+
+                suite = generate_test_suite(
+                    str(document),
+                    model=model,
+                    max_retries=max_retries,
+                    concurrency=max_in_flight,
+                    cache=cache,
+                    client=client,
+                    manifest_path=manifest_path_for(str(next(iter(outputs.values())))),
+                    metrics=metrics,
+                    chunks=chunks,
+                    knowledge=knowledge,
+                )
+                export_many(suite, outputs, metrics=metrics)
+            except Exception as exc:  # reported in the summary, the batch goes on
+                result = DocumentResult(
+                    str(document),
+                    "failed",
+                    seconds=time.perf_counter() - document_started,
+                    error=str(exc),
+                )
+            else:
+                result = DocumentResult(
+                    str(document),
+                    "generated",
+                    chunks=len(chunks),
+                    test_cases=len(suite.test_cases),
+                    seconds=time.perf_counter() - document_started,
+                )
+
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        _schedule_parsing(parallel_documents + parse_ahead)
+        try:
+            if warm_up and pending:
+                warm_up_model(model, client, metrics=metrics)
+            with ThreadPoolExecutor(max_workers=parallel_documents) as document_pool:
+                for position, result in enumerate(
+                    document_pool.map(_process, range(len(pending)))
+                ):
+                    results[pending[position]] = result
+        finally:
+            if owns_client:
+                client.close()
+
+    return BatchSummary(
+        [r for r in results if r is not None],
+        time.perf_counter() - started,
+        metrics,
+    )
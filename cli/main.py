@@ -0,0 +1,183 @@
+import argparse
+import sys
+from typing import List, Optional, Union
+
+from cli.batch import DocumentResult, run_batch
+from core.cache import LLMCache
+from core.knowledge import DEFAULT_INDEX_DIR, DEFAULT_KNOWLEDGE_DIR, KnowledgeIndex
+from core.metrics import Metrics
+from core.generator import DEFAULT_MODEL
+from core.llm import OLLAMA_URL
+from core.output import OutputFormat
+from core.parser import DEFAULT_PAGE_CACHE_DIR
+
+
+def _print_result(result: DocumentResult) -> None:
+    if result.status == "generated":
+        print(
+            f"[generated] {result.document}: {result.test_cases} test cases "
+            f"from {result.chunks} chunks in {result.seconds:.1f}s"
+        )
+    elif result.status == "skipped":
+        print(f"[up to date] {result.document}")
+    else:
+        print(f"[failed] {result.document}: {result.error}")
+
+
+def _batch(args: argparse.Namespace) -> int:
+    summary = run_batch(
+        args.input_dir,
+        output_dir=args.output_dir,
+        formats=[OutputFormat(fmt) for fmt in args.format or [OutputFormat.excel.value]],
+        model=args.model,
+        max_retries=args.max_retries,
+        max_in_flight=args.max_in_flight,
+        parallel_documents=args.parallel_documents,
+        parse_ahead=args.parse_ahead,
+        parse_workers=args.parse_workers,
+        page_cache_dir=None if args.no_page_cache else args.page_cache,
+        force=args.force,
+        cache=None if args.no_cache else LLMCache(),
+        knowledge=KnowledgeIndex(args.knowledge_index) if args.knowledge_index else None,
+        urls=args.ollama_url,
+        keep_alive=args.keep_alive,
+        warm_up=not args.no_warm_up,
+        on_result=_print_result,
+    )
+
+    print()
+    print(summary.format())
+    return 1 if summary.failed else 0
+
+
+def _keep_alive(value: str) -> Union[str, int]:
+    # Ollama takes durations ("10m") or seconds, where -1 keeps the model loaded
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _ingest(args: argparse.Namespace) -> int:
+    metrics = Metrics()
+    index = KnowledgeIndex(args.index_dir, batch_size=args.batch_size)
+    report = index.ingest(args.source_dir, metrics=metrics)
+
+    embed = metrics.snapshot()["stages"].get("embed")
+    print(
+        f"Knowledge index: {len(report.added)} added, {len(report.updated)} updated, "
+        f"{len(report.removed)} removed, {report.unchanged} unchanged"
+    )
+    print(f"Chunks embedded: {report.chunks_embedded} in {report.seconds:.1f}s")
+    if embed:
+        print(
+            f"Embedding batches: {embed['count']}, "
+            f"p50 {embed['p50_seconds']:.3f}s, p95 {embed['p95_seconds']:.3f}s"
+        )
+    print(f"Indexed chunks: {len(index)}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="casecraft",
+        description="Generate structured test cases from feature documents.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch",
+        help="generate test cases for every document in a folder",
+    )
+    batch.add_argument("input_dir", help="folder of .pdf, .txt and .md documents")
+    batch.add_argument("-o", "--output-dir", default="outputs")
+    batch.add_argument(
+        "-f",
+        "--format",
+        action="append",
+        choices=[fmt.value for fmt in OutputFormat],
+        help="output format, may be repeated (default: excel)",
+    )
+    batch.add_argument("--model", default=DEFAULT_MODEL)
+    batch.add_argument(
+        "--ollama-url",
+        action="append",
+        metavar="URL",
+        help="Ollama generate endpoint, may be repeated to balance over several instances "
+        f"(default: {OLLAMA_URL})",
+    )
+    batch.add_argument("--max-retries", type=int, default=2)
+    batch.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=4,
+        help="maximum concurrent LLM requests across all documents",
+    )
+    batch.add_argument(
+        "--parallel-documents",
+        type=int,
+        default=2,
+        help="documents generated at the same time",
+    )
+    batch.add_argument(
+        "--parse-ahead",
+        type=int,
+        default=2,
+        help="documents parsed ahead of generation",
+    )
+    batch.add_argument(
+        "--parse-workers",
+        type=int,
+        default=1,
+        help="processes extracting the pages of a PDF",
+    )
+    batch.add_argument(
+        "--page-cache",
+        default=DEFAULT_PAGE_CACHE_DIR,
+        help=f"directory caching extracted PDF pages (default: {DEFAULT_PAGE_CACHE_DIR})",
+    )
+    batch.add_argument(
+        "--no-page-cache",
+        action="store_true",
+        help="extract PDF pages again instead of reusing cached ones",
+    )
+    batch.add_argument(
+        "--keep-alive",
+        type=_keep_alive,
+        default="10m",
+        help="how long Ollama keeps the model loaded, e.g. 30m or -1 (default: 10m)",
+    )
+    batch.add_argument(
+        "--no-warm-up",
+        action="store_true",
+        help="skip loading the model and priming the prompt cache before the first document",
+    )
+    batch.add_argument("--force", action="store_true", help="regenerate up to date outputs")
+    batch.add_argument("--no-cache", action="store_true", help="disable the LLM response cache")
+    batch.add_argument(
+        "--knowledge-index",
+        nargs="?",
+        const=DEFAULT_INDEX_DIR,
+        help="ground prompts in the knowledge index (see the ingest command)",
+    )
+    batch.set_defaults(handler=_batch)
+
+    ingest = commands.add_parser(
+        "ingest",
+        help="embed changed product documents into the knowledge index",
+    )
+    ingest.add_argument("source_dir", nargs="?", default=DEFAULT_KNOWLEDGE_DIR)
+    ingest.add_argument("--index-dir", default=DEFAULT_INDEX_DIR)
+    ingest.add_argument("--batch-size", type=int, default=64)
+    ingest.set_defaults(handler=_ingest)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+DEFAULT_CACHE_DIR = ".casecraft_cache/llm"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class LLMCache:
+    """
+    Persistent, content addressed cache for LLM results.
+
+    Each entry is stored as a JSON file named after a hash of
+    (model, prompt, options). When the cache grows beyond `max_bytes`, the
+    least recently used entries are evicted. File modification times record
+    recency, so the LRU order survives across runs.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        existing = sorted(
+            self.cache_dir.glob("*.json"),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in existing:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(model: str, prompt: str, options: Dict[str, Any]) -> str:
+        material = json.dumps(
+            {"model": model, "prompt": prompt, "options": options},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+
+        with self._lock:
+            try:
+                value = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+
+        with self._lock:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                try:
+                    self._path(key).unlink()
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
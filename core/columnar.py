@@ -0,0 +1,246 @@
+import json
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from core.schema import TestCase, TestSuite
+
+
+_LIST_FIELDS = ("preconditions", "steps", "expected_results", "actual_results")
+
+
+class _Strings:
+    """
+    Append-only column of strings stored as one UTF-8 buffer and the end
+    offset of each string, instead of one Python object per string.
+    """
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._ends = array("Q")
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def append(self, text: str) -> None:
+        self._data += text.encode("utf-8")
+        self._ends.append(len(self._data))
+
+    def get(self, position: int) -> str:
+        start = self._ends[position - 1] if position else 0
+        return self._data[start:self._ends[position]].decode("utf-8")
+
+    def span(self, start: int, stop: int) -> List[str]:
+        data = self._data
+        begin = self._ends[start - 1] if start else 0
+        strings = []
+        for end in self._ends[start:stop]:
+            strings.append(data[begin:end].decode("utf-8"))
+            begin = end
+        return strings
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._data) + self._ends.itemsize * len(self._ends)
+
+
+class _StringLists:
+    """
+    One list of strings per case: the strings of all cases in a single
+    _Strings column, and per case the offset of its first string.
+    """
+
+    def __init__(self) -> None:
+        self._items = _Strings()
+        self._offsets = array("Q", [0])
+
+    def append(self, values: Sequence[str]) -> None:
+        for value in values:
+            self._items.append(value)
+        self._offsets.append(len(self._items))
+
+    def get(self, position: int) -> List[str]:
+        return self._items.span(self._offsets[position], self._offsets[position + 1])
+
+    @property
+    def nbytes(self) -> int:
+        return self._items.nbytes + self._offsets.itemsize * len(self._offsets)
+
+
+class _Interned:
+    """
+    Table of distinct values with, for each, the positions of the cases
+    using it, so filtering by value doesn't scan the suite.
+    """
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.postings: List[array] = []
+
+    def intern(self, value: str) -> int:
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+            self.postings.append(array("I"))
+        return value_id
+
+    def positions(self, value: str) -> array:
+        value_id = self.ids.get(value)
+        return self.postings[value_id] if value_id is not None else array("I")
+
+
+class ColumnarSuite:
+    """
+    Compact, column-oriented storage for large test suites.
+
+    Each field is stored as a column instead of one pydantic TestCase per
+    case: strings in shared UTF-8 buffers, string lists offset-encoded in
+    them, tags and priorities interned with an index of the cases using
+    them, and test data as one JSON string per case. `positions` filters
+    by tag and priority through those indexes, `iter_data` feeds the
+    exporters (export and export_many accept a ColumnarSuite) without
+    building TestCase objects, and `[i]`, iteration and `to_suite`
+    produce TestCase objects on demand.
+    """
+
+    def __init__(
+        self,
+        feature_name: str = "Generated Feature",
+        source_document: str = "",
+        test_cases: Iterable[TestCase] = (),
+    ) -> None:
+        self.feature_name = feature_name
+        self.source_document = source_document
+
+        self._size = 0
+        self._use_cases = _Strings()
+        self._test_cases = _Strings()
+        self._test_data = _Strings()
+        self._lists = {field: _StringLists() for field in _LIST_FIELDS}
+        self._priorities = _Interned()
+        self._priority_ids = array("H")
+        self._tags = _Interned()
+        self._tag_ids = array("I")
+        self._tag_offsets = array("Q", [0])
+
+        self.extend(test_cases)
+
+    @classmethod
+    def from_suite(cls, suite: TestSuite) -> "ColumnarSuite":
+        return cls(suite.feature_name, suite.source_document, suite.test_cases)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, test_case: TestCase) -> None:
+        position = self._size
+
+        self._use_cases.append(test_case.use_case)
+        self._test_cases.append(test_case.test_case)
+        self._test_data.append(json.dumps(test_case.test_data, default=str) if test_case.test_data else "")
+        for field, column in self._lists.items():
+            column.append(getattr(test_case, field) or [])
+
+        priority_id = self._priorities.intern(test_case.priority)
+        self._priority_ids.append(priority_id)
+        self._priorities.postings[priority_id].append(position)
+
+        for tag in test_case.tags:
+            tag_id = self._tags.intern(tag)
+            self._tag_ids.append(tag_id)
+            postings = self._tags.postings[tag_id]
+            if not postings or postings[-1] != position:
+                postings.append(position)
+        self._tag_offsets.append(len(self._tag_ids))
+
+        self._size += 1
+
+    def extend(self, test_cases: Iterable[TestCase]) -> None:
+        for test_case in test_cases:
+            self.append(test_case)
+
+    def tags(self) -> List[str]:
+        return list(self._tags.values)
+
+    def priorities(self) -> List[str]:
+        return list(self._priorities.values)
+
+    def positions(self, tag: Optional[str] = None, priority: Optional[str] = None) -> List[int]:
+        """
+        Sorted positions of the cases having `tag` and `priority`; None
+        matches every case.
+        """
+        selected = [
+            index.positions(value)
+            for index, value in ((self._tags, tag), (self._priorities, priority))
+            if value is not None
+        ]
+        if not selected:
+            return list(range(self._size))
+        if len(selected) == 1:
+            return list(selected[0])
+
+        smaller, larger = sorted(selected, key=len)
+        larger_set = set(larger)
+        return [position for position in smaller if position in larger_set]
+
+    def data(self, position: int) -> Dict[str, Any]:
+        """
+        One case as a dict, in the shape of TestCase.model_dump(mode="json").
+        """
+        if not 0 <= position < self._size:
+            raise IndexError(position)
+
+        tag_ids = self._tag_ids[self._tag_offsets[position]:self._tag_offsets[position + 1]]
+        test_data = self._test_data.get(position)
+        return {
+            "use_case": self._use_cases.get(position),
+            "test_case": self._test_cases.get(position),
+            "preconditions": self._lists["preconditions"].get(position),
+            "test_data": json.loads(test_data) if test_data else {},
+            "steps": self._lists["steps"].get(position),
+            "priority": self._priorities.values[self._priority_ids[position]],
+            "tags": [self._tags.values[tag_id] for tag_id in tag_ids],
+            "expected_results": self._lists["expected_results"].get(position),
+            "actual_results": self._lists["actual_results"].get(position),
+        }
+
+    def iter_data(self, positions: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+        for position in range(self._size) if positions is None else positions:
+            yield self.data(position)
+
+    def __getitem__(self, position: int) -> TestCase:
+        if position < 0:
+            position += self._size
+        return TestCase.model_construct(**self.data(position))
+
+    def __iter__(self) -> Iterator[TestCase]:
+        return self.iter_cases()
+
+    def iter_cases(self, positions: Optional[Iterable[int]] = None) -> Iterator[TestCase]:
+        for data in self.iter_data(positions):
+            yield TestCase.model_construct(**data)
+
+    def to_suite(self, positions: Optional[Iterable[int]] = None) -> TestSuite:
+        return TestSuite.model_construct(
+            feature_name=self.feature_name,
+            source_document=self.source_document,
+            test_cases=list(self.iter_cases(positions)),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate size of the column buffers, without the interned tables.
+        """
+        arrays = (self._priority_ids, self._tag_ids, self._tag_offsets)
+        return (
+            self._use_cases.nbytes
+            + self._test_cases.nbytes
+            + self._test_data.nbytes
+            + sum(column.nbytes for column in self._lists.values())
+            + sum(a.itemsize * len(a) for a in arrays)
+            + sum(postings.itemsize * len(postings) for postings in self._tags.postings)
+            + sum(postings.itemsize * len(postings) for postings in self._priorities.postings)
+        )
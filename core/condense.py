@@ -0,0 +1,115 @@
+import math
+import re
+from collections import Counter
+from enum import Enum
+from typing import List
+
+
+class CondenseStrategy(str, Enum):
+    llm = "llm"
+    extractive = "extractive"
+    adaptive = "adaptive"
+
+
+# Words that mark normative, testable statements in feature documents
+_REQUIREMENT_WORDS = {
+    "must", "shall", "should", "required", "requires", "mandatory", "only",
+    "cannot", "can't", "not", "never", "always", "allow", "allowed", "allows",
+    "reject", "rejected", "deny", "denied", "invalid", "valid", "validate",
+    "validation", "error", "errors", "fail", "fails", "failure", "return",
+    "returns", "maximum", "minimum", "max", "min", "limit", "exceed",
+    "exceeds", "unique", "default", "if", "when", "unless",
+}
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+|\n+")
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9_'-]*")
+# HTTP status codes and identifiers such as ERR_401 or E-1002
+_ERROR_CODE = re.compile(r"\b(?:[1-5]\d{2}|[A-Z]{1,5}[-_]?\d{2,})\b")
+# snake_case, camelCase and dotted field names
+_FIELD_NAME = re.compile(r"\b(?:[a-z][a-z0-9]*(?:[_.][a-z0-9]+)+|[a-z]+[A-Z][A-Za-z0-9]*)\b")
+
+# Adaptive mode falls back to the LLM above this share of symbol characters
+_MAX_NOISE_RATIO = 0.3
+
+
+def _split_sentences(text: str) -> List[str]:
+    return [s.strip(" -*\t") for s in _SENTENCE_BOUNDARY.split(text) if s.strip(" -*\t")]
+
+
+def _score_sentences(sentences: List[str]) -> List[float]:
+    """
+    Score sentences by requirement markers plus the TF-IDF weight of their
+    words across the chunk.
+    """
+    tokenized = [[w.lower() for w in _WORD.findall(s)] for s in sentences]
+    document_frequency = Counter(word for words in tokenized for word in set(words))
+    count = len(sentences)
+
+    scores: List[float] = []
+    for sentence, words in zip(sentences, tokenized):
+        if not words:
+            scores.append(0.0)
+            continue
+
+        markers = sum(1 for w in words if w in _REQUIREMENT_WORDS)
+        codes = len(_ERROR_CODE.findall(sentence))
+        fields = len(_FIELD_NAME.findall(sentence))
+
+        term_counts = Counter(words)
+        tfidf = sum(
+            (n / len(words)) * math.log(1 + count / document_frequency[w])
+            for w, n in term_counts.items()
+        )
+
+        scores.append(2.0 * markers + 1.5 * codes + 1.0 * fields + tfidf)
+
+    return scores
+
+
+def _is_requirement(sentence: str) -> bool:
+    words = {w.lower() for w in _WORD.findall(sentence)}
+    return bool(
+        words & _REQUIREMENT_WORDS
+        or _ERROR_CODE.search(sentence)
+        or _FIELD_NAME.search(sentence)
+    )
+
+
+def extractive_condense(text: str, max_points: int = 10) -> str:
+    """
+    Condense a chunk locally into test relevant bullet points.
+
+    Picks the `max_points` highest scoring sentences and returns them in
+    document order, formatted like the LLM condensation output.
+    """
+    sentences = _split_sentences(text)
+    if not sentences:
+        return ""
+
+    scores = _score_sentences(sentences)
+    ranked = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+    selected = sorted(ranked[:max_points])
+
+    return "\n".join(f"- {sentences[i]}" for i in selected)
+
+
+def noise_ratio(text: str) -> float:
+    """
+    Share of characters that are neither letters, digits nor whitespace.
+    """
+    if not text:
+        return 0.0
+    symbols = sum(1 for ch in text if not (ch.isalnum() or ch.isspace()))
+    return symbols / len(text)
+
+
+def needs_llm_condense(text: str, max_points: int = 10) -> bool:
+    """
+    Decide whether a chunk is too long or too noisy for extractive
+    condensation to keep what matters.
+    """
+    if noise_ratio(text) > _MAX_NOISE_RATIO:
+        return True
+
+    requirements = sum(1 for s in _split_sentences(text) if _is_requirement(s))
+    return requirements == 0 or requirements > max_points
@@ -0,0 +1,214 @@
+import math
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_WORD = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class Merge(NamedTuple):
+    kept: int
+    merged: int
+    similarity: float
+    kept_test_case: str
+    merged_test_case: str
+
+
+def case_text(test_case: dict) -> str:
+    """
+    Text compared for near duplicates: names, steps and expected results.
+    """
+    parts: List[str] = [
+        str(test_case.get("use_case", "")),
+        str(test_case.get("test_case", "")),
+    ]
+    for field in ("steps", "expected_results"):
+        value = test_case.get(field) or []
+        parts.extend(str(item) for item in (value if isinstance(value, list) else [value]))
+    return "\n".join(parts)
+
+
+def _shingles(text: str, size: int) -> Set[int]:
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near duplicate detector for generated test cases.
+
+    Cases are compared on their names, steps and expected results. Candidate
+    pairs come from locality sensitive hashing, MinHash over word shingles by
+    default or random hyperplanes over vectors from an optional `embedder`,
+    so each insert only looks at a handful of similar cases instead of all of
+    them. Candidates are confirmed with exact Jaccard (or cosine) similarity
+    against `threshold`. Every merged case is recorded in `merges`.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 2,
+        embedder: Optional[Embedder] = None,
+        seed: int = 1,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.embedder = embedder
+        self.merges: List[Merge] = []
+
+        rng = random.Random(seed)
+        self._perms: List[Tuple[int, int]] = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._hyperplanes: Optional[List[List[float]]] = None
+        self._rng = rng
+
+        self._buckets: List[Dict[Tuple, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._features: List[object] = []
+        self._kept_indices: List[int] = []
+        self._kept_names: List[str] = []
+        self._seen = 0
+
+    def _signature(self, shingles: Set[int]) -> List[int]:
+        if not shingles:
+            return [0] * len(self._perms)
+        return [
+            min((a * h + b) % _MERSENNE_PRIME for h in shingles)
+            for a, b in self._perms
+        ]
+
+    def _vector_signature(self, vector: Sequence[float]) -> List[int]:
+        if self._hyperplanes is None:
+            self._hyperplanes = [
+                [self._rng.gauss(0, 1) for _ in range(len(vector))]
+                for _ in range(len(self._perms))
+            ]
+        return [
+            1 if sum(p * v for p, v in zip(plane, vector)) >= 0 else 0
+            for plane in self._hyperplanes
+        ]
+
+    def _bands_of(self, signature: List[int]) -> List[Tuple]:
+        return [
+            tuple(signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(
+        self,
+        test_case: dict,
+        vector: Optional[Sequence[float]] = None,
+    ) -> Optional[int]:
+        """
+        Add a case. Returns the position (in insertion order) of the kept
+        case it duplicates, or None if it is new and was kept.
+        """
+        position = self._seen
+        self._seen += 1
+
+        if self.embedder is not None and vector is None:
+            vector = self.embedder([case_text(test_case)])[0]
+
+        if vector is not None:
+            feature: object = list(vector)
+            signature = self._vector_signature(feature)
+        else:
+            feature = _shingles(case_text(test_case), self.shingle_size)
+            signature = self._signature(feature)
+
+        keys = self._bands_of(signature)
+
+        best: Optional[Tuple[float, int]] = None
+        checked: Set[int] = set()
+        for band, key in enumerate(keys):
+            for slot in self._buckets[band].get(key, ()):
+                if slot in checked:
+                    continue
+                checked.add(slot)
+
+                other = self._features[slot]
+                similarity = (
+                    _cosine(feature, other) if vector is not None else _jaccard(feature, other)
+                )
+                if similarity >= self.threshold and (best is None or similarity > best[0]):
+                    best = (similarity, slot)
+
+        if best is not None:
+            kept = self._kept_indices[best[1]]
+            self.merges.append(
+                Merge(
+                    kept=kept,
+                    merged=position,
+                    similarity=round(best[0], 4),
+                    kept_test_case=self._kept_names[best[1]],
+                    merged_test_case=str(test_case.get("test_case", "")),
+                )
+            )
+            return kept
+
+        slot = len(self._features)
+        self._features.append(feature)
+        self._kept_indices.append(position)
+        self._kept_names.append(str(test_case.get("test_case", "")))
+        for band, key in enumerate(keys):
+            self._buckets[band][key].append(slot)
+
+        return None
+
+
+def deduplicate_near(
+    test_cases: List[dict],
+    threshold: float = 0.6,
+    embedder: Optional[Embedder] = None,
+) -> Tuple[List[dict], List[Merge]]:
+    """
+    Drop near duplicate test cases, keeping the first of each group.
+
+    Returns the unique cases and the merges, with indices into `test_cases`.
+    With an `embedder`, all cases are embedded in a single batch.
+    """
+    index = NearDuplicateIndex(threshold=threshold, embedder=embedder)
+    vectors = embedder([case_text(tc) for tc in test_cases]) if embedder else None
+
+    unique = [
+        tc
+        for position, tc in enumerate(test_cases)
+        if index.add(tc, vectors[position] if vectors is not None else None) is None
+    ]
+
+    return unique, index.merges
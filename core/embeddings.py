@@ -0,0 +1,327 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from core.dedup import case_text
+from core.knowledge import DEFAULT_EMBEDDING_MODEL, SentenceTransformerEmbedder
+from core.parser import parse_document
+from core.schema import TestCase
+
+
+DEFAULT_EMBEDDING_CACHE_DIR = ".casecraft_cache/embeddings"
+
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_VECTORS_FILE = "vectors.f32"
+_KEYS_FILE = "keys.txt"
+_META_FILE = "meta.json"
+_INITIAL_ROWS = 1024
+
+
+class EmbeddingError(Exception):
+    pass
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store: a memory-mapped float32 matrix with one row
+    per text, keyed by a hash of the namespace (usually the model name) and
+    the text.
+
+    Rows are appended; the matrix file grows by doubling. Keys are appended
+    to a text file only after their rows are flushed, so an interrupted
+    write never exposes a half written vector. Thread-safe within one
+    process; it is not meant to be shared by concurrent processes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_EMBEDDING_CACHE_DIR,
+        namespace: str = DEFAULT_EMBEDDING_MODEL,
+    ) -> None:
+        safe_namespace = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in namespace)
+        self.cache_dir = Path(cache_dir) / safe_namespace
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+
+        self._lock = threading.Lock()
+        self._vectors_path = self.cache_dir / _VECTORS_FILE
+        self._keys_path = self.cache_dir / _KEYS_FILE
+        self._meta_path = self.cache_dir / _META_FILE
+
+        self.dim: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self._rows: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self._meta_path, encoding="utf-8") as f:
+                self.dim = int(json.load(f)["dim"])
+        except (OSError, ValueError, KeyError):
+            capacity = 0
+        else:
+            try:
+                capacity = self._vectors_path.stat().st_size // (self.dim * 4)
+            except OSError:
+                capacity = 0
+
+        if not capacity:
+            # A run that died before its first vectors and meta were written;
+            # keys left behind would point new vectors at the wrong texts
+            self.dim = None
+            self._keys_path.unlink(missing_ok=True)
+            return
+
+        self._matrix = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+        )
+
+        if not self._keys_path.exists():
+            return
+
+        # Key line N names vector row N. Keep the lines up to the first torn
+        # or unflushed one and cut the file there, so the next key appended
+        # lands on the line matching its row
+        valid_bytes = 0
+        with open(self._keys_path, "rb") as f:
+            for row, line in enumerate(f):
+                key = line.decode("ascii", "replace").strip()
+                if not line.endswith(b"\n") or len(key) != 64 or row >= capacity:
+                    break
+                self._rows[key] = row
+                valid_bytes += len(line)
+        if valid_bytes != self._keys_path.stat().st_size:
+            with open(self._keys_path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+
+        new_capacity = max(_INITIAL_ROWS, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self._matrix = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim)
+        )
+
+    def make_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, text: str) -> bool:
+        return self.make_key(text) in self._rows
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Cached vectors for `texts`, with None for every miss.
+        """
+        with self._lock:
+            found: List[Optional[np.ndarray]] = []
+            for text in texts:
+                row = self._rows.get(self.make_key(text))
+                if row is None:
+                    self.misses += 1
+                    found.append(None)
+                else:
+                    self.hits += 1
+                    found.append(np.array(self._matrix[row]))
+            return found
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts) != len(vectors):
+            raise ValueError("texts and vectors must have the same length")
+        if not len(texts):
+            return
+
+        with self._lock:
+            new_cache = self.dim is None
+            if new_cache:
+                self.dim = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match cache dimension {self.dim}"
+                )
+
+            new_keys: List[str] = []
+            new_rows: List[np.ndarray] = []
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(text)
+                if key not in self._rows and key not in new_keys:
+                    new_keys.append(key)
+                    new_rows.append(vector)
+            if not new_keys:
+                return
+
+            start = len(self._rows)
+            self._ensure_capacity(start + len(new_keys))
+            if new_cache:
+                # Only once the vectors file exists, so the meta never
+                # describes a cache without one
+                with open(self._meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim, "namespace": self.namespace}, f)
+            self._matrix[start:start + len(new_keys)] = np.stack(new_rows)
+            self._matrix.flush()
+
+            with open(self._keys_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{key}\n" for key in new_keys))
+                f.flush()
+                os.fsync(f.fileno())
+
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = start + offset
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._rows), "hits": self.hits, "misses": self.misses}
+
+
+def _worker_main(connection, factory: Callable[[], Embedder]) -> None:
+    embedder = factory()
+    while True:
+        texts = connection.recv()
+        if texts is None:
+            break
+        try:
+            connection.send(np.asarray(embedder(texts), dtype=np.float32))
+        except Exception as exc:  # sent back and raised in the parent
+            connection.send(EmbeddingError(f"{type(exc).__name__}: {exc}"))
+    connection.close()
+
+
+def _default_factory() -> Embedder:
+    return SentenceTransformerEmbedder()
+
+
+class EmbeddingWorker:
+    """
+    Runs an embedder in a long-lived child process so the model is loaded
+    once and kept warm across documents and pipeline stages.
+
+    `factory` is called in the child to create the embedder; it must be a
+    picklable top level callable. Calls are serialized.
+    """
+
+    def __init__(self, factory: Callable[[], Embedder] = _default_factory) -> None:
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_worker_main, args=(child, factory), daemon=True
+        )
+        self._process.start()
+        child.close()
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            if not self._process.is_alive():
+                raise EmbeddingError("Embedding worker is not running")
+            self._connection.send(list(texts))
+            try:
+                result = self._connection.recv()
+            except EOFError as exc:
+                raise EmbeddingError("Embedding worker exited") from exc
+
+        if isinstance(result, EmbeddingError):
+            raise result
+        return result
+
+    def close(self) -> None:
+        if self._process.is_alive():
+            try:
+                self._connection.send(None)
+            except OSError:
+                pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._connection.close()
+
+    def __enter__(self) -> "EmbeddingWorker":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class EmbeddingService:
+    """
+    Shared, cached and batched embedding entry point.
+
+    Texts are de-duplicated, looked up in `cache` and only the misses are
+    sent to `embedder` (in-process sentence-transformers by default, or an
+    EmbeddingWorker) in batches of `batch_size`. Instances are callables
+    returning one vector per text, so they plug into KnowledgeIndex and
+    NearDuplicateIndex as their `embedder`.
+    """
+
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 64,
+    ) -> None:
+        self.embedder = embedder or SentenceTransformerEmbedder(batch_size=batch_size)
+        self.cache = cache
+        self.batch_size = batch_size
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed `texts` as a float32 matrix, one row per text.
+        """
+        unique = list(dict.fromkeys(texts))
+        vectors: Dict[str, np.ndarray] = {}
+
+        cached = self.cache.get_many(unique) if self.cache is not None else [None] * len(unique)
+        missing = [text for text, vector in zip(unique, cached) if vector is None]
+        vectors.update((text, vector) for text, vector in zip(unique, cached) if vector is not None)
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            embedded = np.asarray(self.embedder(batch), dtype=np.float32)
+            if self.cache is not None:
+                self.cache.put_many(batch, embedded)
+            vectors.update(zip(batch, embedded))
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[text] for text in texts])
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        return self.embed(texts).tolist()
+
+    def embed_chunks(self, chunks: Iterable[str]) -> np.ndarray:
+        return self.embed(list(chunks))
+
+    def embed_document(self, file_path: str, **parse_options) -> np.ndarray:
+        """
+        Embed the parse_document chunks of a document.
+        """
+        return self.embed(parse_document(file_path, **parse_options))
+
+    def embed_test_cases(self, test_cases: Iterable[Union[TestCase, dict]]) -> np.ndarray:
+        """
+        Embed test cases by their names, steps and expected results, the
+        same text core.dedup compares.
+        """
+        return self.embed([
+            case_text(tc.model_dump() if isinstance(tc, TestCase) else tc)
+            for tc in test_cases
+        ])
@@ -1,81 +1,323 @@
+import csv
 import json
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from openpyxl import Workbook
-from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.styles import Alignment
-from openpyxl.utils import get_column_letter
-
-from core.schema import TestSuite
+from core.columnar import ColumnarSuite
+from core.schema import TestCase, TestSuite
 from core.output import OutputFormat
+from core.metrics import Metrics, timed
+
+
+class FlatCase(NamedTuple):
+    """
+    A test case flattened once for every exporter: `data` is its JSON
+    compatible dict, `row` the Excel/CSV columns.
+    """
+
+    data: Dict[str, Any]
+    row: List[str]
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "FlatCase":
+        return cls(data, _row(data))
+
+
+# Exporters write (cases, output_path, header); cases may be a lazy iterator
+# of FlatCase, so every exporter consumes it once, row by row
+Exporter = Callable[[Iterable[FlatCase], str, Dict[str, str]], None]
+
+_EXPORTERS: Dict[str, Exporter] = {}
+
+_HEADERS = [
+    "Use Case",
+    "Test Case",
+    "Preconditions",
+    "Test Data",
+    "Steps",
+    "Priority",
+    "Tags",
+    "Expected Results",
+    "Actual Results",
+]
 
 
 def _join_lines(items: List[str]) -> str:
     return "\n".join(items) if items else ""
 
 
-def _export_excel(suite: TestSuite, output_path: str) -> None:
-    workbook = Workbook()
-
-    sheet = workbook.active
-    if sheet is None:
-        sheet = workbook.create_sheet(title="Test Cases")
-    else:
-        sheet.title = "Test Cases"
-
-    headers = [
-        "Use Case",
-        "Test Case",
-        "Preconditions",
-        "Test Data",
-        "Steps",
-        "Priority",
-        "Tags",
-        "Expected Results",
-        "Actual Results",
+def _row(data: Dict[str, Any]) -> List[str]:
+    return [
+        data["use_case"],
+        data["test_case"],
+        _join_lines(data["preconditions"]),
+        "\n".join(f"{k}: {v}" for k, v in data["test_data"].items()),
+        _join_lines(data["steps"]),
+        data["priority"],
+        ", ".join(data["tags"]),
+        _join_lines(data["expected_results"]),
+        _join_lines(data["actual_results"] or []),
     ]
 
-    sheet.append(headers)
 
-    for col_idx in range(1, len(headers) + 1):
-        cell = sheet.cell(row=1, column=col_idx)
-        cell.alignment = Alignment(wrap_text=True)
+def flatten(test_case: TestCase) -> FlatCase:
+    return FlatCase.from_data(test_case.model_dump(mode="json"))
+
+
+def _export_excel(cases: Iterable[FlatCase], output_path: str, header: Dict[str, str]) -> None:
+    # openpyxl is the slowest import in casecraft; load it only for Excel output
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment
+    from openpyxl.utils import get_column_letter
+
+    # Write-only mode streams rows to disk instead of keeping every cell
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Test Cases")
+
+    for col_idx in range(1, len(_HEADERS) + 1):
         sheet.column_dimensions[get_column_letter(col_idx)].width = 30
 
-    for test_case in suite.test_cases:
-        sheet.append([
-            test_case.use_case,
-            test_case.test_case,
-            _join_lines(test_case.preconditions),
-            "\n".join(f"{k}: {v}" for k, v in test_case.test_data.items()),
-            _join_lines(test_case.steps),
-            test_case.priority,
-            ", ".join(test_case.tags),
-            _join_lines(test_case.expected_results),
-            _join_lines(test_case.actual_results or []),
-        ])
-
-    # no need to delete default sheet when using workbook.active
+    header_row = []
+    for title in _HEADERS:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.alignment = Alignment(wrap_text=True)
+        header_row.append(cell)
+    sheet.append(header_row)
+
+    for case in cases:
+        sheet.append(case.row)
 
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     workbook.save(output_path)
 
 
-def _export_json(suite: TestSuite, output_path: str) -> None:
+def _export_json(cases: Iterable[FlatCase], output_path: str, header: Dict[str, str]) -> None:
+    # Same layout as TestSuite.model_dump_json(indent=2), written case by case
+    def dumps(value: Any) -> str:
+        return json.dumps(value, indent=2, ensure_ascii=False)
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for key, value in header.items():
+            f.write(f"  {dumps(key)}: {dumps(value)},\n")
+        f.write('  "test_cases": [')
+
+        separator = "\n"
+        for case in cases:
+            case_json = dumps(case.data)
+            f.write(separator + "\n".join("    " + line for line in case_json.splitlines()))
+            separator = ",\n"
+
+        f.write("]\n}" if separator == "\n" else "\n  ]\n}")
+
+
+def _export_jsonl(cases: Iterable[FlatCase], output_path: str, header: Dict[str, str]) -> None:
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(suite.model_dump_json(indent=2))
+        for case in cases:
+            f.write(json.dumps(case.data, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def _export_csv(cases: Iterable[FlatCase], output_path: str, header: Dict[str, str]) -> None:
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(_HEADERS)
+        for case in cases:
+            writer.writerow(case.row)
+
+
+def register_exporter(output_format: Union[OutputFormat, str], exporter: Exporter) -> None:
+    """
+    Register the function writing `output_format`. It is called as
+    `exporter(cases, output_path, header)` with an iterable of FlatCase and
+    should consume it once, as it comes, and import its dependencies when
+    called.
+    """
+    _EXPORTERS[getattr(output_format, "value", output_format)] = exporter
+
+
+def _exporter_for(output_format: Union[OutputFormat, str]) -> Tuple[str, Exporter]:
+    name = getattr(output_format, "value", output_format)
+    exporter = _EXPORTERS.get(name)
+    if exporter is None:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return name, exporter
+
+
+def _flat_cases(
+    suite: Union[TestSuite, ColumnarSuite, Iterable[TestCase]],
+    feature_name: str,
+    source_document: str,
+) -> Tuple[Dict[str, str], Iterator[FlatCase]]:
+    if isinstance(suite, ColumnarSuite):
+        header = {"feature_name": suite.feature_name, "source_document": suite.source_document}
+        # Straight from the columns, without building TestCase objects
+        return header, map(FlatCase.from_data, suite.iter_data())
+    if isinstance(suite, TestSuite):
+        feature_name, source_document = suite.feature_name, suite.source_document
+        suite = suite.test_cases
+    header = {"feature_name": feature_name, "source_document": source_document}
+    return header, map(flatten, suite)
 
 
 def export(
-    suite: TestSuite,
+    suite: Union[TestSuite, ColumnarSuite, Iterable[TestCase]],
     output_format: OutputFormat,
     output_path: str,
+    metrics: Optional[Metrics] = None,
+    feature_name: str = "Generated Feature",
+    source_document: str = "",
 ) -> None:
-    if output_format == OutputFormat.excel:
-        _export_excel(suite, output_path)
-    elif output_format == OutputFormat.json:
-        _export_json(suite, output_path)
-    else:
-        raise ValueError(f"Unsupported output format: {output_format}")
+    """
+    Write a suite, a ColumnarSuite or any iterable of test cases in
+    `output_format`.
+
+    Cases are written one at a time, so an iterator such as
+    core.generator.iter_test_cases is exported while it is generated and
+    memory stays constant. `feature_name` and `source_document` describe
+    an iterable in formats that record them (JSON); a TestSuite brings its
+    own.
+    """
+    name, exporter = _exporter_for(output_format)
+    header, cases = _flat_cases(suite, feature_name, source_document)
+
+    with timed(metrics, "export", format=name):
+        exporter(cases, output_path, header)
+
+
+# End markers the producer puts on every writer queue
+_DONE = object()
+_ABORT = object()
+
+
+class _ExportAborted(Exception):
+    pass
+
+
+def _queued(batches: "queue.Queue[Any]", state: Dict[str, bool]) -> Iterator[FlatCase]:
+    while True:
+        batch = batches.get()
+        if batch is _DONE or batch is _ABORT:
+            state["finished"] = True
+            if batch is _ABORT:
+                raise _ExportAborted()
+            return
+        yield from batch
+
+
+def _write(
+    name: str,
+    exporter: Exporter,
+    batches: "queue.Queue[Any]",
+    tmp_path: Path,
+    header: Dict[str, str],
+    metrics: Optional[Metrics],
+) -> None:
+    state = {"finished": False}
+    try:
+        with timed(metrics, "export", format=name):
+            exporter(_queued(batches, state), str(tmp_path), header)
+    finally:
+        # A writer that stopped early keeps draining, so the producer never
+        # blocks on its full queue
+        if not state["finished"]:
+            try:
+                for _ in _queued(batches, state):
+                    pass
+            except _ExportAborted:
+                pass
+
+
+def export_many(
+    suite: Union[TestSuite, ColumnarSuite, Iterable[TestCase]],
+    outputs: Mapping[Union[OutputFormat, str], Union[str, Path]],
+    metrics: Optional[Metrics] = None,
+    feature_name: str = "Generated Feature",
+    source_document: str = "",
+    batch_size: int = 64,
+    queue_size: int = 8,
+) -> None:
+    """
+    Write a suite, a ColumnarSuite or any iterable of test cases in several
+    formats at once.
+
+    `outputs` maps each format to its path. Every case is flattened once
+    and handed, `batch_size` cases at a time, to one writer thread per
+    format through a queue of at most `queue_size` batches, so the suite
+    is walked a single time and memory stays constant.
+
+    Writers write to a hidden temporary file next to their output; only
+    when all of them succeeded are the files renamed into place, so an
+    interrupted or failed export leaves no partial outputs.
+    """
+    writers = [
+        (*_exporter_for(output_format), Path(path))
+        for output_format, path in outputs.items()
+    ]
+    header, cases = _flat_cases(suite, feature_name, source_document)
+    if not writers:
+        return
+
+    queues: List["queue.Queue[Any]"] = [queue.Queue(maxsize=queue_size) for _ in writers]
+    tmp_paths = [path.with_name(f".{path.name}.tmp") for _, _, path in writers]
+    for path in tmp_paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=len(writers), thread_name_prefix="export") as pool:
+        futures = [
+            pool.submit(_write, name, exporter, batches, tmp_path, header, metrics)
+            for (name, exporter, _), batches, tmp_path in zip(writers, queues, tmp_paths)
+        ]
+
+        end = _ABORT
+        try:
+            batch: List[FlatCase] = []
+            for case in cases:
+                batch.append(case)
+                if len(batch) >= batch_size:
+                    for batches in queues:
+                        batches.put(batch)
+                    batch = []
+            if batch:
+                for batches in queues:
+                    batches.put(batch)
+            end = _DONE
+        finally:
+            for batches in queues:
+                batches.put(end)
+            errors = [future.exception() for future in futures]
+
+            failed = end is _ABORT or any(error is not None for error in errors)
+            for tmp_path, (_, _, path) in zip(tmp_paths, writers):
+                if failed:
+                    tmp_path.unlink(missing_ok=True)
+                else:
+                    os.replace(tmp_path, path)
+
+    for error in errors:
+        if error is not None:
+            raise error
+
+
+register_exporter(OutputFormat.excel, _export_excel)
+register_exporter(OutputFormat.json, _export_json)
+register_exporter(OutputFormat.jsonl, _export_jsonl)
+register_exporter(OutputFormat.csv, _export_csv)
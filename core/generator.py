@@ -1,177 +1,427 @@
 import json
-import requests
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
-from core.schema import TestSuite
-from core.parser import parse_document
+from core.cache import LLMCache
+from core.condense import CondenseStrategy, extractive_condense, needs_llm_condense
+from core.dedup import NearDuplicateIndex
+from core.jsonstream import JSONArrayStreamParser, repair_json
+from core.journal import RunJournal
+from core.knowledge import KnowledgeIndex
+from core.llm import LLMClient, LLMClientError
+from core.manifest import ChunkManifest, chunk_fingerprint
+from core.metrics import Metrics, timed
+from core.prompts import load_prompt
+from core.schema import TestCase, TestSuite
+from core.validation import describe_invalid, validate_test_cases
+from core.parser import estimate_tokens, parse_document
 
 
 class GenerationError(Exception):
     pass
 
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
 DEFAULT_MODEL = "llama3.1:8b"
 
+_CONDENSE_OPTIONS = {
+    "num_predict": 200,
+    "temperature": 0.2,
+}
+_GENERATE_OPTIONS = {"num_predict": 300}
 
-def _build_prompt(chunks: List[str]) -> str:
-    joined_text = "\n\n".join(chunks)
+# Estimated size of a default 800 character chunk. Prompt limits and output
+# budgets are scaled by how many of these a packed chunk holds.
+_BASE_CHUNK_TOKENS = 200
+_CASES_PER_BASE_CHUNK = 3
+_POINTS_PER_BASE_CHUNK = 10
 
-    return f"""
-Think like a senior QA engineer designing tests for production systems.
-Generate test cases from the following feature documentation.
 
-STRICT RULES:
-- Return ONLY valid JSON
-- Do NOT add explanations
-- Do NOT add markdown
-- Do NOT add extra text
-- Return a JSON ARRAY, not an object
-- Include positive, negative, and edge cases where applicable
-- Generate at most 3 test cases
+def _build_prompt(
+    chunks: List[str],
+    max_cases: int = _CASES_PER_BASE_CHUNK,
+    context: Optional[List[str]] = None,
+) -> str:
+    knowledge = (
+        "Related product knowledge (reference only, do not write tests for it):\n"
+        + "\n\n".join(context)
+        + "\n\n"
+        if context
+        else ""
+    )
+
+    return load_prompt("generate").render(
+        max_cases=max_cases,
+        knowledge=knowledge,
+        documentation="\n\n".join(chunks),
+    )
+
+
+def _chunk_scale(chunk: str) -> int:
+    """
+    Number of default sized chunks a (possibly packed) chunk corresponds to.
+    """
+    return max(1, -(-estimate_tokens(chunk) // _BASE_CHUNK_TOKENS))
+
+
+def _scaled_options(options: Dict[str, Any], scale: int) -> Dict[str, Any]:
+    if scale == 1:
+        return options
+    return {**options, "num_predict": options["num_predict"] * scale}
+
+
+def _packed_chunk_tokens(context_tokens: int) -> int:
+    """
+    Largest packed chunk, in estimated tokens, whose condense and generate
+    requests both fit in `context_tokens` including the prompt template and
+    the output budget.
+    """
+    template_tokens = estimate_tokens(_build_prompt([]))
+    tokens_per_scale = (
+        _CONDENSE_OPTIONS["num_predict"] + _GENERATE_OPTIONS["num_predict"]
+    )
+    max_scale = max(1, (context_tokens - template_tokens) // tokens_per_scale)
+    return max_scale * _BASE_CHUNK_TOKENS
 
-Each test case must follow this schema:
 
-{{
-  "use_case": "string",
-  "test_case": "string",
-  "preconditions": ["string"],
-  "test_data": {{"key": "value"}},
-  "steps": ["string"],
-  "priority": "high | medium | low",
-  "tags": ["string"],
-  "expected_results": ["string"],
-  "actual_results": []
-}}
+def _pack_chunks(
+    chunks: List[str],
+    max_tokens: int,
+    overlap: int = 100,
+) -> List[str]:
+    """
+    Merge consecutive chunks into as few chunks as fit in `max_tokens`.
+
+    The text repeated by the parser's chunk `overlap` is dropped at each seam
+    so packed chunks read like the original document.
+    """
+    packed: List[str] = []
+    current = ""
 
-Feature documentation:
-{joined_text}
-"""
+    for chunk in chunks:
+        if current:
+            seam = (
+                overlap
+                if 0 < overlap < len(chunk) and current.endswith(chunk[:overlap])
+                else 0
+            )
+            candidate = current + chunk[seam:]
+            if estimate_tokens(candidate) <= max_tokens:
+                current = candidate
+                continue
+            packed.append(current)
+        current = chunk
 
+    if current:
+        packed.append(current)
 
+    return packed
 
-def _condense_chunk(chunk: str, model: str) -> str:
+
+def _condense_chunk(
+    chunk: str,
+    model: str,
+    client: LLMClient,
+    cache: Optional[LLMCache] = None,
+    scale: int = 1,
+    metrics: Optional[Metrics] = None,
+) -> str:
     """
     Reduce a document chunk to concise, test relevant bullet points.
+
+    `scale` is the number of default sized chunks packed into `chunk`; the
+    bullet limit and output budget grow with it.
     """
-    prompt = f"""
-Summarize the following feature description into concise,
-test relevant bullet points.
-
-Rules:
-- Focus on behaviors, inputs, outputs, and rules
-- Exclude explanations and fluff
-- Keep it under 10 bullet points
-- Use plain text
-- No JSON
-- No markdown
-
-Feature text:
-{chunk}
-"""
-
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-        "options": {
-            "num_predict": 200,
-            "temperature": 0.2,
-        },
-    }
-
-    response = requests.post(OLLAMA_URL, json=payload)
-
-    if response.status_code != 200:
-        raise GenerationError("Chunk condensation failed")
-
-    condensed = response.json().get("response", "")
+    options = _scaled_options(_CONDENSE_OPTIONS, scale)
+    prompt = load_prompt("condense").render(
+        max_points=_POINTS_PER_BASE_CHUNK * scale,
+        text=chunk,
+    )
+
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(model, prompt, options)
+        cached = cache.get(cache_key)
+        if metrics is not None:
+            metrics.record_cache("condense", isinstance(cached, str))
+        if isinstance(cached, str):
+            return cached
+
+    try:
+        response_json = client.generate(model, prompt, options=options)
+    except LLMClientError as exc:
+        raise GenerationError("Chunk condensation failed") from exc
+
+    if metrics is not None:
+        metrics.record_llm("condense", response_json)
+
+    condensed = response_json.get("response", "")
     if not condensed or not isinstance(condensed, str):
         raise GenerationError("Empty condensed chunk returned")
 
-    return condensed.strip()
+    condensed = condensed.strip()
+    if cache is not None:
+        cache.put(cache_key, condensed)
+
+    return condensed
 
 
 def _generate_single_suite(
     prompt: str,
     model: str,
     max_retries: int,
+    client: LLMClient,
+    cache: Optional[LLMCache] = None,
+    options: Optional[Dict[str, Any]] = None,
+    metrics: Optional[Metrics] = None,
+) -> list:
+    """
+    Generate test cases for a prompt, consulting `cache` first.
+
+    Only successfully normalized results are cached, so invalid model output
+    is never replayed from disk.
+    """
+    options = options or _GENERATE_OPTIONS
+
+    if cache is None:
+        return _request_test_cases(prompt, model, max_retries, client, options, metrics)
+
+    cache_key = _generation_cache_key(cache, model, prompt, options)
+    cached = cache.get(cache_key)
+    if metrics is not None:
+        metrics.record_cache("generate", isinstance(cached, list))
+    if isinstance(cached, list):
+        return _accept_test_cases(cached, metrics)
+
+    test_cases = _request_test_cases(prompt, model, max_retries, client, options, metrics)
+    cache.put(cache_key, test_cases)
+    return test_cases
+
+
+def _generation_cache_key(
+    cache: LLMCache,
+    model: str,
+    prompt: str,
+    options: Dict[str, Any],
+) -> str:
+    return cache.make_key(model, prompt, {"format": "json", **options})
+
+
+def _stream_test_cases(
+    prompt: str,
+    model: str,
+    max_retries: int,
+    client: LLMClient,
+    cache: Optional[LLMCache] = None,
+    options: Optional[Dict[str, Any]] = None,
+    metrics: Optional[Metrics] = None,
+) -> Iterator[dict]:
+    """
+    Yield test cases for a prompt as soon as each one has been streamed.
+
+    If the stream yields no complete test case (e.g. the model returned a
+    single object, or the stream broke before the first case), this falls back
+    to the regular request path with its corrective retries. A stream that
+    breaks after some cases were yielded raises GenerationError.
+    """
+    options = options or _GENERATE_OPTIONS
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _generation_cache_key(cache, model, prompt, options)
+        cached = cache.get(cache_key)
+        if metrics is not None:
+            metrics.record_cache("generate", isinstance(cached, list))
+        if isinstance(cached, list):
+            yield from _accept_test_cases(cached, metrics)
+            return
+
+    parser = JSONArrayStreamParser()
+    fragments: List[str] = []
+    emitted: List[dict] = []
+
+    try:
+        for fragment in client.generate_stream(
+            model,
+            prompt,
+            options=options,
+            format="json",
+            on_done=partial(metrics.record_llm, "generate") if metrics is not None else None,
+        ):
+            fragments.append(fragment)
+            for test_case in _accept_test_cases(parser.feed(fragment), metrics):
+                emitted.append(test_case)
+                yield test_case
+    except LLMClientError as exc:
+        if emitted:
+            # The cases already delivered stay with the caller, but the chunk
+            # is incomplete: fail it so it is neither cached nor recorded
+            raise GenerationError(
+                f"Stream broke after {len(emitted)} test case(s)"
+            ) from exc
+        fragments = []
+
+    if not emitted:
+        text = "".join(fragments)
+        try:
+            emitted = _normalize_test_cases(json.loads(text)) or []
+        except ValueError:
+            emitted = _normalize_test_cases(repair_json(text)) or []
+        emitted = _accept_test_cases(emitted, metrics)
+
+        if not emitted:
+            emitted = _request_test_cases(
+                prompt, model, max_retries, client, options, metrics
+            )
+
+        yield from emitted
+
+    if cache is not None:
+        cache.put(cache_key, emitted)
+
+
+def _normalize_test_cases(result) -> Optional[list]:
+    """
+    Normalize the accepted model output shapes to a list of test cases.
+
+    Returns None when no list of test cases can be found.
+    """
+    if isinstance(result, list):
+        return result
+
+    if isinstance(result, dict):
+        # Common explicit fields
+        if "test_cases" in result and isinstance(result["test_cases"], list):
+            return result["test_cases"]
+        if "cases" in result and isinstance(result["cases"], list):
+            return result["cases"]
+
+        # If the model returned a single test case object (not wrapped in a list),
+        # accept it by wrapping in a list to normalize the shape.
+        if any(k in result for k in ("test_case", "use_case")):
+            return [result]
+
+        # Fallback: try to find the first list value that looks like test cases
+        for key, value in result.items():
+            if isinstance(value, list) and value and all(isinstance(i, dict) for i in value):
+                return value
+
+    return None
+
+
+def _accept_test_cases(test_cases: list, metrics: Optional[Metrics] = None) -> List[dict]:
+    """
+    Validate cases one by one and keep the valid ones as coerced dicts.
+
+    Stored results (cache, manifest, journal) go through here as well, so
+    entries written before validation moved into the chunk are checked too.
+    """
+    valid, invalid = validate_test_cases(test_cases)
+    if invalid and metrics is not None:
+        metrics.increment("cases_invalid", len(invalid))
+    return [tc.model_dump(exclude_unset=True) for tc in valid]
+
+
+def _request_test_cases(
+    prompt: str,
+    model: str,
+    max_retries: int,
+    client: LLMClient,
+    options: Optional[Dict[str, Any]] = None,
+    metrics: Optional[Metrics] = None,
 ) -> list:
+    options = options or _GENERATE_OPTIONS
     last_error: Exception | None = None
     corrective_feedback: str | None = None
+    retry_reason: str | None = None
+    # Valid cases of the best attempt whose other cases failed validation
+    partial: List[dict] = []
 
     for _ in range(max_retries + 1):
+        if retry_reason is not None and metrics is not None:
+            metrics.record_retry(retry_reason)
+        # Feedback goes after the original prompt so retries keep its cached prefix
         final_prompt = (
             prompt
             if corrective_feedback is None
-            else (
-                prompt
-                + "\n\nThe previous output was invalid:\n"
-                + corrective_feedback
-                + "\n\nReturn a complete JSON array only."
-            )
+            else prompt + load_prompt("retry").render(feedback=corrective_feedback)
         )
 
-        payload = {
-            "model": model,
-            "prompt": final_prompt,
-            "stream": False,
-            "format": "json",
-            "options": {"num_predict": 300},
-        }
-
-        response = requests.post(OLLAMA_URL, json=payload)
-
-        if response.status_code != 200:
-            last_error = GenerationError(f"Ollama request failed: {response.status_code} {response.text!r}")
-            continue
-
         try:
-            response_json = response.json()
-        except Exception as exc:
+            response_json = client.generate(
+                model,
+                final_prompt,
+                options=options,
+                format="json",
+            )
+        except LLMClientError as exc:
             last_error = exc
-            corrective_feedback = "Response was not valid JSON."
+            retry_reason = "llm_error"
             continue
 
+        if metrics is not None:
+            metrics.record_llm("generate", response_json)
+
         result = response_json.get("response")
+        repaired = False
 
         if isinstance(result, str):
             try:
-                import json
                 result = json.loads(result)
             except Exception as exc:
-                last_error = exc
+                # Try to recover locally before paying for another generation
+                result = repair_json(result)
+                if result is None:
+                    last_error = exc
+                    corrective_feedback = "JSON array was incomplete or invalid."
+                    retry_reason = "invalid_json"
+                    continue
+                repaired = True
+                if metrics is not None:
+                    metrics.increment("json_repaired")
+
+        # Normalize output shapes
+        test_cases = _normalize_test_cases(result)
+        if test_cases is not None:
+            valid, invalid = validate_test_cases(test_cases)
+            if invalid and metrics is not None:
+                metrics.increment("cases_invalid", len(invalid))
+            valid_cases = [tc.model_dump(exclude_unset=True) for tc in valid]
+
+            # A repaired response is expected to end in a cut off case
+            if not invalid or (repaired and valid_cases):
+                return valid_cases
+
+            if repaired:
+                last_error = GenerationError("No complete test case could be recovered")
                 corrective_feedback = "JSON array was incomplete or invalid."
+                retry_reason = "invalid_json"
                 continue
 
-        # Normalize output shapes
-        if isinstance(result, list):
-            return result
+            if len(valid_cases) > len(partial):
+                partial = valid_cases
+            last_error = GenerationError(
+                "Test cases failed schema validation:\n" + describe_invalid(invalid)
+            )
+            corrective_feedback = (
+                "Some test cases did not match the schema:\n"
+                + describe_invalid(invalid)
+                + "\nEvery test case needs all required fields with the schema's types."
+            )
+            retry_reason = "invalid_cases"
+            continue
 
         if isinstance(result, dict):
-            # Common explicit fields
-            if "test_cases" in result and isinstance(result["test_cases"], list):
-                return result["test_cases"]
-            if "cases" in result and isinstance(result["cases"], list):
-                return result["cases"]
-
-            # If the model returned a single test case object (not wrapped in a list),
-            # accept it by wrapping in a list to normalize the shape.
-            if any(k in result for k in ("test_case", "use_case")):
-                return [result]
-
-            # Fallback: try to find the first list value that looks like test cases
-            for key, value in result.items():
-                if isinstance(value, list) and value and all(isinstance(i, dict) for i in value):
-                    return value
-
             # Surface model-side error messages if present, otherwise include the raw response
             if "error" in result:
                 last_error = GenerationError(f"Model returned an error: {result['error']}")
+                retry_reason = "model_error"
             else:
                 last_error = GenerationError(
                     f"Could not normalize test cases from model output. Response: {result!r}"
                 )
+                retry_reason = "unexpected_shape"
 
             corrective_feedback = (
                 "Return test cases as a JSON array, "
@@ -182,50 +432,401 @@ def _generate_single_suite(
         # Unknown shape -> retry with corrective feedback
         last_error = GenerationError("Unexpected model output shape")
         corrective_feedback = "Return only a JSON array of test case objects."
+        retry_reason = "unexpected_shape"
         continue
 
+    if partial:
+        # Keep what validated rather than losing the whole chunk
+        return partial
+
     raise GenerationError(
         "Failed to generate valid test cases after retries."
     ) from last_error
 
 
+Condenser = Union[CondenseStrategy, str, Callable[[str], str]]
+
+
+def _condense(
+    chunk: str,
+    model: str,
+    client: LLMClient,
+    cache: Optional[LLMCache] = None,
+    scale: int = 1,
+    condense: Condenser = CondenseStrategy.llm,
+    metrics: Optional[Metrics] = None,
+) -> str:
+    """
+    Condense a chunk with the selected strategy.
+
+    `condense` is a CondenseStrategy (or its name) or any callable mapping a
+    chunk to condensed text. The adaptive strategy uses local extractive
+    condensation and only calls the LLM for chunks that are too long or too
+    noisy for it.
+    """
+    if callable(condense):
+        return condense(chunk)
+
+    strategy = CondenseStrategy(condense)
+    max_points = _POINTS_PER_BASE_CHUNK * scale
+
+    if strategy == CondenseStrategy.extractive or (
+        strategy == CondenseStrategy.adaptive
+        and not needs_llm_condense(chunk, max_points=max_points)
+    ):
+        condensed = extractive_condense(chunk, max_points=max_points)
+        if condensed:
+            return condensed
+
+    return _condense_chunk(
+        chunk, model, client=client, cache=cache, scale=scale, metrics=metrics
+    )
+
+
+def _condense_name(condense: Condenser) -> str:
+    if callable(condense):
+        return getattr(condense, "__qualname__", repr(condense))
+    return CondenseStrategy(condense).value
+
+
+def warm_up_model(
+    model: str,
+    client: LLMClient,
+    condense: Condenser = CondenseStrategy.llm,
+    metrics: Optional[Metrics] = None,
+) -> bool:
+    """
+    Load `model` and prime Ollama's prompt cache before the first chunk.
+
+    Sends the static prefix of each prompt template the run will use with a
+    one token output budget, so the first chunks neither wait for the model
+    to load nor evaluate the rules and schema from scratch. Best effort:
+    returns False when Ollama could not be reached.
+    """
+    names = ["generate"]
+    if not callable(condense) and CondenseStrategy(condense) != CondenseStrategy.extractive:
+        names.insert(0, "condense")
+
+    with timed(metrics, "warmup"):
+        for name in names:
+            try:
+                response_json = client.generate(
+                    model, load_prompt(name).prefix, options={"num_predict": 1}
+                )
+            except LLMClientError:
+                return False
+            if metrics is not None:
+                metrics.record_llm("warmup", response_json)
+    return True
+
+
+def _iter_chunk(
+    index: int,
+    chunk: str,
+    model: str,
+    max_retries: int,
+    client: LLMClient,
+    cache: Optional[LLMCache] = None,
+    stream: bool = False,
+    on_condensed: Optional[Callable[[str], None]] = None,
+    condense: Condenser = CondenseStrategy.llm,
+    metrics: Optional[Metrics] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
+) -> Iterator[dict]:
+    """
+    Condense a single chunk and yield its generated test cases.
+
+    With `knowledge`, the snippets most related to the condensed chunk are
+    added to the generation prompt.
+    """
+    scale = _chunk_scale(chunk)
+    started = time.perf_counter()
+
+    try:
+        with timed(metrics, "condense", chunk=index):
+            condensed = _condense(
+                chunk,
+                model,
+                client=client,
+                cache=cache,
+                scale=scale,
+                condense=condense,
+                metrics=metrics,
+            )
+        if on_condensed is not None:
+            on_condensed(condensed)
+
+        context = None
+        if knowledge is not None:
+            with timed(metrics, "retrieve", chunk=index):
+                context = knowledge.context_for(condensed)
+
+        chunk_prompt = _build_prompt(
+            [condensed], max_cases=_CASES_PER_BASE_CHUNK * scale, context=context
+        )
+        options = _scaled_options(_GENERATE_OPTIONS, scale)
+
+        if stream:
+            with timed(metrics, "generate", chunk=index):
+                yield from _stream_test_cases(
+                    prompt=chunk_prompt,
+                    model=model,
+                    max_retries=max_retries,
+                    client=client,
+                    cache=cache,
+                    options=options,
+                    metrics=metrics,
+                )
+        else:
+            with timed(metrics, "generate", chunk=index):
+                test_cases = _generate_single_suite(
+                    prompt=chunk_prompt,
+                    model=model,
+                    max_retries=max_retries,
+                    client=client,
+                    cache=cache,
+                    options=options,
+                    metrics=metrics,
+                )
+            yield from test_cases
+
+        if metrics is not None:
+            metrics.record_stage("chunk", time.perf_counter() - started, chunk=index)
+    except GenerationError as exc:
+        raise GenerationError(
+            f"Failed to generate test cases for chunk {index}"
+        ) from exc
+
+
+def _generate_chunk(
+    index: int,
+    chunk: str,
+    model: str,
+    max_retries: int,
+    client: LLMClient,
+    cache: Optional[LLMCache] = None,
+    stream: bool = False,
+    condense: Condenser = CondenseStrategy.llm,
+    metrics: Optional[Metrics] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
+) -> Tuple[str, List[dict]]:
+    """
+    Condense a single chunk and generate its test cases.
+
+    Returns the condensed text together with the test cases.
+    """
+    condensed: List[str] = []
+    test_cases = list(
+        _iter_chunk(
+            index, chunk, model, max_retries, client, cache, stream,
+            on_condensed=condensed.append,
+            condense=condense,
+            metrics=metrics,
+            knowledge=knowledge,
+        )
+    )
+    return (condensed[0] if condensed else ""), test_cases
+
+
+def _chunk_fingerprints(
+    chunks: List[str],
+    model: str,
+    condense: Condenser = CondenseStrategy.llm,
+    knowledge: Optional[KnowledgeIndex] = None,
+) -> List[str]:
+    # The prompt template, condensation strategy and knowledge revision are
+    # part of the fingerprint so changing any of them invalidates stored results
+    context = [_build_prompt([]), _condense_name(condense)]
+    if knowledge is not None:
+        context.append(knowledge.revision)
+    return [chunk_fingerprint(chunk, model, *context) for chunk in chunks]
+
+
+def _iter_generated_cases(
+    chunks: List[str],
+    model: str,
+    max_retries: int,
+    client: LLMClient,
+    concurrency: int = 1,
+    cache: Optional[LLMCache] = None,
+    stream: bool = False,
+    manifest: Optional[ChunkManifest] = None,
+    journal: Optional[RunJournal] = None,
+    completed: Optional[Dict[int, dict]] = None,
+    failed_chunks: Optional[List[int]] = None,
+    condense: Condenser = CondenseStrategy.llm,
+    metrics: Optional[Metrics] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
+) -> Iterator[dict]:
+    """
+    Yield raw test cases for every chunk, in chunk order.
+
+    With `concurrency` > 1, chunks are processed on a bounded thread pool so
+    at most `concurrency` chunks (and therefore LLM requests) are in flight at
+    once. Sequential runs yield each chunk's cases as soon as they are ready.
+
+    Chunks whose fingerprint is already in `manifest`, or that appear with a
+    matching fingerprint in `completed` (records loaded from a journal), reuse
+    the stored test cases without any LLM call. Newly generated chunks are
+    recorded in the manifest and appended to `journal`. When `failed_chunks`
+    is given, a failing chunk is appended to it instead of aborting the run.
+    Timings, token statistics, retries and cache hits go to `metrics`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+
+    tracked = manifest is not None or journal is not None or completed is not None
+    fingerprints = (
+        _chunk_fingerprints(chunks, model, condense, knowledge)
+        if tracked
+        else [""] * len(chunks)
+    )
+
+    stored: List[Optional[List[dict]]] = []
+    for index, fingerprint in enumerate(fingerprints):
+        record = (completed or {}).get(index)
+        if record is not None and record.get("fingerprint") == fingerprint:
+            stored.append(_accept_test_cases(record.get("test_cases") or [], metrics))
+            continue
+
+        manifest_cases = manifest.get(fingerprint) if manifest is not None else None
+        stored.append(
+            _accept_test_cases(manifest_cases, metrics) if manifest_cases is not None else None
+        )
+
+    if metrics is not None:
+        metrics.increment("chunks_total", len(chunks))
+        metrics.increment("chunks_reused", sum(1 for s in stored if s is not None))
+
+    def _finish(index: int, condensed: str, test_cases: List[dict]) -> None:
+        if manifest is not None:
+            manifest.set(fingerprints[index], test_cases)
+        if journal is not None:
+            journal.record(index, fingerprints[index], condensed, test_cases)
+
+    if concurrency == 1 or len(chunks) <= 1:
+        for index, chunk in enumerate(chunks):
+            if stored[index] is not None:
+                yield from stored[index]
+                continue
+
+            condensed: List[str] = []
+            produced: List[dict] = []
+            try:
+                for test_case in _iter_chunk(
+                    index, chunk, model, max_retries, client, cache, stream,
+                    on_condensed=condensed.append,
+                    condense=condense,
+                    metrics=metrics,
+                    knowledge=knowledge,
+                ):
+                    produced.append(test_case)
+                    yield test_case
+            except GenerationError:
+                if metrics is not None:
+                    metrics.increment("chunks_failed")
+                if failed_chunks is None:
+                    raise
+                failed_chunks.append(index)
+                continue
+
+            _finish(index, condensed[0] if condensed else "", produced)
+        return
+
+    def _generate_and_record(index: int, chunk: str) -> List[dict]:
+        # Record on the worker as soon as the chunk is done, not when the
+        # consumer reaches it: a failing earlier chunk must not lose it
+        condensed_text, test_cases = _generate_chunk(
+            index, chunk, model, max_retries, client, cache, stream,
+            condense, metrics, knowledge,
+        )
+        _finish(index, condensed_text, test_cases)
+        return test_cases
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+        futures = [
+            executor.submit(_generate_and_record, index, chunk)
+            if stored[index] is None
+            else None
+            for index, chunk in enumerate(chunks)
+        ]
+        try:
+            for index, future in enumerate(futures):
+                if future is None:
+                    yield from stored[index]
+                    continue
+
+                try:
+                    test_cases = future.result()
+                except GenerationError:
+                    if metrics is not None:
+                        metrics.increment("chunks_failed")
+                    if failed_chunks is None:
+                        raise
+                    failed_chunks.append(index)
+                    continue
+
+                yield from test_cases
+        finally:
+            # Don't start chunks that are still queued once one has failed or
+            # the consumer stopped early; running ones finish and are recorded
+            for future in futures:
+                if future is not None:
+                    future.cancel()
+
+
 def _generate_from_chunks(
     chunks: List[str],
     model: str,
     max_retries: int,
+    client: LLMClient,
+    concurrency: int = 1,
+    cache: Optional[LLMCache] = None,
+    manifest: Optional[ChunkManifest] = None,
+    journal: Optional[RunJournal] = None,
+    completed: Optional[Dict[int, dict]] = None,
+    failed_chunks: Optional[List[int]] = None,
+    condense: Condenser = CondenseStrategy.llm,
+    metrics: Optional[Metrics] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
 ) -> List[dict]:
     """
     Generate test cases independently for each chunk.
+
+    Results are always merged in chunk order.
     """
-    all_test_cases: List[dict] = []
+    return list(
+        _iter_generated_cases(
+            chunks,
+            model=model,
+            max_retries=max_retries,
+            client=client,
+            concurrency=concurrency,
+            cache=cache,
+            manifest=manifest,
+            journal=journal,
+            completed=completed,
+            failed_chunks=failed_chunks,
+            condense=condense,
+            metrics=metrics,
+            knowledge=knowledge,
+        )
+    )
 
-    for index, chunk in enumerate(chunks):
-        condensed = _condense_chunk(chunk, model)
-        chunk_prompt = _build_prompt([condensed])
 
-        try:
-            test_cases = _generate_single_suite(
-                prompt=chunk_prompt,
-                model=model,
-                max_retries=max_retries,
-            )
-            all_test_cases.extend(test_cases)
-        except GenerationError as exc:
-            raise GenerationError(
-                f"Failed to generate test cases for chunk {index}"
-            ) from exc
+def _dedup_key(tc: dict) -> tuple:
+    return (
+        str(tc.get("use_case", "")).strip().lower(),
+        str(tc.get("test_case", "")).strip().lower(),
+    )
 
-    return all_test_cases
 
 def _deduplicate_test_cases(test_cases: list[dict]) -> list[dict]:
     seen = set()
     unique = []
 
     for tc in test_cases:
-        key = (
-            str(tc.get("use_case", "")).strip().lower(),
-            str(tc.get("test_case", "")).strip().lower(),
-        )
+        key = _dedup_key(tc)
         if key in seen:
             continue
         seen.add(key)
@@ -234,34 +835,241 @@ def _deduplicate_test_cases(test_cases: list[dict]) -> list[dict]:
     return unique
 
 
+def _load_chunks(
+    file_path: str,
+    context_tokens: Optional[int],
+    chunks: Optional[List[str]] = None,
+    parse_workers: int = 1,
+    page_cache_dir: Optional[str] = None,
+) -> List[str]:
+    if chunks is None:
+        chunks = parse_document(
+            file_path, workers=parse_workers, page_cache_dir=page_cache_dir
+        )
+    if context_tokens is None:
+        return chunks
+    return _pack_chunks(chunks, _packed_chunk_tokens(context_tokens))
+
+
+def _resolve_client(
+    client: Optional[LLMClient],
+    context_tokens: Optional[int],
+) -> Tuple[LLMClient, bool]:
+    """
+    Return the client to use and whether the caller owns closing it.
+    """
+    if client is None:
+        return LLMClient(num_ctx=context_tokens), True
+
+    if context_tokens is not None and (
+        client.num_ctx is None or client.num_ctx < context_tokens
+    ):
+        raise ValueError(
+            "context_tokens requires a client created with num_ctx >= context_tokens"
+        )
+
+    return client, False
+
+
+def _open_journal(
+    journal_path: Optional[str],
+    resume: bool,
+) -> Tuple[Optional[RunJournal], Optional[Dict[int, dict]]]:
+    if journal_path is None:
+        if resume:
+            raise ValueError("resume=True requires a journal_path")
+        return None, None
+
+    journal = RunJournal(journal_path)
+    if resume:
+        return journal, journal.load()
+
+    journal.reset()
+    return journal, None
+
+
 def generate_test_suite(
     file_path: str,
     model: str = DEFAULT_MODEL,
     max_retries: int = 2,
+    concurrency: int = 1,
+    cache: Optional[LLMCache] = None,
+    client: Optional[LLMClient] = None,
+    manifest_path: Optional[str] = None,
+    journal_path: Optional[str] = None,
+    resume: bool = False,
+    failed_chunks: Optional[List[int]] = None,
+    context_tokens: Optional[int] = None,
+    condense: Condenser = CondenseStrategy.llm,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    metrics: Optional[Metrics] = None,
+    chunks: Optional[List[str]] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
+    parse_workers: int = 1,
+    page_cache_dir: Optional[str] = None,
 ) -> TestSuite:
     """
     Generate a TestSuite using chunk wise generation.
+
+    `concurrency` bounds how many chunks are sent to the LLM at the same time.
+    When a `cache` is given, condensation and generation results are reused
+    for chunks whose prompts have been seen before. A shared `client` can be
+    passed to reuse its connection pool across documents.
+
+    With `manifest_path` (see core.manifest.manifest_path_for), only chunks
+    that changed since the previous run are sent to the LLM; test cases of
+    unchanged chunks are taken from the manifest.
+
+    With `journal_path`, every completed chunk is appended to a JSONL
+    journal as soon as it finishes; `resume=True` skips the chunks already
+    recorded there by an earlier, interrupted run. When a `failed_chunks`
+    list is given, failing chunks don't abort the run; their indices are
+    appended to it and the suite holds the other chunks' test cases.
+
+    With `context_tokens`, consecutive chunks are packed into fewer, larger
+    requests that fill the model's context window (Ollama's `num_ctx`),
+    leaving room for the prompt template and the output budget.
+
+    `condense` selects how chunks are summarized before generation: with the
+    LLM (default), locally with extractive sentence scoring, adaptively, or
+    with a custom callable (see core.condense).
+
+    With `near_duplicates` (see core.dedup), paraphrased cases that survive
+    exact deduplication are merged into the first similar case; the index's
+    `merges` lists what was dropped.
+
+    With `metrics` (see core.metrics), parsing, per-chunk condensation and
+    generation, deduplication and suite assembly are timed, and Ollama's
+    token statistics, retry reasons and cache hits are recorded.
+
+    `chunks` are the document's parse_document chunks when the caller has
+    already parsed it, e.g. ahead of time in a batch run. Otherwise the
+    document is parsed with `parse_workers` processes and, with
+    `page_cache_dir`, PDF pages extracted by earlier runs are reused (see
+    core.parser.parse_document).
+
+    With `knowledge` (see core.knowledge), the most related snippets of the
+    product knowledge base are added to every generation prompt.
     """
-    chunks = parse_document(file_path)
+    with timed(metrics, "parse"):
+        chunks = _load_chunks(
+            file_path, context_tokens, chunks, parse_workers, page_cache_dir
+        )
+    journal, completed = _open_journal(journal_path, resume)
+    client, owns_client = _resolve_client(client, context_tokens)
 
-    raw_test_cases = _deduplicate_test_cases(
-    _generate_from_chunks(
-        chunks=chunks,
-        model=model,
-        max_retries=max_retries,
-    )
-)
+    manifest = ChunkManifest.load(manifest_path) if manifest_path else None
+    try:
+        raw_test_cases = _generate_from_chunks(
+            chunks=chunks,
+            model=model,
+            max_retries=max_retries,
+            client=client,
+            concurrency=concurrency,
+            cache=cache,
+            manifest=manifest,
+            journal=journal,
+            completed=completed,
+            failed_chunks=failed_chunks,
+            condense=condense,
+            metrics=metrics,
+            knowledge=knowledge,
+        )
+        with timed(metrics, "dedup"):
+            raw_test_cases = _deduplicate_test_cases(raw_test_cases)
+            if near_duplicates is not None:
+                raw_test_cases = [
+                    tc for tc in raw_test_cases if near_duplicates.add(tc) is None
+                ]
+        if manifest is not None:
+            manifest.prune(_chunk_fingerprints(chunks, model, condense, knowledge))
+    finally:
+        # Completed chunks are saved even if a later chunk failed
+        if manifest is not None:
+            manifest.save()
+        if owns_client:
+            client.close()
+
+    # Every case was validated when its chunk returned; don't do it again
+    with timed(metrics, "assemble"):
+        suite = TestSuite.model_construct(
+            feature_name="Generated Feature",
+            source_document=file_path,
+            test_cases=[TestCase.model_construct(**tc) for tc in raw_test_cases],
+        )
 
+    return suite
 
-    merged_suite = {
-        "feature_name": "Generated Feature",
-        "source_document": file_path,
-        "test_cases": raw_test_cases,
-    }
+
+def iter_test_cases(
+    file_path: str,
+    model: str = DEFAULT_MODEL,
+    max_retries: int = 2,
+    concurrency: int = 1,
+    cache: Optional[LLMCache] = None,
+    client: Optional[LLMClient] = None,
+    stream: bool = False,
+    manifest_path: Optional[str] = None,
+    journal_path: Optional[str] = None,
+    resume: bool = False,
+    context_tokens: Optional[int] = None,
+    condense: Condenser = CondenseStrategy.llm,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    metrics: Optional[Metrics] = None,
+    knowledge: Optional[KnowledgeIndex] = None,
+    parse_workers: int = 1,
+    page_cache_dir: Optional[str] = None,
+) -> Iterator[TestCase]:
+    """
+    Yield validated test cases chunk by chunk as they are generated.
+
+    Duplicates are dropped incrementally using the same key as
+    generate_test_suite. With `stream=True` Ollama's streaming mode is used
+    and each case is yielded as soon as its JSON object is complete.
+    `manifest_path`, `journal_path`, `resume`, `context_tokens`,
+    `condense`, `near_duplicates`, `metrics`, `knowledge`, `parse_workers`
+    and `page_cache_dir` behave as in generate_test_suite.
+    """
+    with timed(metrics, "parse"):
+        chunks = _load_chunks(
+            file_path, context_tokens, None, parse_workers, page_cache_dir
+        )
+    journal, completed = _open_journal(journal_path, resume)
+    client, owns_client = _resolve_client(client, context_tokens)
+
+    manifest = ChunkManifest.load(manifest_path) if manifest_path else None
+    seen = set()
 
     try:
-        return TestSuite.model_validate(merged_suite)
-    except Exception as exc:
-        raise GenerationError(
-            "Merged test cases failed schema validation"
-        ) from exc
+        for raw_test_case in _iter_generated_cases(
+            chunks,
+            model=model,
+            max_retries=max_retries,
+            client=client,
+            concurrency=concurrency,
+            cache=cache,
+            stream=stream,
+            manifest=manifest,
+            journal=journal,
+            completed=completed,
+            condense=condense,
+            metrics=metrics,
+            knowledge=knowledge,
+        ):
+            key = _dedup_key(raw_test_case)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            if near_duplicates is not None and near_duplicates.add(raw_test_case) is not None:
+                continue
+
+            yield TestCase.model_construct(**raw_test_case)
+
+        if manifest is not None:
+            manifest.prune(_chunk_fingerprints(chunks, model, condense, knowledge))
+    finally:
+        if manifest is not None:
+            manifest.save()
+        if owns_client:
+            client.close()
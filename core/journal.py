@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+
+class RunJournal:
+    """
+    Append-only JSONL progress journal for a single generation run.
+
+    One line is written per completed chunk, holding its index, fingerprint,
+    condensed text and raw test cases. Lines are flushed as soon as a chunk
+    finishes so an interrupted run can be resumed from the journal.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[int, dict]:
+        """
+        Return completed chunk records keyed by chunk index.
+
+        A torn final line from an interrupted write is ignored.
+        """
+        records: Dict[int, dict] = {}
+
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return records
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("chunk"), int):
+                records[record["chunk"]] = record
+
+        return records
+
+    def _ends_torn(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                if f.seek(0, os.SEEK_END) == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def reset(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self.path.write_text("", encoding="utf-8")
+
+    def record(
+        self,
+        index: int,
+        fingerprint: str,
+        condensed: str,
+        test_cases: List[dict],
+    ) -> None:
+        line = json.dumps(
+            {
+                "chunk": index,
+                "fingerprint": fingerprint,
+                "condensed": condensed,
+                "test_cases": test_cases,
+            },
+            ensure_ascii=False,
+        )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            # Start a new line after a torn one left by an interrupted run,
+            # so this record isn't glued onto it
+            if self._ends_torn():
+                line = "\n" + line
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
@@ -0,0 +1,142 @@
+import json
+import re
+from typing import Any, List, Optional
+
+
+_CODE_FENCE = re.compile(r"```[A-Za-z]*")
+# A dangling `"key":` or separator left behind by truncation
+_DANGLING_TAIL = re.compile(r'(?:(?:,|(?<=\{))\s*"(?:[^"\\]|\\.)*"\s*:|,)\s*$')
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally extract complete objects from a streamed JSON array.
+
+    Text is fed in arbitrary fragments. Every object that is a direct element
+    of the first array of objects seen (either a top level array or one nested
+    in a wrapper such as {"test_cases": [...]}) is returned as soon as its
+    closing brace arrives. Objects nested deeper, for example inside
+    `test_data`, are part of their parent and never emitted on their own.
+    """
+
+    def __init__(self) -> None:
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._emit_depth: Optional[int] = None
+        self._capturing = False
+        self._current: List[str] = []
+
+    def feed(self, text: str) -> List[dict]:
+        completed: List[dict] = []
+
+        for ch in text:
+            if self._capturing:
+                self._current.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch == "{" or ch == "[":
+                if (
+                    ch == "{"
+                    and not self._capturing
+                    and self._stack
+                    and self._stack[-1] == "["
+                    and self._emit_depth in (None, len(self._stack))
+                ):
+                    self._emit_depth = len(self._stack)
+                    self._capturing = True
+                    self._current = [ch]
+                self._stack.append(ch)
+            elif ch == "}" or ch == "]":
+                if self._stack:
+                    self._stack.pop()
+                if (
+                    ch == "}"
+                    and self._capturing
+                    and len(self._stack) == self._emit_depth
+                ):
+                    self._capturing = False
+                    try:
+                        obj = json.loads("".join(self._current))
+                    except ValueError:
+                        obj = None
+                    if isinstance(obj, dict):
+                        completed.append(obj)
+
+        return completed
+
+
+def _close_truncated(text: str) -> Optional[str]:
+    """
+    Close the arrays and objects left open by truncated output.
+
+    Returns None when the text ends inside a string, since closing it would
+    keep a value that was cut off.
+    """
+    stack: List[str] = []
+    in_string = False
+    escape = False
+
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "[{":
+            stack.append("]" if ch == "[" else "}")
+        elif ch in "]}" and stack:
+            stack.pop()
+
+    if in_string:
+        return None
+
+    return _DANGLING_TAIL.sub("", text.rstrip()) + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Any:
+    """
+    Recover JSON from slightly malformed or truncated model output.
+
+    Code fences and prose around the JSON are stripped. If the value is
+    still incomplete, every complete object of the first array is salvaged
+    and a trailing partial object is dropped; failing that, unterminated
+    arrays and objects are closed. Returns None when nothing can be parsed.
+    """
+    text = _CODE_FENCE.sub("", text).strip()
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if not starts:
+        return None
+    text = text[min(starts):]
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value
+    except ValueError:
+        pass
+
+    salvaged = JSONArrayStreamParser().feed(text)
+    if salvaged:
+        return salvaged
+
+    closed = _close_truncated(text)
+    if closed is None:
+        return None
+    try:
+        return json.loads(closed)
+    except ValueError:
+        return None
@@ -0,0 +1,282 @@
+import hashlib
+import importlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from core.metrics import Metrics, timed
+from core.parser import DocumentParseError, parse_document, supported_suffixes
+
+
+DEFAULT_KNOWLEDGE_DIR = "knowledge_base"
+DEFAULT_INDEX_DIR = ".casecraft_cache/knowledge"
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_COLLECTION = "casecraft_knowledge"
+_STATE_FILE = "files.json"
+
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+class KnowledgeIndexError(Exception):
+    pass
+
+
+class Snippet(NamedTuple):
+    text: str
+    source: str
+    distance: float
+
+
+class IngestReport(NamedTuple):
+    added: List[str]
+    updated: List[str]
+    removed: List[str]
+    unchanged: int
+    chunks_embedded: int
+    seconds: float
+
+
+def _import(module: str, package: str) -> Any:
+    """
+    Import an optional dependency, failing with an installation hint.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise KnowledgeIndexError(
+            f"The knowledge index requires {package}: pip install {package}"
+        ) from exc
+
+
+def _content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SentenceTransformerEmbedder:
+    """
+    Batched sentence-transformers embedder. The model is loaded on first use.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 64) -> None:
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        if self._model is None:
+            sentence_transformers = _import("sentence_transformers", "sentence-transformers")
+            self._model = sentence_transformers.SentenceTransformer(self.model_name)
+
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return vectors.tolist()
+
+
+class KnowledgeIndex:
+    """
+    Persistent vector index over product documents, used to ground test
+    generation in related knowledge (RAG).
+
+    Documents are chunked with core.parser, embedded in batches of
+    `batch_size` and stored in a local chromadb collection under
+    `index_dir`. A content hash per file is kept next to the collection so
+    `ingest` only re-embeds files that were added or changed and drops the
+    chunks of deleted files. `context_for` returns the `top_k` closest
+    snippets for a generation prompt.
+
+    chromadb and (for the default embedder) sentence-transformers are
+    imported lazily, so the rest of casecraft works without them.
+    """
+
+    def __init__(
+        self,
+        index_dir: str = DEFAULT_INDEX_DIR,
+        embedder: Optional[Embedder] = None,
+        batch_size: int = 64,
+        top_k: int = 3,
+        max_snippet_chars: int = 600,
+        chunk_size: int = 800,
+        overlap: int = 100,
+    ) -> None:
+        chromadb = _import("chromadb", "chromadb")
+
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder or SentenceTransformerEmbedder(batch_size=batch_size)
+        self.batch_size = batch_size
+        self.top_k = top_k
+        self.max_snippet_chars = max_snippet_chars
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+        self._client = chromadb.PersistentClient(path=str(self.index_dir))
+        self._collection = self._client.get_or_create_collection(
+            _COLLECTION, metadata={"hnsw:space": "cosine"}
+        )
+        self._state_path = self.index_dir / _STATE_FILE
+        self._files: Dict[str, Dict[str, Any]] = self._load_state()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._state_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_state(self) -> None:
+        tmp_path = self._state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._files, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._state_path)
+
+    @property
+    def revision(self) -> str:
+        """
+        Hash of the indexed file contents; changes whenever ingest does.
+        """
+        state = json.dumps(
+            {name: entry["hash"] for name, entry in self._files.items()}, sort_keys=True
+        )
+        return hashlib.sha256(state.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return self._collection.count()
+
+    def _embed(self, texts: List[str], metrics: Optional[Metrics]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            with timed(metrics, "embed"):
+                vectors.extend(
+                    list(map(float, v)) for v in self.embedder(texts[start:start + self.batch_size])
+                )
+        return vectors
+
+    def _remove(self, name: str) -> None:
+        self._collection.delete(where={"source": name})
+        self._files.pop(name, None)
+
+    def ingest(
+        self,
+        source_dir: str = DEFAULT_KNOWLEDGE_DIR,
+        metrics: Optional[Metrics] = None,
+    ) -> IngestReport:
+        """
+        Bring the index in line with the documents below `source_dir`.
+        """
+        started = time.perf_counter()
+        root = Path(source_dir)
+        if not root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {source_dir}")
+
+        suffixes = supported_suffixes()
+        documents = {
+            path.relative_to(root).as_posix(): path
+            for path in sorted(root.rglob("*"))
+            if path.is_file() and path.suffix.lower() in suffixes
+        }
+
+        added: List[str] = []
+        updated: List[str] = []
+        removed = sorted(set(self._files) - set(documents))
+        unchanged = 0
+        embedded = 0
+
+        with timed(metrics, "ingest"):
+            for name in removed:
+                self._remove(name)
+
+            for name, path in documents.items():
+                stat = path.stat()
+                previous = self._files.get(name)
+                # Unchanged size and mtime skip hashing; the hash decides otherwise
+                if previous is not None and (
+                    previous.get("size"), previous.get("mtime")
+                ) == (stat.st_size, stat.st_mtime):
+                    unchanged += 1
+                    continue
+
+                content_hash = _content_hash(path)
+                if previous is not None and previous["hash"] == content_hash:
+                    previous.update(size=stat.st_size, mtime=stat.st_mtime)
+                    unchanged += 1
+                    continue
+
+                try:
+                    chunks = parse_document(
+                        str(path), chunk_size=self.chunk_size, overlap=self.overlap
+                    )
+                except DocumentParseError:
+                    chunks = []
+
+                if previous is not None:
+                    self._remove(name)
+                    updated.append(name)
+                else:
+                    added.append(name)
+
+                if chunks:
+                    self._collection.upsert(
+                        ids=[f"{name}#{i}" for i in range(len(chunks))],
+                        embeddings=self._embed(chunks, metrics),
+                        documents=chunks,
+                        metadatas=[{"source": name, "chunk": i} for i in range(len(chunks))],
+                    )
+                    embedded += len(chunks)
+
+                self._files[name] = {
+                    "hash": content_hash,
+                    "chunks": len(chunks),
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                }
+                # Saved per file so an interrupted ingest keeps its progress
+                self._save_state()
+
+            self._save_state()
+
+        return IngestReport(
+            added=added,
+            updated=updated,
+            removed=removed,
+            unchanged=unchanged,
+            chunks_embedded=embedded,
+            seconds=time.perf_counter() - started,
+        )
+
+    def query(self, text: str, k: Optional[int] = None) -> List[Snippet]:
+        count = len(self)
+        if not count:
+            return []
+
+        result = self._collection.query(
+            query_embeddings=self._embed([text], None),
+            n_results=min(k or self.top_k, count),
+        )
+        return [
+            Snippet(document, metadata["source"], distance)
+            for document, metadata, distance in zip(
+                result["documents"][0], result["metadatas"][0], result["distances"][0]
+            )
+        ]
+
+    def context_for(self, text: str) -> List[str]:
+        """
+        The `top_k` related snippets for a prompt, trimmed for the context
+        window and labelled with their source document.
+        """
+        return [
+            f"[{snippet.source}] {snippet.text[: self.max_snippet_chars]}"
+            for snippet in self.query(text)
+        ]
@@ -0,0 +1,208 @@
+import json
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+
+class LLMClientError(Exception):
+    pass
+
+
+class LLMClient:
+    """
+    Reusable HTTP client for the Ollama generate API.
+
+    Requests share a pooled keep-alive session, use separate connect and read
+    timeouts, and are retried with jittered exponential backoff on connection
+    errors and 5xx responses. `keep_alive` is forwarded to Ollama so the model
+    stays loaded between chunks. `num_ctx` fixes the context window for every
+    request; keeping it constant avoids model reloads between calls.
+    `max_in_flight` caps how many requests run at once across every thread
+    sharing the client, e.g. several documents generated in parallel.
+    """
+
+    def __init__(
+        self,
+        url: str = OLLAMA_URL,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 300.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        keep_alive: Optional[Union[str, int]] = "10m",
+        pool_size: int = 10,
+        num_ctx: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.keep_alive = keep_alive
+        self.num_ctx = num_ctx
+        self.max_in_flight = max_in_flight
+        self._slots = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight is not None else None
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a non-streaming generate request and return the decoded body.
+        """
+        payload = self._payload(model, prompt, options, format, stream=False)
+        with self._in_flight():
+            response = self._send(payload)
+
+            try:
+                return response.json()
+            except ValueError as exc:
+                raise LLMClientError("Ollama returned a non JSON response") from exc
+
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+        on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Iterator[str]:
+        """
+        Run a streaming generate request and yield response text fragments.
+
+        Retries only apply until the response starts; a stream that breaks
+        midway raises LLMClientError. `on_done` is called with Ollama's final
+        message, which holds the token and timing statistics of the request.
+        """
+        payload = self._payload(model, prompt, options, format, stream=True)
+        with self._in_flight():
+            response = self._send(payload, stream=True)
+
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        part = json.loads(line)
+                    except ValueError as exc:
+                        raise LLMClientError("Malformed line in Ollama stream") from exc
+
+                    if "error" in part:
+                        raise LLMClientError(f"Ollama stream failed: {part['error']}")
+
+                    fragment = part.get("response")
+                    if fragment:
+                        yield fragment
+                    if part.get("done"):
+                        if on_done is not None:
+                            on_done(part)
+                        break
+            except requests.RequestException as exc:
+                raise LLMClientError("Ollama stream was interrupted") from exc
+            finally:
+                response.close()
+
+    def _in_flight(self) -> ContextManager[Any]:
+        return self._slots if self._slots is not None else nullcontext()
+
+    def _payload(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]],
+        format: Optional[str],
+        stream: bool,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": dict(options or {}),
+        }
+        if self.num_ctx is not None:
+            payload["options"].setdefault("num_ctx", self.num_ctx)
+        if format is not None:
+            payload["format"] = format
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps concurrent workers from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _send(self, payload: Dict[str, Any], stream: bool = False) -> requests.Response:
+        last_error: Exception | None = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._backoff(attempt - 1))
+
+            try:
+                response = self.session.post(
+                    self.url,
+                    json=payload,
+                    timeout=(self.connect_timeout, self.read_timeout),
+                    stream=stream,
+                )
+            except requests.ConnectionError as exc:
+                last_error = exc
+                continue
+            except requests.Timeout as exc:
+                raise LLMClientError(
+                    f"Ollama request timed out after {self.read_timeout}s"
+                ) from exc
+
+            if response.status_code >= 500:
+                last_error = LLMClientError(
+                    f"Ollama request failed: {response.status_code} {response.text!r}"
+                )
+                response.close()
+                continue
+
+            if response.status_code != 200:
+                error = LLMClientError(
+                    f"Ollama request failed: {response.status_code} {response.text!r}"
+                )
+                response.close()
+                raise error
+
+            return response
+
+        raise LLMClientError(
+            f"Ollama request failed after {self.max_retries + 1} attempts"
+        ) from last_error
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+MANIFEST_VERSION = 1
+
+
+def chunk_fingerprint(chunk: str, *context: str) -> str:
+    """
+    Stable fingerprint of a chunk and everything that shapes its output,
+    such as the model name and prompt template.
+    """
+    digest = hashlib.sha256()
+    for part in (*context, chunk):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def manifest_path_for(output_path: str) -> str:
+    """
+    Default manifest location, stored next to an exported suite.
+    """
+    return f"{output_path}.manifest.json"
+
+
+class ChunkManifest:
+    """
+    Record of chunk fingerprints and the raw test cases each chunk produced.
+
+    Kept next to a generated suite so that a later revision of the same
+    document only sends added or changed chunks to the LLM.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunks: Optional[Dict[str, List[dict]]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self._chunks: Dict[str, List[dict]] = dict(chunks or {})
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> "ChunkManifest":
+        """
+        Load a manifest, starting empty if it is missing, unreadable or was
+        written by an incompatible version.
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path)
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+
+        chunks = data.get("chunks")
+        return cls(path, chunks if isinstance(chunks, dict) else None)
+
+    def get(self, fingerprint: str) -> Optional[List[dict]]:
+        with self._lock:
+            return self._chunks.get(fingerprint)
+
+    def set(self, fingerprint: str, test_cases: List[dict]) -> None:
+        with self._lock:
+            self._chunks[fingerprint] = list(test_cases)
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """
+        Drop entries for chunks that are no longer part of the document.
+        """
+        keep = set(keep)
+        with self._lock:
+            self._chunks = {
+                fingerprint: test_cases
+                for fingerprint, test_cases in self._chunks.items()
+                if fingerprint in keep
+            }
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._chunks
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps(
+                {"version": MANIFEST_VERSION, "chunks": self._chunks},
+                ensure_ascii=False,
+            )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,222 @@
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+
+Hook = Callable[[Dict[str, Any]], None]
+
+# Token and timing fields Ollama reports with every completed response
+_OLLAMA_STATS = (
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+    "total_duration",
+)
+_NANOSECONDS = 1_000_000_000
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _labels(**labels: Any) -> str:
+    inner = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+    return "{" + inner + "}"
+
+
+class Metrics:
+    """
+    Thread-safe collector for pipeline timings, LLM token statistics,
+    retries and cache hits.
+
+    Every recorded sample is also passed to the registered hooks as an event
+    dict (with an "event" key of "stage", "llm", "retry", "cache" or
+    "counter"), so callers can forward them to their own tracing backend.
+    `snapshot`, `to_json` and `to_prometheus` summarize what was collected.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hooks: List[Hook] = []
+        self._stages: Dict[str, List[float]] = defaultdict(list)
+        self._llm: Dict[str, Counter] = defaultdict(Counter)
+        self._retries: Counter = Counter()
+        self._cache: Dict[str, Counter] = defaultdict(Counter)
+        self._counters: Counter = Counter()
+
+    def add_hook(self, hook: Hook) -> None:
+        self._hooks.append(hook)
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        for hook in self._hooks:
+            hook(event)
+
+    @contextmanager
+    def time(self, stage: str, **labels: Any) -> Iterator[None]:
+        """
+        Time the enclosed block as one sample of `stage`.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started, **labels)
+
+    def record_stage(self, stage: str, seconds: float, **labels: Any) -> None:
+        with self._lock:
+            self._stages[stage].append(seconds)
+        self._emit({"event": "stage", "stage": stage, "seconds": seconds, **labels})
+
+    def record_llm(self, stage: str, response: Dict[str, Any]) -> None:
+        """
+        Record the token and timing statistics of an Ollama response.
+        """
+        stats = {
+            key: response[key]
+            for key in _OLLAMA_STATS
+            if isinstance(response.get(key), (int, float))
+        }
+        with self._lock:
+            counter = self._llm[stage]
+            counter["requests"] += 1
+            counter.update(stats)
+        self._emit({"event": "llm", "stage": stage, **stats})
+
+    def record_retry(self, reason: str) -> None:
+        with self._lock:
+            self._retries[reason] += 1
+        self._emit({"event": "retry", "reason": reason})
+
+    def record_cache(self, stage: str, hit: bool) -> None:
+        with self._lock:
+            self._cache[stage]["hits" if hit else "misses"] += 1
+        self._emit({"event": "cache", "stage": stage, "hit": hit})
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+        self._emit({"event": "counter", "name": name, "value": value})
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize everything recorded so far as plain JSON-compatible data.
+        """
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": len(samples),
+                    "total_seconds": sum(samples),
+                    "p50_seconds": _percentile(samples, 0.5),
+                    "p95_seconds": _percentile(samples, 0.95),
+                    "max_seconds": max(samples),
+                }
+                for stage, samples in self._stages.items()
+                if samples
+            }
+
+            llm = {}
+            for stage, counter in self._llm.items():
+                eval_seconds = counter["eval_duration"] / _NANOSECONDS
+                llm[stage] = {
+                    "requests": counter["requests"],
+                    "prompt_tokens": counter["prompt_eval_count"],
+                    "prompt_eval_seconds": counter["prompt_eval_duration"] / _NANOSECONDS,
+                    "eval_tokens": counter["eval_count"],
+                    "eval_seconds": eval_seconds,
+                    "total_seconds": counter["total_duration"] / _NANOSECONDS,
+                    "tokens_per_second": (
+                        counter["eval_count"] / eval_seconds if eval_seconds else 0.0
+                    ),
+                }
+
+            return {
+                "stages": stages,
+                "llm": llm,
+                "retries": dict(self._retries),
+                "cache": {stage: dict(counter) for stage, counter in self._cache.items()},
+                "counters": dict(self._counters),
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "casecraft") -> str:
+        """
+        Render the snapshot in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        lines.append(f"# TYPE {prefix}_stage_seconds summary")
+        for stage, summary in sorted(snapshot["stages"].items()):
+            for quantile, key in (("0.5", "p50_seconds"), ("0.95", "p95_seconds")):
+                lines.append(
+                    f"{prefix}_stage_seconds{_labels(stage=stage, quantile=quantile)} "
+                    f"{summary[key]}"
+                )
+            lines.append(f"{prefix}_stage_seconds_sum{_labels(stage=stage)} {summary['total_seconds']}")
+            lines.append(f"{prefix}_stage_seconds_count{_labels(stage=stage)} {summary['count']}")
+
+        lines.append(f"# TYPE {prefix}_llm_requests_total counter")
+        for stage, summary in sorted(snapshot["llm"].items()):
+            lines.append(f"{prefix}_llm_requests_total{_labels(stage=stage)} {summary['requests']}")
+        lines.append(f"# TYPE {prefix}_llm_tokens_total counter")
+        for stage, summary in sorted(snapshot["llm"].items()):
+            lines.append(
+                f"{prefix}_llm_tokens_total{_labels(stage=stage, kind='prompt')} "
+                f"{summary['prompt_tokens']}"
+            )
+            lines.append(
+                f"{prefix}_llm_tokens_total{_labels(stage=stage, kind='eval')} "
+                f"{summary['eval_tokens']}"
+            )
+        lines.append(f"# TYPE {prefix}_llm_prompt_eval_seconds_total counter")
+        for stage, summary in sorted(snapshot["llm"].items()):
+            lines.append(
+                f"{prefix}_llm_prompt_eval_seconds_total{_labels(stage=stage)} "
+                f"{summary['prompt_eval_seconds']}"
+            )
+        lines.append(f"# TYPE {prefix}_llm_eval_seconds_total counter")
+        for stage, summary in sorted(snapshot["llm"].items()):
+            lines.append(f"{prefix}_llm_eval_seconds_total{_labels(stage=stage)} {summary['eval_seconds']}")
+        lines.append(f"# TYPE {prefix}_llm_tokens_per_second gauge")
+        for stage, summary in sorted(snapshot["llm"].items()):
+            lines.append(
+                f"{prefix}_llm_tokens_per_second{_labels(stage=stage)} {summary['tokens_per_second']}"
+            )
+
+        lines.append(f"# TYPE {prefix}_retries_total counter")
+        for reason, count in sorted(snapshot["retries"].items()):
+            lines.append(f"{prefix}_retries_total{_labels(reason=reason)} {count}")
+
+        lines.append(f"# TYPE {prefix}_cache_requests_total counter")
+        for stage, counts in sorted(snapshot["cache"].items()):
+            for result in ("hits", "misses"):
+                lines.append(
+                    f"{prefix}_cache_requests_total{_labels(stage=stage, result=result)} "
+                    f"{counts.get(result, 0)}"
+                )
+
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, count in sorted(snapshot["counters"].items()):
+            lines.append(f"{prefix}_events_total{_labels(name=name)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def timed(metrics: Optional[Metrics], stage: str, **labels: Any) -> ContextManager[None]:
+    """
+    Time a block with `metrics`, or do nothing when metrics are disabled.
+    """
+    if metrics is None:
+        return nullcontext()
+    return metrics.time(stage, **labels)
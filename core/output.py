@@ -4,3 +4,5 @@ from enum import Enum
 class OutputFormat(str, Enum):
     excel = "excel"
     json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
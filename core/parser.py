@@ -1,13 +1,37 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
-
-from pypdf import PdfReader
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
 
 
 class DocumentParseError(Exception):
     pass
 
 
+class ParserBackend(NamedTuple):
+    # Both are called as f(file_path, workers=..., cache_dir=...)
+    read: Callable[..., str]
+    iter_pieces: Callable[..., Iterable[str]]
+
+
+DEFAULT_PAGE_CACHE_DIR = ".casecraft_cache/pages"
+
+# Rough average for English prose with Llama style BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+# Pages handed to a worker process at once; large enough to amortize opening
+# the PDF in every worker, small enough to keep the pool balanced
+_PAGES_PER_TASK = 8
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate used for context budgeting.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
 def _clean_text(text: str) -> str:
     """
     Basic text normalization.
@@ -18,19 +42,32 @@ def _clean_text(text: str) -> str:
     return "\n".join(lines)
 
 
-def _chunk_text(
-    text: str,
-    chunk_size: int = 800,
-    overlap: int = 100,
-) -> List[str]:
+def _iter_clean_lines(pieces: Iterable[str]) -> Iterator[str]:
     """
-    Split text into overlapping chunks.
+    Streaming counterpart of `_clean_text`: yield the stripped, non-empty
+    lines of a sequence of text pieces (file lines or PDF pages).
+    """
+    for piece in pieces:
+        for line in piece.replace("\r", "\n").split("\n"):
+            line = line.strip()
+            if line:
+                yield line
 
-    Prefers to split at the nearest whitespace before `chunk_size` so chunks
-    don't cut words in half. If no whitespace is found in the window (e.g., a
-    very long token), falls back to character-based slicing. Chunks include
-    trailing whitespace when possible so boundaries are clear.
+
+def _join_lines(lines: Iterable[str]) -> Iterator[str]:
     """
+    Yield the pieces of "\n".join(lines) without building the joined string.
+    """
+    first = True
+    for line in lines:
+        if first:
+            first = False
+            yield line
+        else:
+            yield "\n" + line
+
+
+def _validate_chunking(chunk_size: int, overlap: int) -> None:
     if chunk_size <= 0:
         raise ValueError("chunk_size must be > 0")
     if overlap < 0:
@@ -38,11 +75,37 @@ def _chunk_text(
     if overlap >= chunk_size:
         raise ValueError("overlap must be smaller than chunk_size")
 
-    chunks: List[str] = []
-    start = 0
-    text_length = len(text)
 
-    while start < text_length:
+def _iter_text_chunks(
+    pieces: Iterable[str],
+    chunk_size: int,
+    overlap: int,
+) -> Iterator[str]:
+    """
+    Split a stream of text pieces into overlapping chunks.
+
+    Only the current window, one lookahead character and the overlap are
+    kept in memory, so memory is bounded by roughly `chunk_size + overlap`
+    plus the size of a single piece.
+    """
+    pieces = iter(pieces)
+    buffer = ""
+    start = 0  # position of the next chunk, relative to `buffer`
+    exhausted = False
+
+    while True:
+        # Buffer the window plus one lookahead character, so we know whether
+        # the window reaches the end of the text
+        while not exhausted and len(buffer) <= start + chunk_size:
+            try:
+                buffer += next(pieces)
+            except StopIteration:
+                exhausted = True
+
+        text_length = len(buffer)
+        if start >= text_length:
+            return
+
         end = min(start + chunk_size, text_length)
 
         # Prefer to cut at the last whitespace inside the window so words aren't
@@ -51,26 +114,31 @@ def _chunk_text(
         if end < text_length:
             split_pos = -1
             for sep in (" ", "\n", "\t"):
-                pos = text.rfind(sep, start, end)
+                pos = buffer.rfind(sep, start, end)
                 if pos > split_pos:
                     split_pos = pos
             if split_pos >= start:
                 end = split_pos + 1
 
-        chunk = text[start:end]
+        chunk = buffer[start:end]
 
         # If the chunk is empty or contains only whitespace (which can happen if
         # start==end or whitespace clusters), fall back to a raw slice to make
         # progress and avoid infinite loops.
         if not chunk.strip():
             end = min(start + chunk_size, text_length)
-            chunk = text[start:end]
+            chunk = buffer[start:end]
             if not chunk.strip():
                 # Nothing useful here; move forward
                 start = end
                 continue
 
-        chunks.append(chunk)
+        yield chunk
+
+        # The window reached the end of the text; anything after this would
+        # only repeat the overlap as ever shorter tail chunks
+        if end >= text_length:
+            return
 
         # Compute next start with overlap; ensure progress to avoid infinite
         # loops in edge cases
@@ -79,18 +147,150 @@ def _chunk_text(
             next_start = start + 1
         start = next_start
 
-    return chunks
+        # Drop text that no later chunk can reach. Trimming only once the
+        # consumed prefix dominates the buffer keeps copying amortized O(n).
+        if start > chunk_size and start * 2 > len(buffer):
+            buffer = buffer[start:]
+            start = 0
 
 
-def _parse_pdf(file_path: str) -> str:
+def _chunk_text(
+    text: str,
+    chunk_size: int = 800,
+    overlap: int = 100,
+) -> List[str]:
+    """
+    Split text into overlapping chunks.
+
+    Prefers to split at the nearest whitespace before `chunk_size` so chunks
+    don't cut words in half. If no whitespace is found in the window (e.g., a
+    very long token), falls back to character-based slicing. Chunks include
+    trailing whitespace when possible so boundaries are clear.
+    """
+    _validate_chunking(chunk_size, overlap)
+    return list(_iter_text_chunks([text], chunk_size, overlap))
+
+
+def _file_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cached_page_path(cache_dir: str, file_hash: str, page_index: int) -> Path:
+    return Path(cache_dir) / file_hash / f"{page_index}.txt"
+
+
+def _read_cached_page(cache_dir: str, file_hash: str, page_index: int) -> Optional[str]:
     try:
-        reader = PdfReader(file_path)
-        pages_text: List[str] = []
+        return _cached_page_path(cache_dir, file_hash, page_index).read_text(encoding="utf-8")
+    except OSError:
+        return None
 
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                pages_text.append(page_text)
+
+def _write_cached_page(cache_dir: str, file_hash: str, page_index: int, text: str) -> None:
+    path = _cached_page_path(cache_dir, file_hash, page_index)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _pdf_reader(file_path: str) -> Any:
+    # pypdf is only imported once a PDF is actually parsed
+    from pypdf import PdfReader
+
+    return PdfReader(file_path)
+
+
+def _extract_pages(file_path: str, page_indices: List[int]) -> List[str]:
+    """
+    Extract the text of the given pages. Runs inside worker processes, so it
+    opens its own reader.
+    """
+    reader = _pdf_reader(file_path)
+    return [reader.pages[index].extract_text() or "" for index in page_indices]
+
+
+def _iter_pdf_pages(
+    file_path: str,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of every page, in page order.
+
+    Pages missing from the cache are extracted on a process pool when
+    `workers` > 1. With `cache_dir`, page text is cached on disk keyed by
+    (file hash, page index).
+    """
+    reader = _pdf_reader(file_path)
+    page_count = len(reader.pages)
+
+    file_hash = _file_hash(file_path) if cache_dir else None
+    cached = [
+        bool(cache_dir) and _cached_page_path(cache_dir, file_hash, index).exists()
+        for index in range(page_count)
+    ]
+    missing = [index for index in range(page_count) if not cached[index]]
+
+    executor: Optional[ProcessPoolExecutor] = None
+    if workers > 1 and len(missing) > _PAGES_PER_TASK:
+        batches = [
+            missing[start:start + _PAGES_PER_TASK]
+            for start in range(0, len(missing), _PAGES_PER_TASK)
+        ]
+        executor = ProcessPoolExecutor(max_workers=workers)
+        extracted = (
+            text
+            for texts in executor.map(_extract_pages, [file_path] * len(batches), batches)
+            for text in texts
+        )
+    else:
+        extracted = (reader.pages[index].extract_text() or "" for index in missing)
+
+    try:
+        for index in range(page_count):
+            if cached[index]:
+                text = _read_cached_page(cache_dir, file_hash, index)
+                if text is None:
+                    # Removed from the cache since the existence check
+                    text = reader.pages[index].extract_text() or ""
+            else:
+                text = next(extracted)
+                if cache_dir:
+                    _write_cached_page(cache_dir, file_hash, index, text)
+
+            yield text
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _extract_pdf_pages(
+    file_path: str,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> List[str]:
+    """
+    Return the text of every page, in page order.
+    """
+    return list(_iter_pdf_pages(file_path, workers, cache_dir))
+
+
+def _parse_pdf(
+    file_path: str,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> str:
+    try:
+        pages_text = [
+            page_text
+            for page_text in _extract_pdf_pages(file_path, workers, cache_dir)
+            if page_text
+        ]
 
         if not pages_text:
             raise DocumentParseError("No extractable text found in PDF")
@@ -102,30 +302,66 @@ def _parse_pdf(file_path: str) -> str:
 
 
 def _parse_text(file_path: str) -> str:
-    return Path(file_path).read_text(encoding="utf-8")
+    try:
+        return Path(file_path).read_text(encoding="utf-8")
+    except UnicodeDecodeError as exc:
+        raise DocumentParseError(f"Document is not valid UTF-8: {exc}") from exc
 
 
-def parse_document(
-    file_path: str,
-    chunk_size: int = 800,
-    overlap: int = 100,
-) -> List[str]:
+_PARSERS: Dict[str, ParserBackend] = {}
+
+
+def register_parser(
+    suffixes: Iterable[str],
+    read: Callable[..., str],
+    iter_pieces: Callable[..., Iterable[str]],
+) -> None:
     """
-    Parse a document and return cleaned, chunked text.
+    Register a parser backend for file suffixes such as ".docx".
+
+    `read` returns the document's raw text and `iter_pieces` yields it in
+    pieces (pages, lines) for iter_chunks; both are called as
+    `f(file_path, workers=..., cache_dir=...)`. Backends should import
+    their dependencies when called, not when registered.
     """
+    backend = ParserBackend(read, iter_pieces)
+    for suffix in suffixes:
+        _PARSERS[suffix.lower()] = backend
+
+
+def supported_suffixes() -> Set[str]:
+    return set(_PARSERS)
+
+
+def _backend_for(file_path: str) -> ParserBackend:
     path = Path(file_path)
 
     if not path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
     suffix = path.suffix.lower()
+    try:
+        return _PARSERS[suffix]
+    except KeyError:
+        raise DocumentParseError(f"Unsupported file type: {suffix}") from None
 
-    if suffix == ".pdf":
-        raw_text = _parse_pdf(file_path)
-    elif suffix in {".txt", ".md"}:
-        raw_text = _parse_text(file_path)
-    else:
-        raise DocumentParseError(f"Unsupported file type: {suffix}")
+
+def parse_document(
+    file_path: str,
+    chunk_size: int = 800,
+    overlap: int = 100,
+    workers: int = 1,
+    page_cache_dir: Optional[str] = None,
+) -> List[str]:
+    """
+    Parse a document and return cleaned, chunked text.
+
+    For PDFs, `workers` > 1 extracts pages on a process pool and
+    `page_cache_dir` (e.g. DEFAULT_PAGE_CACHE_DIR) caches extracted page text
+    so re-parsing an unchanged file skips extraction.
+    """
+    backend = _backend_for(file_path)
+    raw_text = backend.read(file_path, workers=workers, cache_dir=page_cache_dir)
 
     cleaned_text = _clean_text(raw_text)
 
@@ -137,3 +373,82 @@ def parse_document(
         chunk_size=chunk_size,
         overlap=overlap,
     )
+
+
+def _iter_pdf_text(
+    file_path: str,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Yield non-empty page texts with the same error handling as `_parse_pdf`.
+    """
+    found_text = False
+    try:
+        for page_text in _iter_pdf_pages(file_path, workers, cache_dir):
+            if page_text:
+                found_text = True
+                yield page_text
+    except Exception as exc:
+        raise DocumentParseError(f"Failed to parse PDF: {exc}") from exc
+
+    if not found_text:
+        raise DocumentParseError("Failed to parse PDF: No extractable text found in PDF")
+
+
+def _iter_text_lines(file_path: str) -> Iterator[str]:
+    # newline="" splits on \n, \r and \r\n like the universal newline mode
+    # used by Path.read_text, without translating the whole file at once
+    with open(file_path, encoding="utf-8", newline="") as f:
+        try:
+            yield from f
+        except UnicodeDecodeError as exc:
+            raise DocumentParseError(f"Document is not valid UTF-8: {exc}") from exc
+
+
+def iter_chunks(
+    file_path: str,
+    chunk_size: int = 800,
+    overlap: int = 100,
+    workers: int = 1,
+    page_cache_dir: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Lazily parse a document and yield cleaned chunks.
+
+    Produces the same chunks as parse_document, but streams lines from text
+    files (or pages from PDFs) through cleaning and chunking, so memory is
+    bounded by the chunk window instead of the document size.
+    """
+    backend = _backend_for(file_path)
+    pieces = iter(backend.iter_pieces(file_path, workers=workers, cache_dir=page_cache_dir))
+
+    _validate_chunking(chunk_size, overlap)
+
+    return _iter_document_chunks(pieces, chunk_size, overlap)
+
+
+def _iter_document_chunks(
+    pieces: Iterator[str],
+    chunk_size: int,
+    overlap: int,
+) -> Iterator[str]:
+    produced = False
+    for chunk in _iter_text_chunks(
+        _join_lines(_iter_clean_lines(pieces)),
+        chunk_size,
+        overlap,
+    ):
+        produced = True
+        yield chunk
+
+    if not produced:
+        raise DocumentParseError("Document is empty after cleaning")
+
+
+register_parser((".pdf",), _parse_pdf, _iter_pdf_text)
+register_parser(
+    (".txt", ".md"),
+    lambda file_path, **_: _parse_text(file_path),
+    lambda file_path, **_: _iter_text_lines(file_path),
+)
@@ -0,0 +1,312 @@
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Sequence, Union
+
+import requests
+
+from core.llm import OLLAMA_URL, LLMClient, LLMClientError
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and the
+    endpoint is skipped. Once `reset_timeout` seconds have passed, a single
+    trial request is let through (half-open); its outcome closes the breaker
+    or opens it again. A successful health probe closes it directly.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def available(self, now: float) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        return False  # a half-open trial is already running
+
+    def acquire(self, now: float) -> None:
+        if self.state == self.OPEN:
+            self.state = self.HALF_OPEN
+
+    def abandon(self) -> None:
+        # A trial that ended without an outcome; let the next request try again
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = now
+
+
+class Endpoint:
+    def __init__(self, url: str, client: LLMClient, breaker: CircuitBreaker) -> None:
+        self.url = url
+        self.client = client
+        self.breaker = breaker
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def health_url(self) -> str:
+        return self.url.split("/api/", 1)[0] + "/api/version"
+
+
+class LLMPool:
+    """
+    Spreads LLM requests over several Ollama endpoints.
+
+    Every request goes to the available endpoint with the fewest outstanding
+    requests. Each endpoint has a CircuitBreaker: endpoints that keep failing
+    are taken out of rotation, and requests that fail on one endpoint are
+    retried on the next, so a node going down mid-run costs no chunks.
+    With `probe_interval`, a background thread probes open endpoints
+    (`GET /api/version`) and puts them back as soon as they answer.
+
+    The pool has the LLMClient interface (`generate`, `generate_stream`,
+    `close`, `num_ctx`), so it can be passed anywhere a client is accepted.
+    `max_in_flight` caps concurrent requests across all endpoints; other
+    keyword arguments configure the per-endpoint clients, which default to
+    `max_retries=0` because failing over replaces retrying the same node.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        probe_interval: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        **client_options: Any,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one endpoint URL is required")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+
+        client_options.setdefault("max_retries", 0)
+        self.endpoints = [
+            Endpoint(
+                url,
+                LLMClient(url=url, **client_options),
+                CircuitBreaker(failure_threshold, reset_timeout),
+            )
+            for url in dict.fromkeys(urls)
+        ]
+        self.num_ctx = client_options.get("num_ctx")
+        self.keep_alive = self.endpoints[0].client.keep_alive
+        self.max_in_flight = max_in_flight
+        self._slots = (
+            threading.BoundedSemaphore(max_in_flight) if max_in_flight is not None else None
+        )
+        self._lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+        if probe_interval is not None:
+            self._prober = threading.Thread(
+                target=self._probe_loop, args=(probe_interval,), daemon=True
+            )
+            self._prober.start()
+
+    def __enter__(self) -> "LLMPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join()
+        for endpoint in self.endpoints:
+            endpoint.client.close()
+
+    def _in_flight(self) -> ContextManager[Any]:
+        return self._slots if self._slots is not None else nullcontext()
+
+    def _acquire(self, tried: List[Endpoint]) -> Endpoint:
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                e for e in self.endpoints
+                if e not in tried and e.breaker.available(now)
+            ]
+            if not candidates:
+                raise LLMClientError(
+                    "No healthy Ollama endpoint available"
+                    if not tried
+                    else f"Request failed on {len(tried)} endpoint(s)"
+                )
+
+            endpoint = min(candidates, key=lambda e: (e.outstanding, e.requests))
+            endpoint.breaker.acquire(now)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _release(self, endpoint: Endpoint, ok: Optional[bool]) -> None:
+        # ok=None: the caller stopped early, which says nothing about the node
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.breaker.record_success()
+            elif ok is False:
+                endpoint.failures += 1
+                endpoint.breaker.record_failure(time.monotonic())
+            else:
+                endpoint.breaker.abandon()
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a non-streaming generate request, failing over between endpoints.
+        """
+        tried: List[Endpoint] = []
+        last_error: Optional[Exception] = None
+
+        with self._in_flight():
+            while True:
+                try:
+                    endpoint = self._acquire(tried)
+                except LLMClientError as exc:
+                    raise exc from last_error
+                tried.append(endpoint)
+
+                try:
+                    response = endpoint.client.generate(model, prompt, options, format)
+                except LLMClientError as exc:
+                    self._release(endpoint, False)
+                    last_error = exc
+                    continue
+
+                self._release(endpoint, True)
+                return response
+
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        format: Optional[str] = None,
+        on_done: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Iterator[str]:
+        """
+        Run a streaming generate request and yield response text fragments.
+
+        Fails over to another endpoint only until the first fragment has
+        been yielded; a stream that breaks later raises LLMClientError.
+        `on_done` receives the final message as in LLMClient.generate_stream.
+        """
+        tried: List[Endpoint] = []
+        last_error: Optional[Exception] = None
+
+        with self._in_flight():
+            while True:
+                try:
+                    endpoint = self._acquire(tried)
+                except LLMClientError as exc:
+                    raise exc from last_error
+                tried.append(endpoint)
+
+                started = False
+                ok: Optional[bool] = None
+                try:
+                    for fragment in endpoint.client.generate_stream(
+                        model, prompt, options, format, on_done=on_done
+                    ):
+                        started = True
+                        yield fragment
+                    ok = True
+                    return
+                except LLMClientError as exc:
+                    ok = False
+                    if started:
+                        raise
+                    last_error = exc
+                finally:
+                    self._release(endpoint, ok)
+
+    def probe(self) -> int:
+        """
+        Health check every endpoint that is out of rotation and close the
+        breaker of those that answer. Returns the number of recovered nodes.
+        """
+        with self._lock:
+            down = [e for e in self.endpoints if e.breaker.state != CircuitBreaker.CLOSED]
+
+        recovered = 0
+        for endpoint in down:
+            try:
+                response = endpoint.client.session.get(
+                    endpoint.health_url,
+                    timeout=(endpoint.client.connect_timeout, endpoint.client.connect_timeout),
+                )
+                healthy = response.status_code == 200
+                response.close()
+            except requests.RequestException:
+                healthy = False
+
+            if healthy:
+                with self._lock:
+                    endpoint.breaker.record_success()
+                recovered += 1
+        return recovered
+
+    def _probe_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.probe()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "state": e.breaker.state,
+                    "outstanding": e.outstanding,
+                    "requests": e.requests,
+                    "failures": e.failures,
+                }
+                for e in self.endpoints
+            ]
+
+
+def create_client(
+    urls: Optional[Sequence[str]] = None,
+    probe_interval: float = 10.0,
+    **options: Any,
+) -> Union[LLMClient, LLMPool]:
+    """
+    A plain LLMClient for a single endpoint, an LLMPool probing its failed
+    endpoints every `probe_interval` seconds for several.
+    """
+    urls = list(dict.fromkeys(urls or [OLLAMA_URL]))
+    if len(urls) == 1:
+        return LLMClient(url=urls[0], **options)
+    return LLMPool(urls, probe_interval=probe_interval, **options)
@@ -0,0 +1,38 @@
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+from typing import Any
+
+
+PROMPTS_DIR = Path(__file__).resolve().parents[1] / "prompts"
+
+
+class PromptTemplate:
+    """
+    A prompt loaded from `prompts/<name>.txt`, with `$name` placeholders.
+
+    Templates keep every placeholder after their static instructions, so
+    all prompts rendered from one template start with the same `prefix`,
+    byte for byte. Ollama then reuses the evaluated prefix from its prompt
+    cache instead of evaluating the rules and schema again for every chunk.
+    """
+
+    def __init__(self, name: str, text: str) -> None:
+        self.name = name
+        self.text = text
+        self._template = Template(text)
+
+        first = self._template.pattern.search(text)
+        self.prefix = text[: first.start()] if first else text
+
+    def render(self, **fields: Any) -> str:
+        return self._template.substitute(fields)
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> PromptTemplate:
+    """
+    Load a prompt template by name. Templates are read once per process.
+    """
+    text = (PROMPTS_DIR / f"{name}.txt").read_text(encoding="utf-8")
+    return PromptTemplate(name, text)
@@ -1,19 +1,15 @@
 from core.generator import generate_test_suite
-from core.exporter import export
+from core.exporter import export_many
 from core.output import OutputFormat
 
 suite = generate_test_suite("examples/sample.pdf")
 
-export(
+export_many(
     suite,
-    output_format=OutputFormat.excel,
-    output_path="outputs/test_cases.xlsx",
-)
-
-export(
-    suite,
-    output_format=OutputFormat.json,
-    output_path="outputs/test_cases.json",
+    {
+        OutputFormat.excel: "outputs/test_cases.xlsx",
+        OutputFormat.json: "outputs/test_cases.json",
+    },
 )
 
 print("Excel and JSON exports generated.")
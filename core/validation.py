@@ -0,0 +1,129 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+
+from core.schema import TestCase
+
+
+TEST_CASE_ADAPTER = TypeAdapter(TestCase)
+
+PRIORITIES = ("high", "medium", "low")
+
+_LIST_FIELDS = ("preconditions", "steps", "tags", "expected_results", "actual_results")
+_OPTIONAL_FIELDS = ("preconditions", "test_data", "tags", "actual_results")
+
+_PRIORITY_ALIASES = {
+    "critical": "high",
+    "blocker": "high",
+    "urgent": "high",
+    "highest": "high",
+    "p0": "high",
+    "p1": "high",
+    "normal": "medium",
+    "moderate": "medium",
+    "med": "medium",
+    "p2": "medium",
+    "minor": "low",
+    "trivial": "low",
+    "lowest": "low",
+    "p3": "low",
+    "p4": "low",
+}
+
+# Leading list markers models put in front of lines: "-", "*", "•", "1.", "2)"
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+
+
+class InvalidCase(NamedTuple):
+    position: int
+    raw: Any
+    error: ValidationError
+
+
+def _as_list(value: Any) -> Any:
+    if isinstance(value, str):
+        lines = (_BULLET.sub("", line).strip() for line in value.splitlines())
+        return [line for line in lines if line]
+    if isinstance(value, list):
+        return [
+            item if isinstance(item, str)
+            else json.dumps(item) if isinstance(item, (dict, list))
+            else str(item)
+            for item in value
+            if item is not None
+        ]
+    return value
+
+
+def normalize_priority(value: Any) -> Any:
+    """
+    Map common priority spellings ("High", "P1", "Critical priority") to
+    high, medium or low. Unknown values are returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    key = value.strip().lower().replace("priority", "").strip(" :-")
+    if key in PRIORITIES:
+        return key
+    return _PRIORITY_ALIASES.get(key, value)
+
+
+def coerce_test_case(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply light coercions to model output before validation: a string
+    where a list belongs becomes one item per line, null optional fields
+    take their defaults and priorities are normalized.
+    """
+    coerced = dict(raw)
+    for field in _OPTIONAL_FIELDS:
+        if field in coerced and coerced[field] is None:
+            del coerced[field]
+    for field in _LIST_FIELDS:
+        if field in coerced:
+            coerced[field] = _as_list(coerced[field])
+    if "priority" in coerced:
+        coerced["priority"] = normalize_priority(coerced["priority"])
+    return coerced
+
+
+def validate_test_case(raw: Any) -> TestCase:
+    """
+    Coerce and validate one raw test case; raises ValidationError.
+    """
+    if isinstance(raw, dict):
+        raw = coerce_test_case(raw)
+    return TEST_CASE_ADAPTER.validate_python(raw)
+
+
+def validate_test_cases(raw_cases: Iterable[Any]) -> Tuple[List[TestCase], List[InvalidCase]]:
+    """
+    Validate each case on its own, so one malformed case doesn't reject
+    the others. Returns the valid cases and the invalid ones with errors.
+    """
+    valid: List[TestCase] = []
+    invalid: List[InvalidCase] = []
+    for position, raw in enumerate(raw_cases):
+        try:
+            valid.append(validate_test_case(raw))
+        except ValidationError as exc:
+            invalid.append(InvalidCase(position, raw, exc))
+    return valid, invalid
+
+
+def describe_invalid(invalid: List[InvalidCase], limit: int = 3) -> str:
+    """
+    Short, model readable summary of validation errors for a corrective
+    prompt.
+    """
+    lines = []
+    for case in invalid[:limit]:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'value'}: {error['msg']}"
+            for error in case.error.errors()[:3]
+        )
+        lines.append(f"- test case {case.position + 1}: {problems}")
+    if len(invalid) > limit:
+        lines.append(f"- and {len(invalid) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
+
+
+project_root = Path(__file__).resolve().parents[1]
+
+# Entry points whose import cost every CLI call and batch worker pays
+DEFAULT_MODULES = ["core.generator", "core.exporter", "cli.main"]
+
+# Backends that must only be imported when a PDF, Excel file or embedding
+# is actually used
+HEAVY_MODULES = ("pypdf", "openpyxl", "chromadb", "sentence_transformers", "numpy")
+
+
+def import_times(statement: str) -> dict:
+    """
+    Run `statement` in a fresh interpreter with `-X importtime` and return
+    {module: (self_us, cumulative_us)} for every module it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def heavy_imports(times: dict) -> list:
+    return sorted(name for name in times if name.split(".")[0] in HEAVY_MODULES)
+
+
+def measure(module: str, repeat: int) -> dict:
+    # The fastest run is the least disturbed by disk cache and scheduling noise
+    runs = [import_times(f"import {module}") for _ in range(repeat)]
+    best = min(runs, key=lambda times: times[module][1])
+    return {
+        "cumulative_ms": best[module][1] / 1000,
+        "modules": len(best),
+        "heavy": heavy_imports(best),
+        "slowest": sorted(
+            ((name, cumulative / 1000) for name, (_, cumulative) in best.items()
+             if "." not in name and name != module),
+            key=lambda item: -item[1],
+        )[:5],
+    }
+
+
+def main() -> None:
+    """Measure the import time of casecraft entry points.
+
+    Usage: `python tests/bench_import.py [MODULE ...] [--repeat N]
+    [--max-ms MS] [--save-baseline PATH] [--baseline PATH]`
+    """
+    arg_parser = argparse.ArgumentParser(description=main.__doc__.splitlines()[0])
+    arg_parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--max-ms", type=float, help="fail if any module takes longer")
+    arg_parser.add_argument("--save-baseline", metavar="PATH")
+    arg_parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    args = arg_parser.parse_args()
+
+    results = {module: measure(module, args.repeat) for module in args.modules}
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    ok = True
+    for module, result in results.items():
+        line = f"{module:<20} {result['cumulative_ms']:8.1f} ms  {result['modules']:4d} modules"
+        old = baseline.get(module, {}).get("cumulative_ms")
+        if old:
+            change = (result["cumulative_ms"] - old) / old
+            line += f"  ({change:+.1%} vs baseline)"
+            if change > args.tolerance:
+                line += "  REGRESSION"
+                ok = False
+        if args.max_ms is not None and result["cumulative_ms"] > args.max_ms:
+            line += f"  over {args.max_ms:.0f} ms"
+            ok = False
+        if result["heavy"]:
+            line += f"  heavy: {', '.join(result['heavy'][:3])}"
+            ok = False
+        print(line)
+        print("    " + ", ".join(f"{name} {ms:.1f}" for name, ms in result["slowest"]))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nbaseline saved to {args.save_baseline}")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
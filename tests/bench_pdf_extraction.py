@@ -0,0 +1,69 @@
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+
+# Ensure project root is on sys.path so this script runs when executed directly
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from pypdf import PdfReader, PdfWriter
+
+from core import parser
+
+
+def _build_large_pdf(sources, pages: int, output_path: str) -> None:
+    """Repeat the pages of the example PDFs until `pages` pages are written."""
+    writer = PdfWriter()
+    source_pages = [page for src in sources for page in PdfReader(str(src)).pages]
+    while len(writer.pages) < pages:
+        writer.add_page(source_pages[len(writer.pages) % len(source_pages)])
+    with open(output_path, "wb") as f:
+        writer.write(f)
+
+
+def _time(label: str, fn) -> float:
+    start = time.perf_counter()
+    pages = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f}s  ({len(pages)} pages)")
+    return elapsed
+
+
+def main() -> None:
+    """Compare sequential, process pool and cached page extraction.
+
+    Usage: `python tests/bench_pdf_extraction.py [pages] [workers]`
+    """
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    sources = sorted((project_root / "examples").glob("*.pdf"))
+
+    print("Example documents:")
+    for src in sources:
+        _time(f"  {src.name[:26]}", lambda: parser._extract_pdf_pages(str(src)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "large.pdf")
+        cache_dir = os.path.join(tmp, "pages")
+        _build_large_pdf(sources, pages, pdf_path)
+
+        print(f"\nSynthetic {pages} page document, {workers} workers:")
+        sequential = _time("sequential", lambda: parser._extract_pdf_pages(pdf_path))
+        parallel = _time(
+            "process pool",
+            lambda: parser._extract_pdf_pages(pdf_path, workers=workers, cache_dir=cache_dir),
+        )
+        cached = _time(
+            "warm page cache",
+            lambda: parser._extract_pdf_pages(pdf_path, workers=workers, cache_dir=cache_dir),
+        )
+
+    print(f"\nspeedup (pool):  {sequential / parallel:6.2f}x")
+    print(f"speedup (cache): {sequential / cached:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Ensure project root is on sys.path so this script runs when executed directly
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from core import generator
+from core.dedup import NearDuplicateIndex
+from core.exporter import export
+from core.llm import LLMClient
+from core.metrics import Metrics
+from core.output import OutputFormat
+from core.parser import parse_document
+from core.schema import TestCase, TestSuite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from stub_ollama import StubOllamaServer
+
+
+# Metrics compared against a saved baseline, and whether higher is better
+_COMPARED = {
+    "docs_per_minute": True,
+    "chunk_p50_seconds": False,
+    "chunk_p95_seconds": False,
+    "prompt_eval_ms_per_chunk": False,
+    "peak_rss_mb": False,
+}
+
+
+class BenchHandler:
+    """
+    Fake Ollama replies: bullet points for condensation, three test cases
+    per generation request, with every `malformed_every`-th generation
+    truncated mid-object and every `invalid_every`-th one not JSON at all.
+
+    Prompt evaluation imitates Ollama's prompt cache: each of `slots`
+    parallel slots remembers its last prompt, a request reuses the slot
+    sharing the longest prefix and only the rest of the prompt is counted
+    and timed as evaluated.
+    """
+
+    def __init__(self, malformed_every: int = 0, invalid_every: int = 0, slots: int = 4) -> None:
+        self.malformed_every = malformed_every
+        self.invalid_every = invalid_every
+        self._count = 0
+        self._slots = [""] * slots
+        self._lock = threading.Lock()
+
+    def _evaluated_tokens(self, prompt: str) -> int:
+        with self._lock:
+            shared = [len(os.path.commonprefix([prompt, cached])) for cached in self._slots]
+            slot = max(range(len(shared)), key=shared.__getitem__)
+            self._slots[slot] = prompt
+        return max(1, (len(prompt) - shared[slot]) // 4)
+
+    def __call__(self, payload):
+        evaluated = self._evaluated_tokens(payload.get("prompt", ""))
+        stats = {
+            "prompt_eval_count": evaluated,
+            "prompt_eval_duration": evaluated * 2_000_000,
+            "eval_count": 120,
+            "eval_duration": 400_000_000,
+            "total_duration": 600_000_000,
+        }
+        seed = hashlib.sha1(payload.get("prompt", "").encode("utf-8")).hexdigest()[:8]
+        if payload.get("format") != "json":
+            return dict(stats, response=f"- Field {seed} must be validated\n- Errors return 400")
+
+        with self._lock:
+            self._count += 1
+            count = self._count
+
+        if self.invalid_every and count % self.invalid_every == 0:
+            return dict(stats, response="Sorry, here are your test cases!")
+
+        cases = [
+            {
+                "use_case": f"Use case {seed}",
+                "test_case": f"Scenario {i} for {seed}",
+                "preconditions": ["User is logged in"],
+                "test_data": {"id": i},
+                "steps": [f"Open record {seed}", f"Submit variant {i}"],
+                "priority": "high",
+                "tags": ["bench"],
+                "expected_results": [f"Variant {i} is accepted"],
+            }
+            for i in range(3)
+        ]
+        text = json.dumps(cases)
+        if self.malformed_every and count % self.malformed_every == 0:
+            text = text[: text.rindex('"steps"')]
+        return dict(stats, response=text)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _write_synthetic_docs(directory: str, count: int, size_kb: int):
+    paths = []
+    for index in range(count):
+        path = os.path.join(directory, f"synthetic_{index}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            written = line = 0
+            while written < size_kb * 1024:
+                text = (
+                    f"Requirement {index}.{line}: the service must reject records "
+                    f"without field_{line % 97} and return error {400 + line % 30}.\n"
+                )
+                f.write(text)
+                written += len(text)
+                line += 1
+        paths.append(path)
+    return paths
+
+
+def _run_document(path: str, client: LLMClient, concurrency: int, output_dir: str, metrics: Metrics):
+    chunks = parse_document(path)
+    raw = generator._generate_from_chunks(
+        chunks,
+        model="bench",
+        max_retries=2,
+        client=client,
+        concurrency=concurrency,
+        failed_chunks=[],
+        metrics=metrics,
+    )
+
+    started = time.perf_counter()
+    unique = generator._deduplicate_test_cases(raw)
+    index = NearDuplicateIndex()
+    unique = [tc for tc in unique if index.add(tc) is None]
+    metrics.record_stage("dedup", time.perf_counter() - started)
+
+    suite = TestSuite.model_construct(
+        feature_name="Bench",
+        source_document=path,
+        test_cases=[TestCase.model_construct(**tc) for tc in unique],
+    )
+    stem = os.path.join(output_dir, Path(path).stem)
+    export(suite, OutputFormat.excel, stem + ".xlsx", metrics=metrics)
+    export(suite, OutputFormat.json, stem + ".json", metrics=metrics)
+    return len(chunks), len(suite.test_cases)
+
+
+def run(args) -> dict:
+    metrics = Metrics()
+    handler = BenchHandler(args.malformed_every, args.invalid_every)
+
+    with tempfile.TemporaryDirectory() as tmp, StubOllamaServer(handler, latency=args.latency) as server:
+        documents = [str(p) for p in sorted((project_root / "examples").glob("*.pdf"))]
+        documents += _write_synthetic_docs(tmp, args.synthetic_docs, args.synthetic_kb)
+
+        client = LLMClient(url=server.url, pool_size=max(10, args.concurrency))
+        started = time.perf_counter()
+        chunks = cases = 0
+        try:
+            if not args.no_warm_up:
+                generator.warm_up_model("bench", client, metrics=metrics)
+            for path in documents:
+                doc_chunks, doc_cases = _run_document(path, client, args.concurrency, tmp, metrics)
+                chunks += doc_chunks
+                cases += doc_cases
+                print(f"  {Path(path).name[:40]:<42} {doc_chunks:5d} chunks {doc_cases:6d} cases")
+        finally:
+            client.close()
+        elapsed = time.perf_counter() - started
+
+    snapshot = metrics.snapshot()
+    chunk_stage = snapshot["stages"].get("chunk", {})
+    prompt_eval_seconds = sum(s["prompt_eval_seconds"] for s in snapshot["llm"].values())
+    return {
+        "documents": len(documents),
+        "chunks": chunks,
+        "test_cases": cases,
+        "elapsed_seconds": elapsed,
+        "docs_per_minute": len(documents) / elapsed * 60,
+        "chunk_p50_seconds": chunk_stage.get("p50_seconds", 0.0),
+        "chunk_p95_seconds": chunk_stage.get("p95_seconds", 0.0),
+        "prompt_eval_ms_per_chunk": prompt_eval_seconds * 1000 / max(1, chunks),
+        "peak_rss_mb": _peak_rss_mb(),
+        "settings": {
+            "latency": args.latency,
+            "concurrency": args.concurrency,
+            "malformed_every": args.malformed_every,
+            "invalid_every": args.invalid_every,
+            "synthetic_docs": args.synthetic_docs,
+            "synthetic_kb": args.synthetic_kb,
+            "warm_up": not args.no_warm_up,
+        },
+        "metrics": snapshot,
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    """Print the change of each compared metric; False if any regressed."""
+    ok = True
+    if baseline.get("settings") != result["settings"]:
+        print("warning: baseline was recorded with different settings")
+
+    for key, higher_is_better in _COMPARED.items():
+        old, new = baseline.get(key), result.get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        ok = ok and not regressed
+        print(f"  {key:<20} {old:10.3f} -> {new:10.3f} ({change:+.1%}){'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def main() -> None:
+    """Benchmark the full pipeline against a local stub Ollama server.
+
+    Usage: `python tests/bench_pipeline.py [--latency S] [--concurrency N]
+    [--save-baseline PATH] [--baseline PATH]`
+    """
+    arg_parser = argparse.ArgumentParser(description=main.__doc__.splitlines()[0])
+    arg_parser.add_argument("--latency", type=float, default=0.02, help="seconds per stub reply")
+    arg_parser.add_argument("--concurrency", type=int, default=4)
+    arg_parser.add_argument("--malformed-every", type=int, default=10, help="truncate every Nth generation")
+    arg_parser.add_argument("--invalid-every", type=int, default=25, help="send non-JSON every Nth generation")
+    arg_parser.add_argument("--synthetic-docs", type=int, default=2)
+    arg_parser.add_argument("--synthetic-kb", type=int, default=100)
+    arg_parser.add_argument("--no-warm-up", action="store_true", help="skip the model warm-up request")
+    arg_parser.add_argument("--save-baseline", metavar="PATH")
+    arg_parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = arg_parser.parse_args()
+
+    print("Documents:")
+    result = run(args)
+
+    rss = result["peak_rss_mb"]
+    print(f"\n{result['documents']} documents, {result['chunks']} chunks, {result['test_cases']} test cases")
+    print(f"elapsed          {result['elapsed_seconds']:8.2f}s")
+    print(f"docs/min         {result['docs_per_minute']:8.2f}")
+    print(f"chunk p50        {result['chunk_p50_seconds']:8.3f}s")
+    print(f"chunk p95        {result['chunk_p95_seconds']:8.3f}s")
+    print(f"prompt eval      {result['prompt_eval_ms_per_chunk']:8.1f} ms/chunk (simulated prompt cache)")
+    print(f"peak RSS         {rss:8.1f} MB" if rss is not None else "peak RSS         n/a")
+    print(f"retries          {result['metrics']['retries']}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nbaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.baseline}:")
+        if not compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
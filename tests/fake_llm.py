@@ -0,0 +1,80 @@
+import time
+from unittest.mock import Mock
+
+from core import schema
+
+
+# A minimal valid raw test case as the model returns it
+CASE = {
+    "use_case": "Login",
+    "test_case": "Valid login",
+    "steps": ["Open page"],
+    "priority": "high",
+    "expected_results": ["Done"],
+}
+
+
+def case(name, **fields):
+    return dict(CASE, test_case=name, **fields)
+
+
+def suite_case(i, **fields):
+    """
+    Validated TestCase number `i` of a fake suite; `fields` replace its values.
+    """
+    values = {
+        "use_case": f"Use case {i}",
+        "test_case": f"Case {i} – ünïcode",
+        "preconditions": ["logged in"],
+        "test_data": {"user": f"u{i}"},
+        "steps": ["open", "click"],
+        "priority": "high",
+        "tags": ["smoke", "ui"],
+        "expected_results": ["done"],
+    }
+    values.update(fields)
+    return schema.TestCase(**values)
+
+
+def make_suite(n=3, make_case=suite_case):
+    return schema.TestSuite(
+        feature_name="Login",
+        source_document="login.md",
+        test_cases=[make_case(i) for i in range(n)],
+    )
+
+
+def scripted_client(*responses, **extra):
+    """
+    Mock LLM client answering generate() with `responses` in order; `extra`
+    fields (e.g. Ollama token statistics) are added to every reply.
+    """
+    client = Mock()
+    client.generate.side_effect = [dict(extra, response=r) for r in responses]
+    return client
+
+
+def echo_client(fail_on=(), delay=0.0, response=None):
+    """
+    Mock LLM client for chunk pipelines.
+
+    Condensation echoes the last line of the prompt (the chunk) and
+    generation returns one case named after it, so results can be traced
+    back to their chunks. Chunks in `fail_on` get invalid JSON after
+    `delay` seconds. With `response`, every request gets that reply
+    instead.
+    """
+    def fake_generate(model, prompt, options=None, format=None):
+        if response is not None:
+            return {"response": response}
+        text = prompt.strip().splitlines()[-1]
+        if format != "json":
+            return {"response": text}
+        if text in fail_on:
+            time.sleep(delay)
+            return {"response": "not json"}
+        return {"response": [case(text)]}
+
+    client = Mock()
+    client.generate.side_effect = fake_generate
+    return client
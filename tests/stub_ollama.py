@@ -0,0 +1,108 @@
+"""
+Minimal local stand-in for the Ollama generate API, used by tests.
+
+`StubOllamaServer` listens on an ephemeral localhost port and answers
+`/api/generate` with whatever its `handler` returns for the decoded request
+payload: either a dict (sent as the JSON body with status 200) or a
+`(status, body)` tuple. `latency` adds a fixed delay, in seconds, before
+every reply to imitate model generation time. `GET /api/version` answers
+200 while `healthy` is set and 503 otherwise, for health probes.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+Reply = Union[Dict[str, Any], Tuple[int, Any]]
+
+
+def default_handler(payload: Dict[str, Any]) -> Reply:
+    if payload.get("format") == "json":
+        return {"response": "[]"}
+    return {"response": "- condensed"}
+
+
+class StubOllamaServer:
+    def __init__(
+        self,
+        handler: Optional[Callable[[Dict[str, Any]], Reply]] = None,
+        latency: float = 0.0,
+    ) -> None:
+        self.handler = handler or default_handler
+        self.latency = latency
+        self.healthy = True
+        self.requests: List[Dict[str, Any]] = []
+        self.client_ports: List[int] = []
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Buffer headers and body into one write; separate small writes
+            # hit delayed ACKs and add ~40ms to every request
+            wbufsize = -1
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                status = 200 if stub.healthy else 503
+                data = json.dumps({"version": "stub"}).encode("utf-8")
+                self.send_response(status if self.path == "/api/version" else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                with stub._lock:
+                    stub.requests.append(payload)
+                    stub.client_ports.append(self.client_address[1])
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                reply = stub.handler(payload)
+                status, body = reply if isinstance(reply, tuple) else (200, reply)
+                data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/generate"
+
+    def start(self) -> "StubOllamaServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
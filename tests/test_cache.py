@@ -0,0 +1,56 @@
+from core import generator
+from core.cache import LLMCache
+from fake_llm import CASE, scripted_client
+
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    key = cache.make_key("m", "prompt", {"num_predict": 1})
+
+    assert cache.get(key) is None
+    cache.put(key, ["value"])
+    assert cache.get(key) == ["value"]
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_key_depends_on_model_prompt_and_options():
+    base = LLMCache.make_key("m", "p", {"a": 1})
+    assert base == LLMCache.make_key("m", "p", {"a": 1})
+    assert base != LLMCache.make_key("other", "p", {"a": 1})
+    assert base != LLMCache.make_key("m", "other", {"a": 1})
+    assert base != LLMCache.make_key("m", "p", {"a": 2})
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path), max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    cache.get("a")
+    cache.put("c", "z" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_persists_across_instances(tmp_path):
+    LLMCache(str(tmp_path)).put("k", {"v": 1})
+    assert LLMCache(str(tmp_path)).get("k") == {"v": 1}
+
+
+def test_generation_reuses_cached_results(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    client = scripted_client("- condensed", [CASE])
+
+    first = generator._generate_from_chunks(
+        ["chunk"], model="m", max_retries=0, client=client, cache=cache
+    )
+    second = generator._generate_from_chunks(
+        ["chunk"], model="m", max_retries=0, client=client, cache=cache
+    )
+
+    assert first == second == [CASE]
+    assert client.generate.call_count == 2
+    assert cache.hits == 2
@@ -0,0 +1,81 @@
+import json
+
+from core import generator, parser
+from core.llm import LLMClient
+from stub_ollama import StubOllamaServer
+
+
+def test_estimate_tokens():
+    assert parser.estimate_tokens("") == 0
+    assert parser.estimate_tokens("abcd") == 1
+    assert parser.estimate_tokens("abcde") == 2
+
+
+def test_pack_chunks_removes_overlap_and_respects_budget():
+    text = " ".join(f"w{i:03d}" for i in range(2000))
+    chunks = parser._chunk_text(text, chunk_size=800, overlap=100)
+
+    packed = generator._pack_chunks(chunks, max_tokens=1000, overlap=100)
+
+    assert len(packed) < len(chunks)
+    assert all(parser.estimate_tokens(p) <= 1000 for p in packed)
+    assert generator._pack_chunks(chunks, max_tokens=10**6, overlap=100) == [text]
+
+
+def test_packed_chunk_budget_fits_context():
+    budget = generator._packed_chunk_tokens(8192)
+    scale = budget // generator._BASE_CHUNK_TOKENS
+    prompt_tokens = parser.estimate_tokens(generator._build_prompt([]))
+    output_tokens = scale * (
+        generator._CONDENSE_OPTIONS["num_predict"] + generator._GENERATE_OPTIONS["num_predict"]
+    )
+
+    assert scale > 1
+    assert prompt_tokens + output_tokens <= 8192
+    assert generator._packed_chunk_tokens(100) == generator._BASE_CHUNK_TOKENS
+
+
+def test_context_budget_reduces_llm_calls(tmp_path):
+    doc = tmp_path / "spec.md"
+    doc.write_text(
+        "\n".join(f"The field f{i} must be validated." for i in range(400)),
+        encoding="utf-8",
+    )
+    case = {
+        "use_case": "u",
+        "test_case": "t",
+        "steps": ["s"],
+        "priority": "low",
+        "expected_results": ["r"],
+    }
+
+    def handler(payload):
+        if payload.get("format") == "json":
+            return {"response": json.dumps([case])}
+        return {"response": "- summary"}
+
+    with StubOllamaServer(handler) as server, LLMClient(url=server.url, num_ctx=8192) as client:
+        generator.generate_test_suite(str(doc), client=client)
+        baseline_calls = len(server.requests)
+        server.requests.clear()
+
+        generator.generate_test_suite(str(doc), client=client, context_tokens=8192)
+        packed_requests = list(server.requests)
+
+    assert len(packed_requests) * 4 < baseline_calls
+    assert all(r["options"]["num_ctx"] == 8192 for r in packed_requests)
+    generate = [r for r in packed_requests if r.get("format") == "json"]
+    assert generate[0]["options"]["num_predict"] > generator._GENERATE_OPTIONS["num_predict"]
+    assert "Generate at most 3 test cases" not in generate[0]["prompt"]
+
+
+def test_context_budget_requires_matching_client_num_ctx(tmp_path):
+    doc = tmp_path / "spec.txt"
+    doc.write_text("text", encoding="utf-8")
+
+    try:
+        generator.generate_test_suite(str(doc), client=LLMClient(), context_tokens=8192)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
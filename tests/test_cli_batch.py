@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from cli import batch
+from cli.batch import find_documents, run_batch
+from cli.main import main
+from core.llm import LLMClient
+from core.output import OutputFormat
+from core.parser import DEFAULT_PAGE_CACHE_DIR, parse_document
+from stub_ollama import StubOllamaServer
+
+
+class ConcurrencyTracker:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, payload):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+
+        if payload.get("format") != "json":
+            return {"response": "- condensed"}
+        return {
+            "response": json.dumps([{
+                "use_case": "Login",
+                "test_case": payload["prompt"][-40:],
+                "steps": ["Open page"],
+                "priority": "high",
+                "expected_results": ["Done"],
+            }])
+        }
+
+
+def _write_docs(directory, count):
+    for index in range(count):
+        path = directory / f"spec_{index}.md"
+        path.write_text(
+            "\n".join(f"Rule {index}.{i}: field_{i} must be validated." for i in range(60)),
+            encoding="utf-8",
+        )
+    (directory / "notes.docx").write_text("ignored", encoding="utf-8")
+
+
+def test_batch_limits_in_flight_requests_and_skips_up_to_date(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write_docs(docs, 4)
+    out = tmp_path / "out"
+    tracker = ConcurrencyTracker()
+
+    with StubOllamaServer(tracker) as server, LLMClient(server.url, max_in_flight=2) as client:
+        summary = run_batch(
+            str(docs),
+            output_dir=str(out),
+            formats=[OutputFormat.json, OutputFormat.excel],
+            max_in_flight=4,
+            parallel_documents=3,
+            client=client,
+        )
+
+        assert summary.generated == 4
+        assert summary.failed == 0
+        assert tracker.peak <= 2
+        assert sorted(os.listdir(out)) == sorted(
+            f"spec_{i}{ext}" for i in range(4) for ext in (".json", ".xlsx", ".json.manifest.json")
+        )
+
+        requests_before = len(server.requests)
+        rerun = run_batch(
+            str(docs), output_dir=str(out), formats=[OutputFormat.json], client=client
+        )
+        assert rerun.skipped == 4
+        assert len(server.requests) == requests_before
+
+        # Touching a source makes only that document stale
+        source = docs / "spec_2.md"
+        stat = source.stat()
+        os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+        stale = run_batch(
+            str(docs), output_dir=str(out), formats=[OutputFormat.json], client=client
+        )
+        assert (stale.generated, stale.skipped) == (1, 3)
+
+    assert "4 total, 1 generated, 3 up to date, 0 failed" in stale.format()
+
+
+def test_batch_limits_a_given_client_without_its_own_limit(tmp_path):
+    _write_docs(tmp_path, 3)
+    tracker = ConcurrencyTracker()
+
+    with StubOllamaServer(tracker) as server, LLMClient(server.url) as client:
+        summary = run_batch(
+            str(tmp_path),
+            output_dir=str(tmp_path / "out"),
+            formats=[OutputFormat.json],
+            max_in_flight=2,
+            parallel_documents=3,
+            client=client,
+            warm_up=False,
+        )
+
+    assert summary.generated == 3
+    assert tracker.peak <= 2
+
+
+def test_batch_reports_failed_documents(tmp_path):
+    (tmp_path / "good.md").write_text("The field must be set.", encoding="utf-8")
+    (tmp_path / "empty.md").write_text("   ", encoding="utf-8")
+    (tmp_path / "latin1.txt").write_bytes("Le champ doit être renseigné.".encode("latin-1"))
+
+    with StubOllamaServer(ConcurrencyTracker()) as server, LLMClient(server.url) as client:
+        summary = run_batch(
+            str(tmp_path), output_dir=str(tmp_path / "out"),
+            formats=[OutputFormat.json], client=client,
+        )
+
+    assert (summary.generated, summary.failed) == (1, 2)
+    assert "FAILED" in summary.format() and "UTF-8" in summary.format()
+
+
+def test_cli_passes_parse_options_to_the_parser(tmp_path, monkeypatch):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    _write_docs(docs, 2)
+    calls = []
+
+    def recording_parse(file_path, **options):
+        calls.append(options)
+        return parse_document(file_path, **options)
+
+    monkeypatch.setattr(batch, "parse_document", recording_parse)
+    monkeypatch.chdir(tmp_path)
+
+    with StubOllamaServer(ConcurrencyTracker()) as server:
+        common = [str(docs), "-f", "json", "--ollama-url", server.url, "--no-warm-up", "--force"]
+        assert main(["batch", *common, "--parse-workers", "3", "--page-cache", "pages"]) == 0
+        assert main(["batch", *common, "-o", "defaults"]) == 0
+        assert main(["batch", *common, "-o", "uncached", "--no-page-cache"]) == 0
+
+    assert calls == (
+        [{"workers": 3, "page_cache_dir": "pages"}] * 2
+        + [{"workers": 1, "page_cache_dir": DEFAULT_PAGE_CACHE_DIR}] * 2
+        + [{"workers": 1, "page_cache_dir": None}] * 2
+    )
+
+
+def test_find_documents_requires_a_directory(tmp_path):
+    with pytest.raises(NotADirectoryError):
+        find_documents(str(tmp_path / "missing"))
+
+
+def test_cli_requires_a_command(capsys):
+    with pytest.raises(SystemExit):
+        main([])
@@ -0,0 +1,102 @@
+import pytest
+
+from core.columnar import ColumnarSuite
+from core.exporter import export, export_many
+from core.output import OutputFormat
+from fake_llm import make_suite, suite_case
+
+
+def _case(i):
+    # Cases with varying fields, tags and priorities to exercise the columns
+    return suite_case(
+        i,
+        use_case=f"Use case {i % 3}",
+        preconditions=[f"pre {i}"] if i % 2 else [],
+        test_data={"user": f"u{i}", "attempts": i} if i % 4 else {},
+        steps=[f"step {n}" for n in range(i % 5)],
+        priority=("high", "medium", "low")[i % 3],
+        tags=[("smoke", "ui", "api")[n % 3] for n in range(i % 4)],
+        expected_results=["done", ""],
+        actual_results=[],
+    )
+
+
+def _suite(n=20):
+    return make_suite(n, _case)
+
+
+def test_round_trips_every_case():
+    suite = _suite()
+    columnar = ColumnarSuite.from_suite(suite)
+
+    assert len(columnar) == len(suite.test_cases)
+    assert list(columnar) == suite.test_cases
+    assert columnar[-1] == suite.test_cases[-1]
+    assert [columnar.data(i) for i in range(len(columnar))] == [
+        tc.model_dump(mode="json") for tc in suite.test_cases
+    ]
+    assert columnar.to_suite() == suite
+    with pytest.raises(IndexError):
+        columnar.data(len(columnar))
+
+
+def test_tags_and_priorities_are_interned_and_filterable():
+    suite = _suite()
+    columnar = ColumnarSuite.from_suite(suite)
+
+    assert columnar.tags() == ["smoke", "ui", "api"]
+    assert columnar.priorities() == ["high", "medium", "low"]
+
+    def expected(tag=None, priority=None):
+        return [
+            i for i, tc in enumerate(suite.test_cases)
+            if (tag is None or tag in tc.tags) and (priority is None or tc.priority == priority)
+        ]
+
+    for tag in (None, "smoke", "api", "missing"):
+        for priority in (None, "high", "low", "missing"):
+            assert columnar.positions(tag=tag, priority=priority) == expected(tag, priority)
+
+    positions = columnar.positions(tag="ui", priority="low")
+    assert [tc.test_case for tc in columnar.iter_cases(positions)] == [
+        suite.test_cases[i].test_case for i in positions
+    ]
+
+
+def test_repeated_tag_is_indexed_once():
+    columnar = ColumnarSuite(test_cases=[_case(0).model_copy(update={"tags": ["a", "a"]})])
+
+    assert columnar.positions(tag="a") == [0]
+    assert columnar[0].tags == ["a", "a"]
+
+
+def test_exports_match_the_pydantic_suite(tmp_path):
+    suite = _suite()
+    columnar = ColumnarSuite.from_suite(suite)
+
+    for fmt in (OutputFormat.json, OutputFormat.jsonl, OutputFormat.csv):
+        export(suite, fmt, str(tmp_path / f"suite.{fmt.value}"))
+        export(columnar, fmt, str(tmp_path / f"columnar.{fmt.value}"))
+        assert (tmp_path / f"columnar.{fmt.value}").read_bytes() == (tmp_path / f"suite.{fmt.value}").read_bytes()
+
+    export_many(columnar, {OutputFormat.json: tmp_path / "many.json"})
+    assert (tmp_path / "many.json").read_bytes() == (tmp_path / "suite.json").read_bytes()
+
+
+def test_is_smaller_than_the_pydantic_objects():
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        cases = [_case(i) for i in range(2000)]
+        objects = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        columnar = ColumnarSuite(test_cases=cases)
+        compact = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert len(columnar) == 2000
+    assert compact < objects / 3
@@ -0,0 +1,85 @@
+from core import generator
+from core.condense import (
+    CondenseStrategy,
+    extractive_condense,
+    needs_llm_condense,
+    noise_ratio,
+)
+from fake_llm import echo_client
+
+
+FEATURE_TEXT = (
+    "Activity management lets sales teams keep track of their work. "
+    "The team has been using spreadsheets for years. "
+    "The start_time field must be a valid ISO-8601 timestamp. "
+    "Requests without a record_id are rejected with error 400. "
+    "Our office is located in a nice building. "
+    "Users should not be allowed to edit completed activities."
+)
+
+
+def test_extractive_condense_keeps_requirement_sentences_in_order():
+    condensed = extractive_condense(FEATURE_TEXT, max_points=3)
+
+    assert condensed.splitlines() == [
+        "- The start_time field must be a valid ISO-8601 timestamp.",
+        "- Requests without a record_id are rejected with error 400.",
+        "- Users should not be allowed to edit completed activities.",
+    ]
+
+
+def test_adaptive_heuristics():
+    assert not needs_llm_condense(FEATURE_TEXT)
+    # nothing requirement-like to extract
+    assert needs_llm_condense("A pleasant introduction. Some history.")
+    # more requirements than bullet points
+    assert needs_llm_condense(FEATURE_TEXT, max_points=2)
+    # mostly symbols, e.g. a mangled table
+    assert noise_ratio("|--|==|##|") > 0.9
+    assert needs_llm_condense("must |--|==|##|--|==|##|")
+
+
+def _client():
+    return echo_client(response="[]")
+
+
+def test_extractive_strategy_skips_condense_request():
+    client = _client()
+    generator._generate_from_chunks(
+        [FEATURE_TEXT],
+        model="m",
+        max_retries=0,
+        client=client,
+        condense=CondenseStrategy.extractive,
+    )
+
+    assert client.generate.call_count == 1
+    assert client.generate.call_args.kwargs["format"] == "json"
+    assert "record_id are rejected" in client.generate.call_args.args[1]
+
+
+def test_adaptive_strategy_uses_llm_only_when_needed():
+    client = _client()
+    generator._generate_from_chunks(
+        [FEATURE_TEXT, "A pleasant introduction. Some history."],
+        model="m",
+        max_retries=0,
+        client=client,
+        condense="adaptive",
+    )
+
+    formats = [call.kwargs.get("format") for call in client.generate.call_args_list]
+    assert formats == ["json", None, "json"]
+
+
+def test_custom_condenser_callable():
+    client = _client()
+    generator._generate_from_chunks(
+        ["anything"],
+        model="m",
+        max_retries=0,
+        client=client,
+        condense=lambda chunk: "- custom summary",
+    )
+
+    assert "- custom summary" in client.generate.call_args.args[1]
@@ -0,0 +1,123 @@
+import time
+
+import pytest
+
+from core import generator
+from core.dedup import NearDuplicateIndex, deduplicate_near
+
+
+def _case(title, steps, expected, use_case="Login"):
+    return {
+        "use_case": use_case,
+        "test_case": title,
+        "preconditions": [],
+        "steps": steps,
+        "priority": "High",
+        "tags": [],
+        "expected_results": expected,
+    }
+
+
+LOCKOUT = _case(
+    "Account locks after five failed attempts",
+    ["Open the login page", "Enter a valid username", "Enter a wrong password five times"],
+    ["The account is locked", "A lockout message is shown to the user"],
+)
+LOCKOUT_PARAPHRASE = _case(
+    "Verify the account is locked after 5 failed logins",
+    ["Open the login page", "Enter a valid username", "Enter a wrong password five times"],
+    ["The account is locked", "A lockout message is shown to the user"],
+)
+RESET = _case(
+    "Password reset email is sent",
+    ["Open the forgot password form", "Submit a registered email address"],
+    ["A reset link is emailed within one minute"],
+)
+
+
+def test_paraphrased_case_is_merged_and_reported():
+    unique, merges = deduplicate_near([LOCKOUT, RESET, LOCKOUT_PARAPHRASE])
+
+    assert unique == [LOCKOUT, RESET]
+    assert len(merges) == 1
+    assert merges[0].kept == 0
+    assert merges[0].merged == 2
+    assert merges[0].kept_test_case == LOCKOUT["test_case"]
+    assert merges[0].merged_test_case == LOCKOUT_PARAPHRASE["test_case"]
+    assert 0.6 <= merges[0].similarity < 1
+
+
+def test_same_title_with_different_steps_is_kept():
+    other = _case(LOCKOUT["test_case"], RESET["steps"], RESET["expected_results"])
+    unique, merges = deduplicate_near([LOCKOUT, other])
+
+    assert unique == [LOCKOUT, other]
+    assert merges == []
+
+
+def test_index_scales_without_pairwise_comparisons():
+    cases = [
+        _case(
+            f"Case {i}",
+            [f"Call endpoint e{i} with payload p{i}", f"Check audit log entry a{i}"],
+            [f"Response r{i} is returned", f"Record c{i} is created in table t{i}"],
+            use_case=f"Feature {i}",
+        )
+        for i in range(5000)
+    ]
+
+    started = time.perf_counter()
+    unique, merges = deduplicate_near(cases + cases[:100])
+    elapsed = time.perf_counter() - started
+
+    assert len(unique) == 5000
+    assert [m.merged for m in merges] == list(range(5000, 5100))
+    assert elapsed < 20
+
+
+def test_embedding_backend_batches_and_uses_cosine():
+    vectors = {
+        LOCKOUT["test_case"]: [1.0, 0.1, 0.0],
+        LOCKOUT_PARAPHRASE["test_case"]: [0.98, 0.12, 0.01],
+        RESET["test_case"]: [0.0, 0.2, 1.0],
+    }
+    calls = []
+
+    def embed(texts):
+        calls.append(len(texts))
+        return [vectors[text.splitlines()[1]] for text in texts]
+
+    unique, merges = deduplicate_near(
+        [LOCKOUT, RESET, LOCKOUT_PARAPHRASE], threshold=0.95, embedder=embed
+    )
+
+    assert calls == [3]
+    assert unique == [LOCKOUT, RESET]
+    assert [(m.kept, m.merged) for m in merges] == [(0, 2)]
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=0)
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=30, bands=16)
+
+
+def test_generate_test_suite_merges_near_duplicates(monkeypatch):
+    monkeypatch.setattr(generator, "parse_document", lambda path, **options: ["a", "b"])
+    monkeypatch.setattr(
+        generator,
+        "_generate_from_chunks",
+        lambda **kwargs: [LOCKOUT, RESET, LOCKOUT_PARAPHRASE],
+    )
+
+    index = NearDuplicateIndex()
+    suite = generator.generate_test_suite(
+        "doc.pdf", client=generator.LLMClient(), near_duplicates=index
+    )
+
+    assert [tc.test_case for tc in suite.test_cases] == [
+        LOCKOUT["test_case"],
+        RESET["test_case"],
+    ]
+    assert [(m.kept, m.merged) for m in index.merges] == [(0, 2)]
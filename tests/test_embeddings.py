@@ -0,0 +1,132 @@
+import os
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.dedup import deduplicate_near
+from core.embeddings import EmbeddingCache, EmbeddingError, EmbeddingService, EmbeddingWorker
+
+
+def _hash_embedder(texts):
+    vectors = []
+    for text in texts:
+        vector = [0.0] * 16
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % 16] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+def hash_embedder_factory():
+    return _hash_embedder
+
+
+def failing_embedder_factory():
+    def embed(texts):
+        raise RuntimeError("model failed")
+    return embed
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return _hash_embedder(texts)
+
+
+def test_service_batches_and_deduplicates_misses(tmp_path):
+    embedder = CountingEmbedder()
+    service = EmbeddingService(embedder, EmbeddingCache(str(tmp_path), "m"), batch_size=2)
+
+    matrix = service.embed(["a b", "c", "a b", "d e", "f"])
+
+    assert matrix.shape == (5, 16)
+    assert matrix.dtype == np.float32
+    assert embedder.calls == [["a b", "c"], ["d e", "f"]]
+    assert np.array_equal(matrix[0], matrix[2])
+
+
+def test_cache_persists_across_instances_and_grows(tmp_path):
+    texts = [f"text {i}" for i in range(2500)]
+    first = EmbeddingService(CountingEmbedder(), EmbeddingCache(str(tmp_path), "m"))
+    expected = first.embed(texts)
+
+    embedder = CountingEmbedder()
+    cache = EmbeddingCache(str(tmp_path), "m")
+    reopened = EmbeddingService(embedder, cache).embed(texts)
+
+    assert embedder.calls == []
+    assert np.array_equal(reopened, expected)
+    assert cache.stats() == {"entries": 2500, "hits": 2500, "misses": 0}
+    # a different namespace (model) never shares vectors
+    assert len(EmbeddingCache(str(tmp_path), "other")) == 0
+
+
+def test_unflushed_keys_are_ignored(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "m")
+    cache.put_many(["a"], np.ones((1, 4)))
+    with open(os.path.join(cache.cache_dir, "keys.txt"), "a", encoding="utf-8") as f:
+        f.write("abc")  # torn write
+
+    assert len(EmbeddingCache(str(tmp_path), "m")) == 1
+
+
+def test_torn_key_line_does_not_shift_later_rows(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "m")
+    cache.put_many(["a", "b"], np.array([[1.0, 1.0], [2.0, 2.0]]))
+    with open(os.path.join(cache.cache_dir, "keys.txt"), "a", encoding="utf-8") as f:
+        f.write(cache.make_key("c")[:20])  # died while writing the key of "c"
+
+    EmbeddingCache(str(tmp_path), "m").put_many(["d"], np.full((1, 2), 9.0))
+    EmbeddingCache(str(tmp_path), "m").put_many(["e"], np.full((1, 2), 7.0))
+
+    reopened = EmbeddingCache(str(tmp_path), "m")
+    a, c, d, e = reopened.get_many(["a", "c", "d", "e"])
+    assert c is None
+    assert np.array_equal(a, [1.0, 1.0])
+    assert np.array_equal(d, [9.0, 9.0])
+    assert np.array_equal(e, [7.0, 7.0])
+
+
+def test_meta_without_vectors_file_is_an_empty_cache(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "m")
+    cache.put_many(["a"], np.ones((1, 4)))
+    os.remove(os.path.join(cache.cache_dir, "vectors.f32"))  # died before the vectors
+
+    reopened = EmbeddingCache(str(tmp_path), "m")
+    assert len(reopened) == 0
+    reopened.put_many(["b"], np.full((1, 4), 2.0))
+    cache = EmbeddingCache(str(tmp_path), "m")
+    assert cache.get_many(["a", "b"])[0] is None
+    assert np.array_equal(cache.get_many(["b"])[0], np.full(4, 2.0))
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "m")
+    cache.put_many(["a"], np.ones((1, 4)))
+    with pytest.raises(ValueError):
+        cache.put_many(["b"], np.ones((1, 8)))
+
+
+def test_service_plugs_into_near_duplicate_detection():
+    case = {"use_case": "Login", "test_case": "Valid login", "steps": ["Open"], "expected_results": ["Ok"]}
+    service = EmbeddingService(CountingEmbedder())
+
+    unique, merges = deduplicate_near([case, dict(case)], threshold=0.99, embedder=service)
+
+    assert unique == [case]
+    assert len(merges) == 1
+    assert service.embed_test_cases([case]).shape == (1, 16)
+
+
+def test_worker_process_embeds_and_reports_errors():
+    with EmbeddingWorker(hash_embedder_factory) as worker:
+        assert np.array_equal(worker(["a b"]), np.asarray(_hash_embedder(["a b"]), dtype=np.float32))
+
+    with EmbeddingWorker(failing_embedder_factory) as worker:
+        with pytest.raises(EmbeddingError, match="model failed"):
+            worker(["x"])
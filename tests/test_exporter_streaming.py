@@ -0,0 +1,139 @@
+import csv
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from core import schema
+from core import exporter
+from core.exporter import export, export_many
+from core.output import OutputFormat
+from fake_llm import make_suite, suite_case
+
+
+def _once(cases):
+    # a one-shot iterator, like core.generator.iter_test_cases
+    yield from cases
+
+
+@pytest.mark.parametrize("n", [0, 1, 3])
+def test_streamed_json_matches_suite_dump(tmp_path, n):
+    suite = make_suite(n)
+    path = tmp_path / "suite.json"
+
+    export(suite, OutputFormat.json, str(path))
+
+    assert path.read_text(encoding="utf-8") == suite.model_dump_json(indent=2)
+
+
+def test_json_from_iterator_uses_given_header(tmp_path):
+    path = tmp_path / "out.json"
+
+    export(_once(make_suite().test_cases), OutputFormat.json, str(path), feature_name="Login")
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["feature_name"] == "Login" and data["source_document"] == ""
+    assert schema.TestSuite(**data).test_cases == make_suite().test_cases
+
+
+def test_jsonl_writes_one_case_per_line(tmp_path):
+    path = tmp_path / "out.jsonl"
+
+    export(_once(make_suite().test_cases), OutputFormat.jsonl, str(path))
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [schema.TestCase.model_validate_json(line) for line in lines] == make_suite().test_cases
+
+
+def test_csv_and_excel_have_the_same_rows(tmp_path):
+    cases = make_suite().test_cases + [suite_case(9, actual_results=[], tags=[], test_data={})]
+    csv_path, xlsx_path = tmp_path / "out.csv", tmp_path / "out.xlsx"
+
+    export(_once(cases), OutputFormat.csv, str(csv_path))
+    export(_once(cases), OutputFormat.excel, str(xlsx_path))
+
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        csv_rows = list(csv.reader(f))
+    sheet = load_workbook(xlsx_path).active
+    excel_rows = [["" if v is None else v for v in row] for row in sheet.iter_rows(values_only=True)]
+
+    assert csv_rows == excel_rows
+    assert csv_rows[0][0] == "Use Case" and len(csv_rows) == len(cases) + 1
+    assert csv_rows[1][3] == "user: u0" and csv_rows[1][4] == "open\nclick"
+    assert sheet.column_dimensions["A"].width == 30
+
+
+def test_exporters_consume_cases_lazily(tmp_path):
+    seen = []
+
+    def generated():
+        for case in make_suite().test_cases:
+            seen.append(case)
+            yield case
+
+    cases = generated()
+    export(cases, OutputFormat.jsonl, str(tmp_path / "out.jsonl"))
+
+    assert len(seen) == 3 and next(cases, None) is None
+
+
+def test_export_many_matches_single_exports(tmp_path):
+    suite = make_suite(5)
+    formats = [OutputFormat.json, OutputFormat.jsonl, OutputFormat.csv, OutputFormat.excel]
+    suffixes = {OutputFormat.excel: "xlsx"}
+    many = {fmt: tmp_path / "many" / f"out.{suffixes.get(fmt, fmt.value)}" for fmt in formats}
+
+    export_many(suite, many)
+
+    for fmt, path in many.items():
+        single = tmp_path / f"single{path.suffix}"
+        export(suite, fmt, str(single))
+        if fmt is OutputFormat.excel:
+            rows = lambda p: list(load_workbook(p).active.iter_rows(values_only=True))
+            assert rows(path) == rows(single)
+        else:
+            assert path.read_bytes() == single.read_bytes()
+    assert sorted(p.name for p in (tmp_path / "many").iterdir()) == sorted(p.name for p in many.values())
+
+
+def test_export_many_flattens_each_case_once(tmp_path, monkeypatch):
+    calls = []
+    original = exporter.flatten
+    monkeypatch.setattr(exporter, "flatten", lambda tc: calls.append(tc) or original(tc))
+
+    export_many(_once(make_suite(4).test_cases), {
+        OutputFormat.json: tmp_path / "out.json",
+        OutputFormat.csv: tmp_path / "out.csv",
+    }, batch_size=1, queue_size=1)
+
+    assert len(calls) == 4
+
+
+def test_export_many_keeps_old_outputs_when_generation_fails(tmp_path):
+    json_path, csv_path = tmp_path / "out.json", tmp_path / "out.csv"
+    json_path.write_text("old", encoding="utf-8")
+
+    def interrupted():
+        yield from make_suite(2).test_cases
+        raise RuntimeError("generation failed")
+
+    with pytest.raises(RuntimeError, match="generation failed"):
+        export_many(interrupted(), {OutputFormat.json: json_path, OutputFormat.csv: csv_path}, batch_size=1, queue_size=1)
+
+    assert json_path.read_text(encoding="utf-8") == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.json"]
+
+
+def test_failing_writer_does_not_block_the_others(tmp_path):
+    def broken(cases, path, header):
+        next(iter(cases))
+        raise OSError("disk full")
+
+    exporter.register_exporter("broken", broken)
+    try:
+        with pytest.raises(OSError, match="disk full"):
+            export_many(make_suite(50), {"broken": tmp_path / "out.bin", OutputFormat.csv: tmp_path / "out.csv"}, batch_size=2, queue_size=2)
+    finally:
+        exporter._EXPORTERS.pop("broken")
+
+    assert list(tmp_path.iterdir()) == []
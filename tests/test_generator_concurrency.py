@@ -0,0 +1,81 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core import generator
+
+
+def _fake_condense(chunk, model, **kwargs):
+    return chunk
+
+
+def _fake_generate(prompt, model, max_retries, **kwargs):
+    # The condensed chunk text is the last line of the prompt
+    chunk = prompt.strip().splitlines()[-1]
+    time.sleep(0.01 if chunk.endswith("0") else 0)
+    return [{"use_case": chunk, "test_case": chunk}]
+
+
+def test_concurrent_generation_preserves_chunk_order():
+    chunks = [f"chunk {i}" for i in range(12)]
+
+    with patch("core.generator._condense_chunk", side_effect=_fake_condense), \
+         patch("core.generator._generate_single_suite", side_effect=_fake_generate):
+        results = generator._generate_from_chunks(
+            chunks, model="m", max_retries=0, client=Mock(), concurrency=4
+        )
+
+    assert [tc["use_case"] for tc in results] == chunks
+
+
+def test_concurrency_limits_in_flight_chunks():
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def tracking_generate(prompt, model, max_retries, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return []
+
+    with patch("core.generator._condense_chunk", side_effect=_fake_condense), \
+         patch("core.generator._generate_single_suite", side_effect=tracking_generate):
+        generator._generate_from_chunks(
+            [f"chunk {i}" for i in range(10)],
+            model="m",
+            max_retries=0,
+            client=Mock(),
+            concurrency=3,
+        )
+
+    assert 1 < peak <= 3
+
+
+def test_concurrent_failure_reports_chunk_index():
+    def failing_generate(prompt, model, max_retries, **kwargs):
+        if prompt.strip().endswith("chunk 5"):
+            raise generator.GenerationError("boom")
+        return []
+
+    with patch("core.generator._condense_chunk", side_effect=_fake_condense), \
+         patch("core.generator._generate_single_suite", side_effect=failing_generate):
+        with pytest.raises(generator.GenerationError, match="chunk 5"):
+            generator._generate_from_chunks(
+                [f"chunk {i}" for i in range(8)],
+                model="m",
+                max_retries=0,
+                client=Mock(),
+                concurrency=4,
+            )
+
+
+def test_invalid_concurrency_rejected():
+    with pytest.raises(ValueError):
+        generator._generate_from_chunks(["a"], model="m", max_retries=0, client=Mock(), concurrency=0)
@@ -1,13 +1,12 @@
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
 from core import generator
 
 
-def _make_response(payload):
-    resp = Mock()
-    resp.status_code = 200
-    resp.json.return_value = {"response": payload}
-    return resp
+def _make_client(payload):
+    client = Mock()
+    client.generate.return_value = {"response": payload}
+    return client
 
 
 def test_single_test_case_dict_is_wrapped():
@@ -23,8 +22,9 @@ def test_single_test_case_dict_is_wrapped():
         'actual_results': []
     }
 
-    with patch('core.generator.requests.post', return_value=_make_response(single)):
-        results = generator._generate_single_suite(prompt='x', model='m', max_retries=0)
+    results = generator._generate_single_suite(
+        prompt='x', model='m', max_retries=0, client=_make_client(single)
+    )
 
     assert isinstance(results, list)
     assert len(results) == 1
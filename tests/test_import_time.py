@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from bench_import import heavy_imports, import_times
+from cli.batch import find_documents
+from core import exporter, parser
+from core import schema
+from core.parser import DocumentParseError
+
+
+def test_entry_points_do_not_import_heavy_backends():
+    times = import_times("import core.generator, core.exporter, cli.main")
+
+    assert heavy_imports(times) == []
+
+
+def test_backends_are_imported_on_first_use(tmp_path):
+    doc = tmp_path / "spec.md"
+    doc.write_text("Users can log in.", encoding="utf-8")
+    out = tmp_path / "out.json"
+    statement = (
+        "from core.parser import parse_document; from core.exporter import export; "
+        "from core.schema import TestSuite; "
+        f"parse_document({str(doc)!r}); "
+        f"export(TestSuite(feature_name='f', source_document='d', test_cases=[]), 'json', {str(out)!r})"
+    )
+    assert heavy_imports(import_times(statement)) == []
+
+    statement = (
+        "from core.parser import parse_document; "
+        "parse_document('examples/sample.pdf')"
+    )
+    assert "pypdf" in heavy_imports(import_times(statement))
+
+
+def test_parser_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(parser, "_PARSERS", dict(parser._PARSERS))
+    doc = tmp_path / "spec.csv"
+    doc.write_text("a,b\nUsers can log in,yes\n", encoding="utf-8")
+
+    with pytest.raises(DocumentParseError, match="Unsupported file type: .csv"):
+        parser.parse_document(str(doc))
+
+    parser.register_parser(
+        [".CSV"],
+        lambda path, **_: open(path, encoding="utf-8").read().replace(",", " "),
+        lambda path, **_: iter([open(path, encoding="utf-8").read().replace(",", " ")]),
+    )
+
+    assert ".csv" in parser.supported_suffixes()
+    assert find_documents(str(tmp_path)) == [doc]
+    assert parser.parse_document(str(doc)) == ["a b\nUsers can log in yes"]
+    assert list(parser.iter_chunks(str(doc))) == parser.parse_document(str(doc))
+
+
+def test_exporter_registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporter, "_EXPORTERS", dict(exporter._EXPORTERS))
+    suite = schema.TestSuite(feature_name="f", source_document="d", test_cases=[])
+
+    with pytest.raises(ValueError, match="Unsupported output format"):
+        exporter.export(suite, "names", str(tmp_path / "out.txt"))
+
+    def write_names(cases, path, header):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([case.data["test_case"] for case in cases], f)
+
+    exporter.register_exporter("names", write_names)
+    exporter.export(suite, "names", str(tmp_path / "out.txt"))
+
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8") == "[]"
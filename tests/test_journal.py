@@ -0,0 +1,127 @@
+import pytest
+
+from core import generator
+from core.journal import RunJournal
+from fake_llm import echo_client as _client
+
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    journal = RunJournal(str(tmp_path / "run.jsonl"))
+    journal.record(0, "fp0", "condensed", [{"test_case": "a"}])
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"chunk": 1, "fingerp')
+
+    records = journal.load()
+    assert list(records) == [0]
+    assert records[0]["condensed"] == "condensed"
+
+    # a resumed run appends after the torn line without losing records
+    journal.record(1, "fp1", "", [])
+    journal.record(2, "fp2", "", [])
+    assert list(RunJournal(str(journal.path)).load()) == [0, 1, 2]
+
+
+def test_resume_skips_completed_chunks(tmp_path):
+    journal_path = str(tmp_path / "run.jsonl")
+    chunks = ["alpha", "beta", "gamma"]
+
+    with pytest.raises(generator.GenerationError, match="chunk 2"):
+        generator._generate_from_chunks(
+            chunks,
+            model="m",
+            max_retries=0,
+            client=_client(fail_on={"gamma"}),
+            journal=RunJournal(journal_path),
+        )
+
+    completed = RunJournal(journal_path).load()
+    assert sorted(completed) == [0, 1]
+
+    client = _client()
+    results = generator._generate_from_chunks(
+        chunks,
+        model="m",
+        max_retries=0,
+        client=client,
+        journal=RunJournal(journal_path),
+        completed=completed,
+    )
+
+    assert [tc["test_case"] for tc in results] == chunks
+    # condense + generate for the remaining chunk only
+    assert client.generate.call_count == 2
+
+
+def test_concurrent_run_records_chunks_finished_after_a_failure(tmp_path):
+    journal_path = str(tmp_path / "run.jsonl")
+    chunks = [f"chunk {i}" for i in range(6)]
+
+    # chunk 0 fails only after the chunks running next to it have finished
+    with pytest.raises(generator.GenerationError, match="chunk 0"):
+        generator._generate_from_chunks(
+            chunks,
+            model="m",
+            max_retries=0,
+            client=_client(fail_on={"chunk 0"}, delay=0.2),
+            concurrency=4,
+            journal=RunJournal(journal_path),
+        )
+
+    completed = RunJournal(journal_path).load()
+    assert 0 not in completed and {1, 2, 3} <= set(completed)
+
+    client = _client()
+    results = generator._generate_from_chunks(
+        chunks,
+        model="m",
+        max_retries=0,
+        client=client,
+        concurrency=4,
+        journal=RunJournal(journal_path),
+        completed=completed,
+    )
+
+    assert [tc["test_case"] for tc in results] == chunks
+    assert client.generate.call_count == 2 * (len(chunks) - len(completed))
+
+
+def test_resume_requires_journal_path(tmp_path):
+    doc = tmp_path / "feature.txt"
+    doc.write_text("Some text.", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        generator.generate_test_suite(str(doc), client=_client(), resume=True)
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_partial_mode_reports_failed_chunks(concurrency):
+    failed = []
+    results = generator._generate_from_chunks(
+        ["alpha", "beta", "gamma", "delta"],
+        model="m",
+        max_retries=0,
+        client=_client(fail_on={"beta", "delta"}),
+        concurrency=concurrency,
+        failed_chunks=failed,
+    )
+
+    assert [tc["test_case"] for tc in results] == ["alpha", "gamma"]
+    assert failed == [1, 3]
+
+
+def test_generate_test_suite_reports_failed_chunks(tmp_path):
+    doc = tmp_path / "feature.txt"
+    doc.write_text("Some text.", encoding="utf-8")
+    failed = []
+
+    suite = generator.generate_test_suite(
+        str(doc),
+        client=_client(fail_on={"Some text."}),
+        max_retries=0,
+        failed_chunks=failed,
+        journal_path=str(tmp_path / "run.jsonl"),
+    )
+
+    assert isinstance(suite, generator.TestSuite)
+    assert failed == [0]
+    assert suite.test_cases == []
@@ -0,0 +1,48 @@
+import json
+from core import generator
+from core.jsonstream import repair_json
+from fake_llm import case as _case, scripted_client as _client
+
+
+def test_code_fences_and_prose_are_stripped():
+    text = "Here are the cases:\n```json\n" + json.dumps([_case("a")]) + "\n```\nEnjoy!"
+    assert repair_json(text) == [_case("a")]
+
+
+def test_trailing_partial_object_is_dropped():
+    text = json.dumps({"test_cases": [_case("a"), _case("b")]})
+    truncated = text[: text.rindex('"priority"')]
+
+    assert repair_json(truncated) == [_case("a")]
+
+
+def test_unterminated_object_is_closed():
+    text = json.dumps(_case("a"))[:-1] + ', "tags": ["smoke"], "preconditions":'
+
+    assert repair_json(text) == dict(_case("a"), tags=["smoke"])
+
+
+def test_value_cut_inside_a_string_is_not_kept():
+    assert repair_json('{"use_case": "Log') is None
+    assert repair_json("no json at all") is None
+
+
+def test_truncated_response_is_repaired_without_retry():
+    text = json.dumps([_case("a"), _case("b"), _case("c")])
+    client = _client(text[: text.rindex('"steps"')])
+
+    result = generator._request_test_cases("x", "m", max_retries=2, client=client)
+
+    assert [tc["test_case"] for tc in result] == ["a", "b"]
+    assert client.generate.call_count == 1
+
+
+def test_retry_is_used_when_nothing_can_be_recovered():
+    incomplete = json.dumps([{"use_case": "Login", "test_case": "a"}])[:-1]
+    client = _client(incomplete, json.dumps([_case("a")]))
+
+    result = generator._request_test_cases("x", "m", max_retries=2, client=client)
+
+    assert result == [_case("a")]
+    assert client.generate.call_count == 2
+    assert "previous output was invalid" in client.generate.call_args.args[1]
@@ -0,0 +1,105 @@
+import zlib
+from unittest.mock import Mock
+
+import pytest
+
+from core import generator
+from core.metrics import Metrics
+
+
+def _bag_of_words(texts):
+    """Deterministic test embedder: hashed word counts."""
+    vectors = []
+    for text in texts:
+        vector = [0.0] * 64
+        for word in text.lower().split():
+            vector[zlib.crc32(word.strip(".,:").encode()) % 64] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+def test_prompt_without_context_is_unchanged():
+    assert generator._build_prompt(["x"], context=None) == generator._build_prompt(["x"])
+    assert generator._build_prompt(["x"], context=[]) == generator._build_prompt(["x"])
+
+
+def test_retrieved_snippets_are_added_to_the_generation_prompt():
+    knowledge = Mock()
+    knowledge.context_for.return_value = ["[billing.md] Invoices are locked after export."]
+    client = Mock()
+    client.generate.side_effect = [{"response": "- condensed rule"}, {"response": "[]"}]
+    metrics = Metrics()
+
+    generator._generate_from_chunks(
+        ["chunk"], model="m", max_retries=0, client=client,
+        knowledge=knowledge, metrics=metrics,
+    )
+
+    knowledge.context_for.assert_called_once_with("- condensed rule")
+    prompt = client.generate.call_args.args[1]
+    assert "Related product knowledge" in prompt
+    assert prompt.index("Invoices are locked") < prompt.index("Feature documentation:")
+    assert metrics.snapshot()["stages"]["retrieve"]["count"] == 1
+
+
+def test_knowledge_revision_is_part_of_the_chunk_fingerprint():
+    knowledge = Mock(revision="r1")
+    first = generator._chunk_fingerprints(["a"], "m", knowledge=knowledge)
+    knowledge.revision = "r2"
+
+    assert first != generator._chunk_fingerprints(["a"], "m", knowledge=knowledge)
+    assert generator._chunk_fingerprints(["a"], "m") != first
+
+
+def test_incremental_ingest_and_query(tmp_path):
+    pytest.importorskip("chromadb")
+    from core.knowledge import KnowledgeIndex
+
+    docs = tmp_path / "kb"
+    docs.mkdir()
+    (docs / "billing.md").write_text("Invoices are locked after export to the ledger.", encoding="utf-8")
+    (docs / "auth.md").write_text("Passwords expire after ninety days.", encoding="utf-8")
+    (docs / "image.png").write_bytes(b"not a document")
+
+    calls = []
+
+    def embedder(texts):
+        calls.append(len(texts))
+        return _bag_of_words(texts)
+
+    index_dir = str(tmp_path / "index")
+    index = KnowledgeIndex(index_dir, embedder=embedder, top_k=1)
+    metrics = Metrics()
+
+    report = index.ingest(str(docs), metrics=metrics)
+    assert sorted(report.added) == ["auth.md", "billing.md"]
+    assert report.chunks_embedded == 2
+    assert len(index) == 2
+    assert metrics.snapshot()["stages"]["ingest"]["count"] == 1
+    revision = index.revision
+
+    # Reopened index: nothing changed, nothing is embedded again
+    index = KnowledgeIndex(index_dir, embedder=embedder, top_k=1)
+    calls.clear()
+    report = index.ingest(str(docs))
+    assert (report.added, report.updated, report.unchanged) == ([], [], 2)
+    assert calls == []
+    assert index.revision == revision
+
+    (docs / "auth.md").write_text("Passwords expire after thirty days.", encoding="utf-8")
+    (docs / "billing.md").unlink()
+    report = index.ingest(str(docs))
+    assert (report.updated, report.removed) == (["auth.md"], ["billing.md"])
+    assert calls == [1]
+    assert index.revision != revision
+
+    [snippet] = index.query("when do passwords expire")
+    assert snippet.source == "auth.md"
+    assert index.context_for("passwords") == ["[auth.md] Passwords expire after thirty days."]
+
+
+def test_missing_dependency_is_reported():
+    from core import knowledge
+
+    with pytest.raises(knowledge.KnowledgeIndexError, match="pip install some-package"):
+        knowledge._import("casecraft_missing_module", "some-package")
@@ -0,0 +1,98 @@
+import json
+import time
+
+import pytest
+
+from core import generator
+from core.llm import LLMClient, LLMClientError
+from stub_ollama import StubOllamaServer
+
+
+def _client(url, **kwargs):
+    kwargs.setdefault("backoff_base", 0)
+    return LLMClient(url=url, **kwargs)
+
+
+def test_client_sends_keep_alive_and_reuses_connection():
+    with StubOllamaServer() as server, _client(server.url, keep_alive="30m") as client:
+        for _ in range(3):
+            assert client.generate("m", "p")["response"] == "- condensed"
+
+    assert all(req["keep_alive"] == "30m" for req in server.requests)
+    assert len(set(server.client_ports)) == 1
+
+
+def test_client_retries_server_errors():
+    calls = []
+
+    def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 3:
+            return 503, {"error": "loading"}
+        return {"response": "ok"}
+
+    with StubOllamaServer(flaky) as server, _client(server.url, max_retries=3) as client:
+        assert client.generate("m", "p")["response"] == "ok"
+
+    assert len(calls) == 3
+
+
+def test_client_gives_up_after_max_retries():
+    with StubOllamaServer(lambda payload: (500, {"error": "x"})) as server:
+        with _client(server.url, max_retries=1) as client:
+            with pytest.raises(LLMClientError):
+                client.generate("m", "p")
+
+        assert len(server.requests) == 2
+
+
+def test_client_does_not_retry_client_errors():
+    with StubOllamaServer(lambda payload: (404, {"error": "model not found"})) as server:
+        with _client(server.url, max_retries=3) as client:
+            with pytest.raises(LLMClientError, match="404"):
+                client.generate("m", "p")
+
+        assert len(server.requests) == 1
+
+
+def test_client_read_timeout():
+    def slow(payload):
+        time.sleep(0.5)
+        return {"response": "late"}
+
+    with StubOllamaServer(slow) as server, _client(server.url, read_timeout=0.1) as client:
+        with pytest.raises(LLMClientError, match="timed out"):
+            client.generate("m", "p")
+
+
+def test_client_connection_refused():
+    server = StubOllamaServer()
+    url = server.url
+    server.stop()
+
+    with _client(url, max_retries=1) as client:
+        with pytest.raises(LLMClientError):
+            client.generate("m", "p")
+
+
+def test_generation_against_stub_server():
+    case = {
+        "use_case": "Login",
+        "test_case": "Valid login",
+        "steps": ["Open page"],
+        "priority": "high",
+        "expected_results": ["Logged in"],
+    }
+
+    def handler(payload):
+        if payload.get("format") == "json":
+            return {"response": json.dumps([case])}
+        return {"response": "- users can log in"}
+
+    with StubOllamaServer(handler) as server, _client(server.url) as client:
+        results = generator._generate_from_chunks(
+            ["Users log in with a password."], model="m", max_retries=0, client=client
+        )
+
+    assert results == [case]
+    assert len(server.requests) == 2
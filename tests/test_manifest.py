@@ -0,0 +1,72 @@
+from core import generator
+from core.manifest import ChunkManifest, chunk_fingerprint, manifest_path_for
+from core.parser import parse_document
+from fake_llm import echo_client as _counting_client
+
+
+def test_fingerprint_depends_on_chunk_and_context():
+    assert chunk_fingerprint("a", "m") == chunk_fingerprint("a", "m")
+    assert chunk_fingerprint("a", "m") != chunk_fingerprint("b", "m")
+    assert chunk_fingerprint("a", "m") != chunk_fingerprint("a", "other")
+
+
+def test_manifest_roundtrip_and_version_check(tmp_path):
+    path = tmp_path / "suite.json.manifest.json"
+    manifest = ChunkManifest(str(path))
+    manifest.set("fp", [{"test_case": "x"}])
+    manifest.save()
+
+    assert ChunkManifest.load(str(path)).get("fp") == [{"test_case": "x"}]
+
+    path.write_text('{"version": 0, "chunks": {"fp": []}}', encoding="utf-8")
+    assert len(ChunkManifest.load(str(path))) == 0
+
+
+def test_only_changed_chunks_are_regenerated(tmp_path):
+    path = manifest_path_for(str(tmp_path / "suite.json"))
+    chunks = ["alpha", "beta", "gamma"]
+
+    client = _counting_client()
+    manifest = ChunkManifest.load(path)
+    first = generator._generate_from_chunks(
+        chunks, model="m", max_retries=0, client=client, manifest=manifest
+    )
+    manifest.save()
+    assert client.generate.call_count == 6
+
+    client = _counting_client()
+    revised = ["alpha", "beta (edited)", "gamma"]
+    second = generator._generate_from_chunks(
+        revised, model="m", max_retries=0, client=client, manifest=ChunkManifest.load(path)
+    )
+
+    # one condense + one generate call for the edited chunk only
+    assert client.generate.call_count == 2
+    assert [tc["test_case"] for tc in second] == ["alpha", "beta (edited)", "gamma"]
+    assert first[0] == second[0]
+
+
+def test_generate_test_suite_prunes_stale_chunks(tmp_path):
+    doc = tmp_path / "feature.txt"
+    path = manifest_path_for(str(tmp_path / "suite.json"))
+
+    doc.write_text("First revision.", encoding="utf-8")
+    generator.generate_test_suite(str(doc), client=_counting_client(), manifest_path=path)
+
+    doc.write_text("Second revision.", encoding="utf-8")
+    client = _counting_client()
+    generator.generate_test_suite(str(doc), client=client, manifest_path=path)
+
+    assert client.generate.call_count > 0
+    current = generator._chunk_fingerprints(
+        parse_document(str(doc)), generator.DEFAULT_MODEL
+    )
+    manifest = ChunkManifest.load(path)
+    assert len(manifest) == len(set(current))
+    assert all(fingerprint in manifest for fingerprint in current)
+
+    client = _counting_client()
+    generator.generate_test_suite(
+        str(doc), client=client, manifest_path=path, concurrency=4
+    )
+    assert client.generate.call_count == 0
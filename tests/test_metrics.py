@@ -0,0 +1,91 @@
+import json
+from core import generator
+from core.cache import LLMCache
+from core.exporter import export
+from core.metrics import Metrics
+from core.output import OutputFormat
+from core import schema
+from fake_llm import CASE, scripted_client
+
+
+STATS = {
+    "prompt_eval_count": 120,
+    "prompt_eval_duration": 200_000_000,
+    "eval_count": 50,
+    "eval_duration": 500_000_000,
+    "total_duration": 900_000_000,
+}
+
+def _client(*responses):
+    return scripted_client(*responses, **STATS)
+
+
+def test_pipeline_records_stages_tokens_retries_and_cache(tmp_path):
+    metrics = Metrics()
+    events = []
+    metrics.add_hook(events.append)
+    cache = LLMCache(str(tmp_path))
+
+    client = _client("- summary", "not json", json.dumps([CASE]))
+    generator._generate_from_chunks(
+        ["chunk"], model="m", max_retries=2, client=client, cache=cache, metrics=metrics
+    )
+    generator._generate_from_chunks(
+        ["chunk"], model="m", max_retries=2, client=client, cache=cache, metrics=metrics
+    )
+
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["chunk"]["count"] == 2
+    assert snapshot["stages"]["condense"]["count"] == 2
+    assert snapshot["llm"]["condense"]["requests"] == 1
+    assert snapshot["llm"]["generate"]["requests"] == 2
+    assert snapshot["llm"]["generate"]["eval_tokens"] == 100
+    assert snapshot["llm"]["generate"]["tokens_per_second"] == 100.0
+    assert snapshot["llm"]["generate"]["prompt_eval_seconds"] == 0.4
+    assert snapshot["retries"] == {"invalid_json": 1}
+    assert snapshot["cache"]["condense"] == {"misses": 1, "hits": 1}
+    assert snapshot["cache"]["generate"] == {"misses": 1, "hits": 1}
+    assert snapshot["counters"]["chunks_total"] == 2
+
+    chunk_events = [e for e in events if e.get("stage") == "chunk" and e["event"] == "stage"]
+    assert [e["chunk"] for e in chunk_events] == [0, 0]
+
+
+def test_failed_chunks_are_counted():
+    metrics = Metrics()
+    client = _client("- summary", "not json")
+    failed = []
+
+    generator._generate_from_chunks(
+        ["chunk"], model="m", max_retries=0, client=client,
+        failed_chunks=failed, metrics=metrics,
+    )
+
+    assert failed == [0]
+    assert metrics.snapshot()["counters"]["chunks_failed"] == 1
+
+
+def test_export_is_timed(tmp_path):
+    metrics = Metrics()
+    suite = schema.TestSuite(feature_name="f", source_document="d", test_cases=[CASE])
+
+    export(suite, OutputFormat.json, str(tmp_path / "out.json"), metrics=metrics)
+
+    assert metrics.snapshot()["stages"]["export"]["count"] == 1
+
+
+def test_dumpers():
+    metrics = Metrics()
+    metrics.record_stage("generate", 0.5)
+    metrics.record_stage("generate", 1.5)
+    metrics.record_llm("generate", STATS)
+    metrics.record_retry("invalid_json")
+    metrics.record_cache("generate", hit=False)
+
+    assert json.loads(metrics.to_json())["stages"]["generate"]["total_seconds"] == 2.0
+
+    text = metrics.to_prometheus()
+    assert 'casecraft_stage_seconds_count{stage="generate"} 2' in text
+    assert 'casecraft_llm_tokens_total{stage="generate",kind="prompt"} 120' in text
+    assert 'casecraft_retries_total{reason="invalid_json"} 1' in text
+    assert 'casecraft_cache_requests_total{stage="generate",result="hits"} 0' in text
@@ -41,3 +41,14 @@ def test_chunk_handles_long_token():
     chunks = parser._chunk_text(long_word, chunk_size=100, overlap=10)
     assert all(len(c) <= 100 for c in chunks)
     assert len(chunks) >= 10
+
+
+def test_chunk_stops_once_window_reaches_end():
+    text = " ".join(f"w{i}" for i in range(100))
+    chunks = parser._chunk_text(text, chunk_size=30, overlap=5)
+
+    # Only the final chunk touches the end of the text, no shrinking tail
+    # chunks made purely of overlap follow it
+    assert chunks[-1].endswith(text[-10:])
+    assert sum(1 for c in chunks if text.endswith(c)) == 1
+    assert len(parser._chunk_text("short text", chunk_size=800, overlap=100)) == 1
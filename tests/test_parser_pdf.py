@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from pypdf import PdfReader, PdfWriter
+
+from core import parser
+
+
+SAMPLE_PDF = str(Path(__file__).resolve().parents[1] / "examples" / "sample.pdf")
+
+
+def _repeat_pdf(path, pages):
+    source = PdfReader(SAMPLE_PDF).pages
+    writer = PdfWriter()
+    for index in range(pages):
+        writer.add_page(source[index % len(source)])
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+def test_process_pool_extraction_preserves_page_order(tmp_path):
+    pdf_path = _repeat_pdf(tmp_path / "large.pdf", 20)
+
+    sequential = parser._extract_pdf_pages(pdf_path)
+    parallel = parser._extract_pdf_pages(pdf_path, workers=2)
+
+    assert parallel == sequential
+    assert len(parallel) == 20
+
+
+def test_page_cache_is_used_on_reparse(tmp_path):
+    cache_dir = str(tmp_path / "pages")
+    first = parser._extract_pdf_pages(SAMPLE_PDF, cache_dir=cache_dir)
+
+    file_hash = parser._file_hash(SAMPLE_PDF)
+    parser._write_cached_page(cache_dir, file_hash, 0, "from cache")
+
+    second = parser._extract_pdf_pages(SAMPLE_PDF, cache_dir=cache_dir)
+    assert second[0] == "from cache"
+    assert second[1:] == first[1:]
+
+
+def test_parse_document_with_cache_matches_uncached(tmp_path):
+    cached = parser.parse_document(SAMPLE_PDF, page_cache_dir=str(tmp_path))
+    assert cached == parser.parse_document(SAMPLE_PDF)
+    assert parser.parse_document(SAMPLE_PDF, page_cache_dir=str(tmp_path)) == cached
@@ -0,0 +1,74 @@
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from core import parser
+
+
+EXAMPLES = sorted((Path(__file__).resolve().parents[1] / "examples").glob("*.pdf"))
+
+
+@pytest.mark.parametrize("pdf_path", EXAMPLES, ids=lambda p: p.name)
+def test_iter_chunks_matches_parse_document_for_pdfs(pdf_path):
+    assert list(parser.iter_chunks(str(pdf_path))) == parser.parse_document(str(pdf_path))
+
+
+def test_iter_chunks_matches_parse_document_for_text(tmp_path):
+    doc = tmp_path / "feature.txt"
+    lines = [f"  Requirement {i}: the field must accept value {i}\t " for i in range(400)]
+    doc.write_bytes("\r\n".join(lines).replace("7", "\r\r7").encode("utf-8"))
+
+    for chunk_size, overlap in [(800, 100), (50, 10), (13, 0)]:
+        expected = parser.parse_document(str(doc), chunk_size=chunk_size, overlap=overlap)
+        streamed = list(parser.iter_chunks(str(doc), chunk_size=chunk_size, overlap=overlap))
+        assert streamed == expected
+
+
+def test_stream_chunker_matches_chunk_text_for_any_split():
+    text = ("word " * 300) + ("x" * 500) + ("\n  \n" * 20) + "tail"
+    expected = parser._chunk_text(text, chunk_size=60, overlap=15)
+
+    for piece_size in (1, 7, 64, len(text)):
+        pieces = [text[i:i + piece_size] for i in range(0, len(text), piece_size)]
+        assert list(parser._iter_text_chunks(pieces, 60, 15)) == expected
+
+
+def test_iter_chunks_memory_is_bounded(tmp_path):
+    doc = tmp_path / "large.md"
+    line = "The service must reject requests without a valid token.\n"
+    with open(doc, "w", encoding="utf-8") as f:
+        for _ in range(100_000):
+            f.write(line)
+
+    tracemalloc.start()
+    count = sum(1 for _ in parser.iter_chunks(str(doc)))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count > 1000
+    # the document is ~5.7 MB; the streaming path must stay far below that
+    assert peak < 1024 * 1024
+
+
+def test_iter_chunks_errors():
+    with pytest.raises(FileNotFoundError):
+        parser.iter_chunks("missing.txt")
+
+
+def test_iter_chunks_empty_document(tmp_path):
+    doc = tmp_path / "empty.txt"
+    doc.write_text("   \n\n  \r\n", encoding="utf-8")
+
+    with pytest.raises(parser.DocumentParseError):
+        list(parser.iter_chunks(str(doc)))
+
+
+def test_non_utf8_text_is_a_parse_error(tmp_path):
+    doc = tmp_path / "latin1.txt"
+    doc.write_bytes("Le champ doit être renseigné.".encode("latin-1"))
+
+    with pytest.raises(parser.DocumentParseError, match="UTF-8"):
+        parser.parse_document(str(doc))
+    with pytest.raises(parser.DocumentParseError, match="UTF-8"):
+        list(parser.iter_chunks(str(doc)))
@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core import generator
+from core.llm import LLMClient, LLMClientError
+from core.pool import CircuitBreaker, LLMPool, create_client
+from stub_ollama import StubOllamaServer
+
+
+def _node(latency=0.01):
+    def handler(payload):
+        if not server.healthy:
+            return 503, {"error": "down"}
+        if payload.get("format") == "json":
+            chunk = payload["prompt"].strip().splitlines()[-1]
+            case = {"use_case": chunk, "test_case": chunk, "steps": [], "priority": "low", "expected_results": []}
+            return {"response": json.dumps([case])}
+        # condensation keeps the chunk as the last line
+        return {"response": payload["prompt"].strip().splitlines()[-1]}
+
+    server = StubOllamaServer(handler, latency=latency)
+    return server.start()
+
+
+@pytest.fixture
+def nodes():
+    servers = [_node() for _ in range(3)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def test_requests_are_spread_by_outstanding_requests(nodes):
+    with LLMPool([s.url for s in nodes]) as pool:
+        for i in range(6):
+            pool.generate("m", f"p{i}")
+        # idle nodes take turns
+        assert [len(s.requests) for s in nodes] == [2, 2, 2]
+
+    slow = _node(latency=0.3)
+    try:
+        with LLMPool([slow.url] + [s.url for s in nodes]) as pool:
+            with ThreadPoolExecutor(4) as executor:
+                list(executor.map(lambda i: pool.generate("m", f"q{i}"), range(40)))
+            assert all(stat["outstanding"] == 0 for stat in pool.stats())
+    finally:
+        slow.stop()
+
+    # the slow node keeps its requests outstanding and gets fewer new ones
+    assert 0 < len(slow.requests) < min(len(s.requests) - 2 for s in nodes)
+
+
+def test_failing_node_is_skipped_and_requests_fail_over(nodes):
+    nodes[0].healthy = False
+
+    with LLMPool([s.url for s in nodes], failure_threshold=2, reset_timeout=60) as pool:
+        for i in range(20):
+            assert pool.generate("m", f"p{i}")["response"] == f"p{i}"
+
+        stats = {stat["url"]: stat for stat in pool.stats()}
+
+    assert stats[nodes[0].url]["state"] == CircuitBreaker.OPEN
+    assert len(nodes[0].requests) == 2
+    assert len(nodes[1].requests) + len(nodes[2].requests) == 20
+
+
+def test_node_failing_mid_run_loses_no_chunks(nodes):
+    chunks = [f"chunk {i}" for i in range(24)]
+    calls = 0
+    lock = threading.Lock()
+
+    original = nodes[1].handler
+
+    def dies_after_a_few(payload):
+        nonlocal calls
+        with lock:
+            calls += 1
+            if calls > 4:
+                nodes[1].healthy = False
+        return original(payload)
+
+    nodes[1].handler = dies_after_a_few
+
+    with LLMPool([s.url for s in nodes]) as pool:
+        failed = []
+        results = generator._generate_from_chunks(
+            chunks, model="m", max_retries=0, client=pool, concurrency=4, failed_chunks=failed
+        )
+
+    assert failed == []
+    assert [tc["use_case"] for tc in results] == chunks
+
+
+def test_probe_returns_recovered_nodes_to_rotation(nodes):
+    nodes[0].healthy = False
+
+    with LLMPool([s.url for s in nodes], failure_threshold=1, reset_timeout=60) as pool:
+        for i in range(6):
+            pool.generate("m", f"p{i}")
+        assert pool.probe() == 0
+
+        nodes[0].healthy = True
+        before = len(nodes[0].requests)
+        assert pool.probe() == 1
+        for i in range(6):
+            pool.generate("m", f"q{i}")
+
+    assert len(nodes[0].requests) > before
+
+
+def test_background_probe(nodes):
+    nodes[0].healthy = False
+
+    with LLMPool([s.url for s in nodes], failure_threshold=1, reset_timeout=60, probe_interval=0.02) as pool:
+        for i in range(3):
+            pool.generate("m", f"p{i}")
+        assert pool.stats()[0]["state"] == CircuitBreaker.OPEN
+        nodes[0].healthy = True
+
+        deadline = time.monotonic() + 5
+        while pool.stats()[0]["state"] != CircuitBreaker.CLOSED:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+
+def test_open_breaker_lets_one_trial_through_after_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure(now=100)
+
+    assert not breaker.available(105)
+    assert breaker.available(110)
+    breaker.acquire(110)
+    assert not breaker.available(110)  # only one trial at a time
+
+    breaker.record_failure(now=111)
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.available(112)
+    breaker.acquire(121)
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_all_nodes_down_raises(nodes):
+    for server in nodes:
+        server.healthy = False
+
+    with LLMPool([s.url for s in nodes], failure_threshold=1) as pool:
+        with pytest.raises(LLMClientError, match="3 endpoint"):
+            pool.generate("m", "p")
+        with pytest.raises(LLMClientError, match="No healthy"):
+            pool.generate("m", "p")
+
+
+def test_stream_fails_over_before_the_first_fragment(nodes):
+    nodes[0].healthy = False
+    body = "\n".join(
+        json.dumps({"response": part, "done": done})
+        for part, done in (("[", False), ("]", False), ("", True))
+    ).encode("utf-8")
+    for server in nodes[1:]:
+        server.handler = lambda payload: (200, body)
+
+    with LLMPool([nodes[0].url, nodes[1].url]) as pool:
+        assert "".join(pool.generate_stream("m", "p", format="json")) == "[]"
+        assert pool.stats()[0]["failures"] == 1
+
+
+def test_create_client_picks_client_or_pool():
+    single = create_client(["http://localhost:1/api/generate"])
+    pool = create_client(["http://localhost:1/api/generate", "http://localhost:2/api/generate"])
+
+    assert isinstance(single, LLMClient)
+    assert isinstance(pool, LLMPool) and len(pool.endpoints) == 2
+    single.close()
+    pool.close()
@@ -0,0 +1,63 @@
+import json
+from unittest.mock import Mock
+
+from core import generator
+from core.condense import CondenseStrategy
+from core.llm import LLMClientError
+from core.metrics import Metrics
+from core.prompts import PromptTemplate, load_prompt
+from fake_llm import CASE, scripted_client
+
+
+def test_template_prefix_ends_at_first_placeholder():
+    template = PromptTemplate("t", "Rules {json}\nLimit $limit\n${body}")
+
+    assert template.prefix == "Rules {json}\nLimit "
+    assert template.render(limit=3, body="text $x") == "Rules {json}\nLimit 3\ntext $x"
+
+
+def test_rendered_prompts_share_a_byte_identical_prefix():
+    generate = load_prompt("generate").prefix
+    condense = load_prompt("condense").prefix
+
+    prompts = [
+        generator._build_prompt(["first chunk"]),
+        generator._build_prompt(["other"], max_cases=9, context=["[kb.md] snippet"]),
+    ]
+    assert all(p.startswith(generate) for p in prompts)
+    # the rules and schema are all part of the shared prefix
+    assert '"expected_results"' in generate and "Feature documentation" not in generate
+    assert "Keep it under" in condense
+
+
+def test_retry_feedback_keeps_the_original_prompt_as_prefix():
+    client = scripted_client("oops", json.dumps([CASE]))
+
+    generator._request_test_cases("PROMPT", "m", max_retries=1, client=client)
+
+    retry_prompt = client.generate.call_args_list[1].args[1]
+    assert retry_prompt.startswith("PROMPT\n\nThe previous output was invalid:")
+
+
+def test_warm_up_sends_template_prefixes_with_a_tiny_budget():
+    client = Mock()
+    client.generate.return_value = {"response": "", "prompt_eval_count": 250}
+    metrics = Metrics()
+
+    assert generator.warm_up_model("m", client, metrics=metrics)
+
+    prompts = [c.args[1] for c in client.generate.call_args_list]
+    assert prompts == [load_prompt("condense").prefix, load_prompt("generate").prefix]
+    assert all(c.kwargs["options"] == {"num_predict": 1} for c in client.generate.call_args_list)
+    assert metrics.snapshot()["llm"]["warmup"]["prompt_tokens"] == 500
+
+    client.generate.reset_mock()
+    generator.warm_up_model("m", client, condense=CondenseStrategy.extractive)
+    assert [c.args[1] for c in client.generate.call_args_list] == [load_prompt("generate").prefix]
+
+
+def test_warm_up_is_best_effort():
+    client = Mock()
+    client.generate.side_effect = LLMClientError("down")
+
+    assert generator.warm_up_model("m", client) is False
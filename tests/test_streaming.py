@@ -0,0 +1,144 @@
+import json
+from unittest.mock import Mock
+
+from core import generator
+from core.jsonstream import JSONArrayStreamParser
+from core.llm import LLMClient, LLMClientError
+from core.manifest import ChunkManifest
+from core.metrics import Metrics
+from fake_llm import case
+from core import schema
+from stub_ollama import StubOllamaServer
+
+
+def _case(name):
+    return case(name, test_data={"nested": {"braces": "{[]}"}})
+
+
+def _feed_all(parser, text, size):
+    results = []
+    for start in range(0, len(text), size):
+        results.extend(parser.feed(text[start:start + size]))
+    return results
+
+
+def test_stream_parser_emits_objects_as_they_complete():
+    text = json.dumps([_case("a"), _case("b")])
+    parser = JSONArrayStreamParser()
+
+    first_half = parser.feed(text[: len(text) // 2 + 40])
+    assert [c["test_case"] for c in first_half] == ["a"]
+    assert [c["test_case"] for c in parser.feed(text[len(text) // 2 + 40:])] == ["b"]
+
+
+def test_stream_parser_handles_wrapper_objects_and_tiny_fragments():
+    text = json.dumps({"test_cases": [_case("a"), _case("b"), _case("c")]})
+    results = _feed_all(JSONArrayStreamParser(), text, 3)
+
+    assert [c["test_case"] for c in results] == ["a", "b", "c"]
+    assert results[0]["test_data"] == {"nested": {"braces": "{[]}"}}
+
+
+def test_stream_parser_ignores_truncated_tail():
+    text = json.dumps([_case("a"), _case("b")])[:-20]
+    assert [c["test_case"] for c in _feed_all(JSONArrayStreamParser(), text, 7)] == ["a"]
+
+
+def _ndjson(text, size=11, **stats):
+    lines = [
+        json.dumps({"response": text[i:i + size], "done": False})
+        for i in range(0, len(text), size)
+    ]
+    lines.append(json.dumps({"response": "", "done": True, **stats}))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def test_iter_test_cases_streams_and_deduplicates(tmp_path):
+    doc = tmp_path / "feature.txt"
+    doc.write_text("Users can log in.\nUsers can log out.\n", encoding="utf-8")
+
+    cases = [_case("a"), _case("b"), _case("a")]
+
+    def handler(payload):
+        if payload.get("format") == "json":
+            assert payload["stream"] is True
+            return 200, _ndjson(json.dumps(cases))
+        return {"response": "- login and logout"}
+
+    with StubOllamaServer(handler) as server, LLMClient(url=server.url) as client:
+        results = list(
+            generator.iter_test_cases(str(doc), model="m", client=client, stream=True)
+        )
+
+    assert all(isinstance(tc, schema.TestCase) for tc in results)
+    assert [tc.test_case for tc in results] == ["a", "b"]
+
+
+def test_streamed_requests_record_token_statistics(tmp_path):
+    doc = tmp_path / "feature.txt"
+    doc.write_text("Users can log in.\n", encoding="utf-8")
+    stats = {"prompt_eval_count": 120, "eval_count": 50, "eval_duration": 500_000_000}
+
+    def handler(payload):
+        if payload.get("format") == "json":
+            return 200, _ndjson(json.dumps([_case("a")]), **stats)
+        return {"response": "- login"}
+
+    metrics = Metrics()
+    with StubOllamaServer(handler) as server, LLMClient(url=server.url) as client:
+        results = list(
+            generator.iter_test_cases(
+                str(doc), model="m", client=client, stream=True, metrics=metrics
+            )
+        )
+
+    assert [tc.test_case for tc in results] == ["a"]
+    generate = metrics.snapshot()["llm"]["generate"]
+    assert generate["requests"] == 1
+    assert generate["eval_tokens"] == 50
+    assert generate["tokens_per_second"] == 100.0
+
+
+def test_stream_falls_back_to_single_object_output(tmp_path):
+    doc = tmp_path / "feature.txt"
+    doc.write_text("Users can log in.\n", encoding="utf-8")
+
+    def handler(payload):
+        if payload.get("format") == "json":
+            return 200, _ndjson(json.dumps(_case("single")))
+        return {"response": "- login"}
+
+    with StubOllamaServer(handler) as server, LLMClient(url=server.url) as client:
+        results = list(
+            generator.iter_test_cases(str(doc), model="m", client=client, stream=True)
+        )
+
+    assert [tc.test_case for tc in results] == ["single"]
+    # The streamed output is normalized locally, no extra retry round-trip
+    generation_requests = [r for r in server.requests if r.get("format") == "json"]
+    assert all(r["stream"] for r in generation_requests)
+
+
+def test_stream_broken_after_some_cases_fails_the_chunk(tmp_path):
+    first = json.dumps(_case("a"))
+
+    def broken_stream(model, prompt, options=None, format=None, on_done=None):
+        yield "[" + first + ","
+        raise LLMClientError("connection reset")
+
+    client = Mock()
+    client.generate.return_value = {"response": "- login"}
+    client.generate_stream.side_effect = broken_stream
+    manifest = ChunkManifest(str(tmp_path / "manifest.json"))
+    failed = []
+
+    results = list(
+        generator._iter_generated_cases(
+            ["Users can log in."], model="m", max_retries=0, client=client,
+            stream=True, manifest=manifest, failed_chunks=failed,
+        )
+    )
+
+    assert [tc["test_case"] for tc in results] == ["a"]
+    assert failed == [0]
+    assert len(manifest) == 0
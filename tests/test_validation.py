@@ -0,0 +1,75 @@
+import json
+from core import generator
+from core import schema
+from core.metrics import Metrics
+from core.validation import coerce_test_case, normalize_priority, validate_test_cases
+from fake_llm import CASE, scripted_client as _client
+
+
+def test_light_coercions():
+    coerced = coerce_test_case({
+        **CASE,
+        "steps": "1. Open page\n2) Submit\n\n- Check",
+        "expected_results": "Logged in",
+        "tags": ["auth", 3],
+        "preconditions": None,
+        "priority": "Critical",
+    })
+
+    assert coerced["steps"] == ["Open page", "Submit", "Check"]
+    assert coerced["expected_results"] == ["Logged in"]
+    assert coerced["tags"] == ["auth", "3"]
+    assert "preconditions" not in coerced
+    assert coerced["priority"] == "high"
+
+    assert [normalize_priority(p) for p in ("P2", "Low priority", " MEDIUM ", "soon")] == [
+        "medium", "low", "medium", "soon",
+    ]
+
+
+def test_cases_are_validated_one_by_one():
+    valid, invalid = validate_test_cases([CASE, {"use_case": "x"}, "text", dict(CASE, steps="One")])
+
+    assert [tc.steps for tc in valid] == [["Open page"], ["One"]]
+    assert [case.position for case in invalid] == [1, 2]
+
+
+def test_only_the_chunk_with_invalid_cases_is_asked_again():
+    broken = [CASE, {"use_case": "Login", "test_case": "No steps", "priority": "low"}]
+    client = _client(json.dumps(broken), json.dumps([CASE, dict(CASE, test_case="Fixed")]))
+    metrics = Metrics()
+
+    result = generator._request_test_cases("x", "m", max_retries=1, client=client, metrics=metrics)
+
+    assert [tc["test_case"] for tc in result] == ["Valid login", "Fixed"]
+    feedback = client.generate.call_args_list[1].args[1]
+    assert "test case 2: steps: Field required" in feedback
+    assert metrics.snapshot()["retries"] == {"invalid_cases": 1}
+    assert metrics.snapshot()["counters"]["cases_invalid"] == 1
+
+
+def test_valid_cases_are_kept_when_retries_run_out():
+    broken = json.dumps([CASE, {"use_case": "Login"}])
+    client = _client(broken, broken)
+
+    result = generator._request_test_cases("x", "m", max_retries=1, client=client)
+
+    assert result == [CASE]
+
+
+def test_suite_is_assembled_without_failing_on_one_bad_case(tmp_path):
+    doc = tmp_path / "spec.txt"
+    doc.write_text("Users log in with a password.", encoding="utf-8")
+    bad = {"use_case": "Login", "test_case": "Bad", "steps": {"not": "a list"}, "priority": "high"}
+    client = _client(
+        "- users log in",
+        json.dumps([dict(CASE, priority="P1", steps="Open page"), bad]),
+        json.dumps([bad]),
+    )
+
+    suite = generator.generate_test_suite(str(doc), model="m", max_retries=1, client=client)
+
+    assert isinstance(suite, schema.TestSuite)
+    [case] = suite.test_cases
+    assert isinstance(case, schema.TestCase)
+    assert (case.priority, case.steps, case.tags) == ("high", ["Open page"], [])
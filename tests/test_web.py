@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from core.llm import LLMClient
+from stub_ollama import StubOllamaServer
+from web.app import create_app
+
+
+DOCUMENT = "\n".join(f"Rule {i}: the field_{i} value must be validated." for i in range(40))
+
+
+def _handler(gate=None):
+    def handler(payload):
+        if gate is not None:
+            gate.wait(5)
+        if payload.get("format") != "json":
+            return {"response": "- " + payload["prompt"].strip()[-60:]}
+        return {
+            "response": json.dumps([{
+                "use_case": "Validation",
+                "test_case": f"Case {payload['prompt'][-30:]}",
+                "steps": ["Submit form"],
+                "priority": "high",
+                "expected_results": ["Rejected"],
+            }])
+        }
+    return handler
+
+
+def _upload(http, name="spec.md", content=DOCUMENT):
+    return http.post("/jobs", files={"file": (name, content.encode("utf-8"), "text/markdown")})
+
+
+def _wait_finished(http, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = http.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("job did not finish")
+
+
+def test_job_lifecycle_with_polling(tmp_path):
+    with StubOllamaServer(_handler()) as server, LLMClient(server.url) as llm:
+        app = create_app(client=llm, model="m", upload_dir=str(tmp_path))
+        with TestClient(app) as http:
+            response = _upload(http)
+            assert response.status_code == 202
+
+            job = _wait_finished(http, response.json()["job_id"])
+
+    assert job["status"] == "completed"
+    assert job["progress"]["chunks_done"] == job["progress"]["chunks_total"] > 1
+    assert job["test_case_count"] == len(job["test_cases"]) > 1
+    # uploads are removed once the job finished
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_events_stream_test_cases_and_done():
+    with StubOllamaServer(_handler()) as server, LLMClient(server.url) as llm:
+        with TestClient(create_app(client=llm, model="m")) as http:
+            job_id = _upload(http).json()["job_id"]
+
+            events = []
+            with http.stream("GET", f"/jobs/{job_id}/events") as response:
+                assert response.headers["content-type"].startswith("text/event-stream")
+                for line in response.iter_lines():
+                    if line.startswith("event: "):
+                        events.append(line[len("event: "):])
+
+    assert events[-1] == "done"
+    assert "test_case" in events
+    assert "progress" in events
+
+
+def test_full_queue_returns_429():
+    gate = threading.Event()
+    with StubOllamaServer(_handler(gate)) as server, LLMClient(server.url) as llm:
+        app = create_app(client=llm, model="m", workers=1, queue_size=1)
+        with TestClient(app) as http:
+            first = _upload(http)
+            # wait until the worker picked up the first job
+            deadline = time.monotonic() + 5
+            while http.get(f"/jobs/{first.json()['job_id']}").json()["status"] == "queued":
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            assert _upload(http).status_code == 202
+            rejected = _upload(http)
+            assert rejected.status_code == 429
+            assert rejected.headers["retry-after"] == "5"
+
+            gate.set()
+            assert _wait_finished(http, first.json()["job_id"])["status"] == "completed"
+
+
+def test_failed_job_and_validation_errors():
+    with StubOllamaServer(lambda payload: (500, b"boom")) as server:
+        with LLMClient(server.url, max_retries=0) as llm:
+            with TestClient(create_app(client=llm, model="m")) as http:
+                job = _wait_finished(http, _upload(http).json()["job_id"])
+                assert job["status"] == "failed"
+                assert job["error"]
+
+                assert _upload(http, name="spec.docx").status_code == 400
+                assert http.get("/jobs/missing").status_code == 404
+
+
+def test_events_include_cases_added_as_the_job_finishes():
+    import asyncio
+
+    from web.app import _job_events
+    from web.jobs import Job, JobStatus
+
+    class FinishingJob(Job):
+        # the worker adds its last case and completes right after a snapshot
+        def snapshot(self, include_test_cases=True, since=0):
+            data = super().snapshot(include_test_cases, since)
+            if self.status is JobStatus.running:
+                self.add_test_case({"test_case": "last"})
+                self.update(status=JobStatus.completed)
+            return data
+
+    class Connected:
+        async def is_disconnected(self):
+            return False
+
+    async def collect():
+        job = FinishingJob("spec.md", "spec.md", asyncio.get_running_loop())
+        job.add_test_case({"test_case": "first"})
+        job.update(status=JobStatus.running)
+        return [event async for event in _job_events(job, Connected())]
+
+    events = asyncio.run(collect())
+
+    names = [event.split("\n", 1)[0] for event in events]
+    assert names.count("event: test_case") == 2
+    assert names[-1] == "event: done"
+    assert '"last"' in "".join(events)
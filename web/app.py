@@ -0,0 +1,159 @@
+import json
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Union
+
+from fastapi import FastAPI, File, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+
+from core.generator import DEFAULT_MODEL
+from core.llm import LLMClient
+from core.parser import supported_suffixes
+from core.pool import create_client
+from web.jobs import Job, JobManager, JobStatus, QueueFullError
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_events(job: Job, request: Request) -> AsyncIterator[str]:
+    """
+    Stream a job as Server-Sent Events: every new test case, progress
+    updates, and a final `done` event with the job status.
+    """
+    sent = 0
+    last_progress = None
+
+    while True:
+        update = job.next_update()
+        snapshot = job.snapshot(since=sent)
+
+        for test_case in snapshot["test_cases"]:
+            yield _sse("test_case", test_case)
+        sent += len(snapshot["test_cases"])
+
+        if snapshot["progress"] != last_progress:
+            last_progress = snapshot["progress"]
+            yield _sse("progress", {"status": snapshot["status"], **last_progress})
+
+        # Decide on the snapshot just sent: the live job may have finished
+        # after it was taken, with cases this snapshot doesn't hold yet
+        if snapshot["status"] in (JobStatus.completed.value, JobStatus.failed.value):
+            snapshot.pop("test_cases")
+            yield _sse("done", snapshot)
+            return
+
+        if await request.is_disconnected():
+            return
+        await update.wait()
+
+
+def create_app(
+    client: Optional[LLMClient] = None,
+    model: str = DEFAULT_MODEL,
+    workers: int = 2,
+    queue_size: int = 8,
+    concurrency: int = 2,
+    upload_dir: Optional[str] = None,
+    urls: Optional[List[str]] = None,
+    keep_alive: Optional[Union[str, int]] = "10m",
+    warm_up: bool = True,
+    parse_workers: int = 1,
+    page_cache_dir: Optional[str] = None,
+) -> FastAPI:
+    """
+    Build the web API.
+
+    Uploaded documents are queued as jobs and processed by `workers` async
+    workers that share one LLM client; a full queue answers 429. Progress
+    and results are available by polling `GET /jobs/{id}` or as
+    Server-Sent Events from `GET /jobs/{id}/events`.
+
+    With `warm_up`, the model is loaded at startup so the first job doesn't
+    pay for it; `keep_alive` is how long Ollama keeps it loaded between
+    requests (used when no `client` is given). Several Ollama `urls` are
+    used as one load balanced pool (see core.pool). Uploads are parsed with
+    `parse_workers` processes and `page_cache_dir` (see
+    core.parser.parse_document).
+    """
+    owns_client = client is None
+    if client is None:
+        client = create_client(
+            urls, keep_alive=keep_alive, pool_size=max(10, workers * concurrency)
+        )
+
+    manager = JobManager(
+        client,
+        model=model,
+        workers=workers,
+        queue_size=queue_size,
+        concurrency=concurrency,
+        warm_up=warm_up,
+        parse_workers=parse_workers,
+        page_cache_dir=page_cache_dir,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        await manager.start()
+        try:
+            yield
+        finally:
+            await manager.stop()
+            if owns_client:
+                client.close()
+
+    app = FastAPI(title="CaseCraft", lifespan=lifespan)
+    app.state.jobs = manager
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(file: UploadFile = File(...)) -> dict:
+        filename = file.filename or "document"
+        suffix = Path(filename).suffix.lower()
+        if suffix not in supported_suffixes():
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {suffix}")
+
+        content = await file.read()
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=upload_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+
+        try:
+            job = manager.submit(path, filename)
+        except QueueFullError:
+            os.remove(path)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many queued jobs, retry later",
+                headers={"Retry-After": "5"},
+            )
+
+        return {"job_id": job.id, "status": job.status.value}
+
+    def _get_job(job_id: str) -> Job:
+        job = manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown job")
+        return job
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str) -> dict:
+        return _get_job(job_id).snapshot()
+
+    @app.get("/jobs/{job_id}/events")
+    async def job_events(job_id: str, request: Request) -> StreamingResponse:
+        job = _get_job(job_id)
+        return StreamingResponse(
+            _job_events(job, request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    return app
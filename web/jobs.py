@@ -0,0 +1,222 @@
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from core.generator import DEFAULT_MODEL, iter_test_cases, warm_up_model
+from core.llm import LLMClient
+from core.metrics import Metrics
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    """
+    A document submitted for generation and everything produced for it so
+    far. Updated from worker threads; readers on the event loop await the
+    event returned by `next_update`.
+    """
+
+    def __init__(self, path: str, filename: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.filename = filename
+        self.status = JobStatus.queued
+        self.error: Optional[str] = None
+        self.chunks_total = 0
+        self.chunks_done = 0
+        self.test_cases: List[Dict[str, Any]] = []
+
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._updated = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.completed, JobStatus.failed)
+
+    def _notify(self) -> None:
+        # Runs on the event loop: wake current waiters, arm a fresh event
+        updated, self._updated = self._updated, asyncio.Event()
+        updated.set()
+
+    def update(self, **fields: Any) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+        self._loop.call_soon_threadsafe(self._notify)
+
+    def add_test_case(self, test_case: Dict[str, Any]) -> None:
+        with self._lock:
+            self.test_cases.append(test_case)
+        self._loop.call_soon_threadsafe(self._notify)
+
+    def on_metric(self, event: Dict[str, Any]) -> None:
+        """
+        Metrics hook tracking chunk progress (see core.metrics).
+        """
+        with self._lock:
+            if event["event"] == "counter" and event["name"] == "chunks_total":
+                self.chunks_total = event["value"]
+            elif event["event"] == "counter" and event["name"] == "chunks_reused":
+                self.chunks_done += event["value"]
+            elif event["event"] == "stage" and event["stage"] == "chunk":
+                self.chunks_done += 1
+            else:
+                return
+        self._loop.call_soon_threadsafe(self._notify)
+
+    def next_update(self) -> asyncio.Event:
+        """
+        Event set on the next change. Take it before reading the job so no
+        change between the read and the wait is missed.
+        """
+        return self._updated
+
+    def snapshot(self, include_test_cases: bool = True, since: int = 0) -> Dict[str, Any]:
+        """
+        The job's state; with `include_test_cases`, the test cases from
+        position `since` on, so followers only copy what is new.
+        """
+        with self._lock:
+            data: Dict[str, Any] = {
+                "job_id": self.id,
+                "filename": self.filename,
+                "status": self.status.value,
+                "error": self.error,
+                "progress": {"chunks_done": self.chunks_done, "chunks_total": self.chunks_total},
+                "test_case_count": len(self.test_cases),
+            }
+            if include_test_cases:
+                data["test_cases"] = self.test_cases[since:]
+        return data
+
+
+class JobManager:
+    """
+    Bounded job queue served by a fixed number of async workers.
+
+    Every job runs in a worker thread and all jobs share one LLMClient, so
+    the client's connection pool (and `max_in_flight`, if set) applies to the
+    whole service. `submit` raises QueueFullError when `queue_size` jobs are
+    already waiting. Only the latest `max_retained_jobs` finished jobs are
+    kept for polling. With `warm_up`, the model is loaded and Ollama's
+    prompt cache primed in the background when the manager starts.
+    Documents are parsed with `parse_workers` processes and `page_cache_dir`
+    as in core.parser.parse_document.
+    """
+
+    def __init__(
+        self,
+        client: LLMClient,
+        model: str = DEFAULT_MODEL,
+        workers: int = 2,
+        queue_size: int = 8,
+        concurrency: int = 2,
+        max_retries: int = 2,
+        max_retained_jobs: int = 100,
+        warm_up: bool = False,
+        parse_workers: int = 1,
+        page_cache_dir: Optional[str] = None,
+    ) -> None:
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be >= 1")
+
+        self.client = client
+        self.model = model
+        self.workers = workers
+        self.queue_size = queue_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.max_retained_jobs = max_retained_jobs
+        self.warm_up = warm_up
+        self.parse_workers = parse_workers
+        self.page_cache_dir = page_cache_dir
+
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if self.warm_up:
+            self._tasks.append(
+                asyncio.create_task(asyncio.to_thread(warm_up_model, self.model, self.client))
+            )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, path: str, filename: str) -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobManager has not been started")
+
+        job = Job(path, filename, asyncio.get_running_loop())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Job queue is full") from None
+
+        self.jobs[job.id] = job
+        self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.max_retained_jobs)]:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            try:
+                await asyncio.to_thread(self._run, job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job) -> None:
+        job.update(status=JobStatus.running)
+        metrics = Metrics()
+        metrics.add_hook(job.on_metric)
+
+        try:
+            for test_case in iter_test_cases(
+                job.path,
+                model=self.model,
+                max_retries=self.max_retries,
+                concurrency=self.concurrency,
+                client=self.client,
+                metrics=metrics,
+                parse_workers=self.parse_workers,
+                page_cache_dir=self.page_cache_dir,
+            ):
+                job.add_test_case(test_case.model_dump())
+        except Exception as exc:  # reported to the client through the job
+            job.update(status=JobStatus.failed, error=str(exc))
+        else:
+            job.update(status=JobStatus.completed)
+        finally:
+            try:
+                os.remove(job.path)
+            except OSError:
+                pass